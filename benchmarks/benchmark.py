@@ -0,0 +1,291 @@
+"""Benchmarks for businesstimedelta.
+
+Times the core operations over a matrix of calendars, time zones and spans
+of time, and compares them against a recorded baseline.
+
+Usage:
+    python benchmarks/benchmark.py                       # run and print
+    python benchmarks/benchmark.py -k difference         # only matching cases
+    python benchmarks/benchmark.py --save baseline.json  # record a baseline
+    python benchmarks/benchmark.py --compare benchmarks/baseline.json
+
+Each round of a case builds a new calendar, so the caches of one round don't
+carry over to the next. The cold/ cases build one for every call, and time
+calls that find every cache of the calendar empty.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+
+import holidays as pyholidays
+import pytz
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import businesstimedelta  # noqa: E402
+
+TIMEZONES = ['UTC', 'US/Pacific', 'Europe/London']
+
+SPANS = [
+    ('8h', datetime.timedelta(hours=8)),
+    ('1w', datetime.timedelta(weeks=1)),
+    ('1y', datetime.timedelta(days=365)),
+    ('10y', datetime.timedelta(days=3652)),
+    ('30y', datetime.timedelta(days=10957)),
+]
+
+# Python 2 has no perf_counter
+clock = getattr(time, 'perf_counter', time.time)
+
+# A Thursday shortly before the start of daylight saving time in the US,
+# so that even the short spans cross a change of UTC offset.
+START = datetime.datetime(2016, 3, 10, 10, 30, 0)
+
+HOLIDAYS = [
+    datetime.date(year, month, day)
+    for year in range(1990, 2060)
+    for month, day in [(1, 1), (5, 30), (7, 4), (9, 5), (11, 24), (12, 25), (12, 26)]
+]
+
+
+def workday(tz):
+    return [businesstimedelta.WorkDayRule(
+        start_time=datetime.time(9),
+        end_time=datetime.time(17),
+        working_days=[0, 1, 2, 3, 4],
+        tz=tz)]
+
+
+def lunch(tz):
+    return workday(tz) + [businesstimedelta.LunchTimeRule(
+        start_time=datetime.time(12),
+        end_time=datetime.time(13),
+        working_days=[0, 1, 2, 3, 4],
+        tz=tz)]
+
+
+def holiday_list(tz):
+    return lunch(tz) + [businesstimedelta.HolidayRule(HOLIDAYS, tz=tz)]
+
+
+def holiday_module(tz):
+    return lunch(tz) + [businesstimedelta.HolidayRule(pyholidays.US(), tz=tz)]
+
+
+CALENDARS = [
+    ('workday', workday),
+    ('lunch', lunch),
+    ('holiday-list', holiday_list),
+    ('holiday-module', holiday_module),
+]
+
+
+def cases():
+    """Yield (name, setup, cold) tuples. Calling setup builds the calendar and
+    returns the function to time, so that building it isn't part of the
+    measurement. Cold cases call setup again before every call."""
+    for tz_name in TIMEZONES:
+        for calendar_name, calendar in CALENDARS:
+            def rules(tz_name=tz_name, calendar=calendar):
+                tz = pytz.timezone(tz_name)
+                return businesstimedelta.Rules(calendar(tz)), tz.localize(START)
+
+            prefix = '%s/%s' % (calendar_name, tz_name)
+
+            for span_name, span in SPANS:
+                yield ('difference/%s/%s' % (prefix, span_name), difference_case(rules, span), False)
+                yield ('add/%s/%s' % (prefix, span_name), add_case(rules, span), False)
+                yield ('subtract/%s/%s' % (prefix, span_name), subtract_case(rules, span), False)
+
+            yield ('next/%s' % prefix, walk_case(rules, reverse=False), False)
+            yield ('previous/%s' % prefix, walk_case(rules, reverse=True), False)
+            yield ('is-business-time/%s' % prefix, is_business_time_case(rules), False)
+            yield ('deadlines/%s' % prefix, deadlines_case(rules), False)
+
+            for span_name, span in SPANS[1:3]:
+                yield ('cold/difference/%s/%s' % (prefix, span_name), difference_case(rules, span), True)
+            yield ('cold/next/%s' % prefix, walk_case(rules, reverse=False), True)
+
+    for holidays_name, holidays in [('list', HOLIDAYS), ('module', pyholidays.US())]:
+        yield ('holiday-next/%s' % holidays_name, holiday_case(holidays, reverse=False), False)
+        yield ('holiday-previous/%s' % holidays_name, holiday_case(holidays, reverse=True), False)
+        yield ('cold/holiday-next/%s' % holidays_name, holiday_case(holidays, reverse=False), True)
+
+
+def difference_case(rules, span):
+    def setup():
+        rule, start = rules()
+        end = start + span
+        return lambda: rule.difference(start, end)
+    return setup
+
+
+def add_case(rules, span):
+    def setup():
+        rule, start = rules()
+        td = rule.difference(start, start + span)
+        return lambda: start + td
+    return setup
+
+
+def subtract_case(rules, span):
+    def setup():
+        rule, start = rules()
+        end = start + span
+        td = rule.difference(start, end)
+        return lambda: end - td
+    return setup
+
+
+def walk_case(rules, reverse):
+    """Ten consecutive calls of next or previous."""
+    def setup():
+        rule, start = rules()
+        step = rule.previous if reverse else rule.next
+
+        def run():
+            dt = start
+            for _ in range(10):
+                period_start, period_end = step(dt)
+                dt = period_start if reverse else period_end
+        return run
+    return setup
+
+
+def is_business_time_case(rules):
+    """Ten checks spread over a year and the hours of the day."""
+    def setup():
+        rule, start = rules()
+        moments = [start + datetime.timedelta(days=37 * i, hours=5 * i) for i in range(10)]
+
+        def run():
+            for dt in moments:
+                rule.is_business_time(dt)
+        return run
+    return setup
+
+
+def deadlines_case(rules):
+    """A hundred deadlines of a day of business time, from starts within a week."""
+    def setup():
+        rule, start = rules()
+        starts = [start + datetime.timedelta(minutes=97 * i) for i in range(100)]
+        deltas = [datetime.timedelta(hours=8)] * len(starts)
+        return lambda: rule.deadlines(starts, deltas)
+    return setup
+
+
+def holiday_case(holidays, reverse):
+    """Ten consecutive holidays of a HolidayRule on its own."""
+    def setup():
+        rule = businesstimedelta.HolidayRule(holidays)
+        start = pytz.utc.localize(START)
+
+        def run():
+            dt = start
+            for _ in range(10):
+                period_start, period_end = rule.next(dt, reverse=reverse)
+                dt = period_start if reverse else period_end
+        return run
+    return setup
+
+
+def timed_round(setup, number, cold):
+    """Seconds that number calls take. The calendar is built once for the round,
+    or before every call if cold, outside of the time."""
+    if not cold:
+        func = setup()
+        start = clock()
+        for _ in range(number):
+            func()
+        return clock() - start
+
+    elapsed = 0.0
+    for _ in range(number):
+        # Drop the last calendar first, so that caches shared by equal calendars empty
+        func = None
+        func = setup()
+        start = clock()
+        func()
+        elapsed += clock() - start
+    return elapsed
+
+
+def measure(setup, min_time, repeat, cold=False):
+    """Best time per call in seconds. The number of calls per round is
+    calibrated so that a round takes at least min_time."""
+    number = 1
+    while True:
+        elapsed = timed_round(setup, number, cold)
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        best = min(best, timed_round(setup, number, cold) / number)
+    return best
+
+
+def format_time(seconds):
+    for unit, scale in [('s', 1), ('ms', 1e-3), ('us', 1e-6)]:
+        if seconds >= scale:
+            return '%.2f %s' % (seconds / scale, unit)
+    return '%.0f ns' % (seconds / 1e-9)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('-k', dest='keyword', help='only run cases whose name contains this')
+    parser.add_argument('--min-time', type=float, default=0.1, help='minimum seconds per round')
+    parser.add_argument('--repeat', type=int, default=3, help='rounds per case, the best one counts')
+    parser.add_argument('--save', help='write the results to this json file')
+    parser.add_argument('--compare', help='compare the results to this json file')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='ratio to the baseline above which a case counts as slower')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)['results']
+
+    results = {}
+    slower = []
+    for name, setup, cold in cases():
+        if args.keyword and args.keyword not in name:
+            continue
+
+        results[name] = measure(setup, args.min_time, args.repeat, cold)
+        line = '%-50s %12s' % (name, format_time(results[name]))
+        if baseline and name in baseline:
+            ratio = results[name] / baseline[name]
+            line += '  %6.2fx' % ratio
+            if ratio > args.threshold:
+                slower.append(name)
+                line += '  SLOWER'
+        print(line)
+        sys.stdout.flush()
+
+    if args.save:
+        with open(args.save, 'w') as fh:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'date': datetime.date.today().isoformat(),
+                'results': results,
+            }, fh, indent=2, sort_keys=True)
+            fh.write('\n')
+
+    if slower:
+        print('\n%s case(s) slower than %.2fx the baseline' % (len(slower), args.threshold))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,2 +1,7 @@
 from .rules import *
 from .businesstimedelta import *
+from .index import *
+from .cursor import *
+from .clock import *
+from .parallel import *
+from .calendars import *
@@ -0,0 +1,149 @@
+"""An asyncio front-end to business time calculations.
+
+Calculations are CPU work, which blocks the event loop when it is done inline.
+The AsyncCalculator gathers the calls that come in within a short window and
+hands them to an executor as one batch, after which each caller gets its own
+result:
+
+    calculator = AsyncCalculator(rules, start, end)
+    delta = await calculator.difference(opened_at, closed_at)
+    due = await calculator.add(opened_at, datetime.timedelta(hours=4))
+
+This module needs Python 3.5 or later, and isn't imported by the package itself.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from .businesstimedelta import BusinessTimeDelta
+
+# Python 3.5 and 3.6 have no get_running_loop, get_event_loop does the same within a coroutine
+_running_loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)
+
+
+class AsyncCalculator(object):
+    """Batch concurrent business time calculations on an executor.
+
+    Use it as an async context manager, or call close when done, to stop the
+    executor it starts by default.
+    """
+    def __init__(self, rule, start=None, end=None, window=0.001, max_batch=1000, executor=None):
+        """
+        Args:
+            rule: the rule to calculate with.
+            start: datetime at which to start compiling the rule, if it isn't compiled yet.
+            end: datetime up to which to compile the rule.
+            window: seconds to wait for more calls after the first call of a batch.
+            max_batch: number of calls after which a batch is sent right away.
+            executor: a concurrent.futures executor to calculate on. By default
+                a single thread is used, as rules are not thread-safe.
+        """
+        self.rule = rule
+        self.window = window
+        self.max_batch = max_batch
+
+        if start is not None and end is not None:
+            index = rule.period_index
+            if index is None or not (index.covers(start) and index.covers(end)):
+                rule.compile(start, end)
+
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._pending = []
+        self._timer = None
+
+    def __repr__(self):
+        return '<AsyncCalculator: %s pending>' % len(self._pending)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Shut down the executor, if the calculator started it."""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def difference(self, dt1, dt2):
+        """Same as Rule.difference."""
+        return await self._submit('difference', dt1, dt2)
+
+    async def add(self, dt, delta):
+        """Add a timedelta or BusinessTimeDelta of business time to a datetime."""
+        return await self._submit('add', dt, delta)
+
+    async def subtract(self, dt, delta):
+        """Same as add, but backwards in time"""
+        return await self._submit('subtract', dt, delta)
+
+    def _submit(self, operation, *args):
+        loop = _running_loop()
+        future = loop.create_future()
+        self._pending.append((operation, args, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return future
+
+    def _flush(self):
+        """Send the pending calls to the executor as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+
+        calculation = _running_loop().run_in_executor(
+            self._executor, _calculate, self.rule, [(x[0], x[1]) for x in batch])
+        calculation.add_done_callback(lambda x: _deliver([y[2] for y in batch], x))
+
+
+def _calculate(rule, calls):
+    """Run a batch of calls, catching the errors of each one.
+    Returns a list of (succeeded, result or exception) tuples."""
+    results = []
+    for operation, args in calls:
+        try:
+            results.append((True, OPERATIONS[operation](rule, *args)))
+        except Exception as e:
+            results.append((False, e))
+    return results
+
+
+def _deliver(futures, calculation):
+    """Pass the results of a batch on to the futures of its callers."""
+    if calculation.cancelled() or calculation.exception() is not None:
+        error = asyncio.CancelledError() if calculation.cancelled() else calculation.exception()
+        for future in futures:
+            if not future.done():
+                future.set_exception(error)
+        return
+
+    for future, (succeeded, result) in zip(futures, calculation.result()):
+        if future.done():
+            continue
+        if succeeded:
+            future.set_result(result)
+        else:
+            future.set_exception(result)
+
+
+def _business_time(rule, delta):
+    if isinstance(delta, BusinessTimeDelta):
+        return delta
+    return BusinessTimeDelta(rule, timedelta=delta)
+
+
+OPERATIONS = {
+    'difference': lambda rule, dt1, dt2: rule.difference(dt1, dt2),
+    'add': lambda rule, dt, delta: dt + _business_time(rule, delta),
+    'subtract': lambda rule, dt, delta: dt - _business_time(rule, delta),
+}
@@ -0,0 +1,47 @@
+import bisect
+from .intervals import MINUTE, SECOND, DAY, WEEK
+
+# The unix epoch is on a Thursday, this many microseconds after the start of its week
+EPOCH_WEEK_OFFSET = 3 * DAY
+
+
+class WeeklyBitmap(object):
+    """Which moments of a regular week fall within a set of weekly intervals.
+
+    The week is divided into minutes, with one byte per minute that tells whether
+    it is covered. If the intervals don't start and end on whole minutes, seconds
+    are used instead. Intervals that don't start and end on whole seconds are
+    looked up with a bisect.
+    """
+    def __init__(self, tz, intervals):
+        """
+        Args:
+            tz: time zone of the wall-clock time of the intervals.
+            intervals: merged list of (start, end) microsecond offsets from Monday midnight.
+        """
+        self.tz = tz
+        self.starts = [x[0] for x in intervals]
+        self.ends = [x[1] for x in intervals]
+        self.resolution = None
+        self.bits = None
+
+        for resolution in (MINUTE, SECOND):
+            if all(x % resolution == 0 for x in self.starts + self.ends):
+                self.resolution = resolution
+                self.bits = bytearray(WEEK // resolution)
+                for start, end in intervals:
+                    self.bits[start // resolution:end // resolution] = b'\x01' * ((end - start) // resolution)
+                break
+
+    def __repr__(self):
+        return '<WeeklyBitmap: %s intervals>' % len(self.starts)
+
+    def covers(self, wall):
+        """Whether a wall-clock time, in microseconds since the epoch of the wall clock,
+        falls within the intervals."""
+        position = (wall + EPOCH_WEEK_OFFSET) % WEEK
+        if self.bits is not None:
+            return bool(self.bits[position // self.resolution])
+
+        i = bisect.bisect_right(self.starts, position) - 1
+        return i >= 0 and position < self.ends[i]
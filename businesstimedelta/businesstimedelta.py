@@ -1,51 +1,52 @@
 import datetime
 import pytz
+from . import instrumentation
+from .intervals import SECOND, timedelta_to_microseconds
+from .timezones import FIXED_OFFSET_TYPES, fixed_offset
 
 
 def localize_unlocalized_dt(dt):
     """Turn naive datetime objects into UTC.
-    Don't do anything if the datetime object is aware.
+    Don't do anything if the datetime object is aware, unless its time zone does
+    wall-clock arithmetic (such as zoneinfo). Those get a fixed UTC offset instead.
     https://docs.python.org/3/library/datetime.html#datetime.timezone
     """
-    if dt.tzinfo is not None and dt.tzinfo.utcoffset(dt) is not None:
-        return dt
-    return pytz.utc.localize(dt)
+    if dt.tzinfo is not None:
+        offset = dt.tzinfo.utcoffset(dt)
+        if offset is not None:
+            if isinstance(dt.tzinfo, (pytz.BaseTzInfo,) + FIXED_OFFSET_TYPES):
+                return dt
+            return dt.replace(tzinfo=fixed_offset(offset))
+    return dt.replace(tzinfo=pytz.utc)
 
 
 class BusinessTimeDelta(object):
-    def __init__(self, rule, hours=0, seconds=0, timedelta=None):
+    """An amount of business time according to a rule.
+    The amount is kept as an integer number of microseconds."""
+    __slots__ = ('rule', '_microseconds')
+
+    def __init__(self, rule, hours=0, seconds=0, timedelta=None, microseconds=0):
         self.rule = rule
 
         if timedelta:
-            self.timedelta = timedelta
+            self._microseconds = timedelta_to_microseconds(timedelta)
         else:
-            self.timedelta = datetime.timedelta(
-                seconds=seconds,
-                hours=hours)
+            self._microseconds = int(round((hours * 3600 + seconds) * SECOND + microseconds))
 
     def __repr__(self):
         return '<BusinessTimeDelta %s hours %s seconds>' % (self.hours, self.seconds)
 
     def __eq__(self, other):
+        if isinstance(other, BusinessTimeDelta):
+            return self._microseconds == other._microseconds
         return self.timedelta == other.timedelta
 
     def __add__(self, other):
         if isinstance(other, BusinessTimeDelta) and other.rule == self.rule:
-            return BusinessTimeDelta(self.rule, timedelta=self.timedelta + other.timedelta)
+            return BusinessTimeDelta(self.rule, microseconds=self._microseconds + other._microseconds)
 
         elif isinstance(other, datetime.datetime):
-            dt = localize_unlocalized_dt(other)
-            td_left = self.timedelta
-            while True:
-                period_start, period_end = self.rule.next(dt)
-                period_delta = period_end - period_start
-
-                # If we ran out of timedelta, return
-                if period_delta >= td_left:
-                    return period_start + td_left
-
-                td_left -= period_delta
-                dt = period_end
+            return self._shift(other, reverse=False)
 
         raise NotImplementedError
 
@@ -54,29 +55,68 @@ class BusinessTimeDelta(object):
 
     def __sub__(self, other):
         if isinstance(other, BusinessTimeDelta) and other.rule == self.rule:
-            return BusinessTimeDelta(self.rule, timedelta=self.timedelta - other.timedelta)
+            return BusinessTimeDelta(self.rule, microseconds=self._microseconds - other._microseconds)
 
         elif isinstance(other, datetime.datetime):
-            dt = localize_unlocalized_dt(other)
-            td_left = self.timedelta
-            while True:
-                period_start, period_end = self.rule.previous(dt)
-                period_delta = period_end - period_start
-
-                # If we ran out of timedelta, return
-                if period_delta >= td_left:
-                    return period_end - td_left
-
-                td_left -= period_delta
-                dt = period_start
+            return self._shift(other, reverse=True)
 
     def __rsub__(self, other):
         return self.__sub__(other)
 
+    def _shift(self, dt, reverse):
+        """Walk through the periods of the rule from dt, forwards or backwards,
+        until this amount of business time is used up."""
+        dt = localize_unlocalized_dt(dt)
+        event = 'subtract' if reverse else 'add'
+        started = instrumentation.start()
+
+        index = self.rule.period_index
+        if index is not None:
+            result = index.subtract(dt, self.timedelta) if reverse else index.add(dt, self.timedelta)
+            if result is not None:
+                if started is not None:
+                    instrumentation.finish(event, started, self.rule, index_hits=1)
+                return result
+
+        amount = self._microseconds
+        periods = 0
+        skips = 0
+        while True:
+            for period_start, period_end in self.rule.iter_periods(dt, reverse=reverse):
+                periods += 1
+
+                # Jump over whole weeks at once if the rule allows it,
+                # and continue iterating from there
+                skipped = self.rule.skip_weeks(period_end if reverse else period_start, amount, reverse=reverse)
+                if skipped:
+                    dt, amount = skipped
+                    skips += 1
+                    break
+
+                period_length = timedelta_to_microseconds(period_end - period_start)
+
+                # If we ran out of business time, return
+                if period_length >= amount:
+                    if started is not None:
+                        instrumentation.finish(event, started, self.rule, periods=periods, skips=skips)
+                    if reverse:
+                        return period_end - datetime.timedelta(microseconds=amount)
+                    return period_start + datetime.timedelta(microseconds=amount)
+
+                amount -= period_length
+
+    @property
+    def timedelta(self):
+        return datetime.timedelta(microseconds=self._microseconds)
+
+    @timedelta.setter
+    def timedelta(self, value):
+        self._microseconds = timedelta_to_microseconds(value)
+
     @property
     def hours(self):
-        return int(self.timedelta.total_seconds() // (60 * 60))
+        return self._microseconds // SECOND // 3600
 
     @property
     def seconds(self):
-        return int(self.timedelta.total_seconds() % (60 * 60))
+        return self._microseconds // SECOND % 3600
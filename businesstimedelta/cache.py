@@ -0,0 +1,57 @@
+import collections
+
+CacheInfo = collections.namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class LRUCache(object):
+    """A mapping of limited size that drops the least recently used items first.
+    It keeps count of hits and misses, in the same way as functools.lru_cache.
+    """
+    def __init__(self, maxsize=1024):
+        """
+        Args:
+            maxsize: maximum number of items to keep. 0 disables the cache.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = collections.OrderedDict()
+
+    def __repr__(self):
+        return '<LRUCache: %s>' % (self.info(),)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        """Get an item and mark it as most recently used."""
+        try:
+            value = self._items.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self._items[key] = value
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """Store an item, dropping the least recently used one if the cache is full."""
+        if not self.maxsize:
+            return
+
+        self._items.pop(key, None)
+        self._items[key] = value
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        self._items.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._items))
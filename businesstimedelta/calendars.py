@@ -0,0 +1,105 @@
+from .businesstimedelta import BusinessTimeDelta, localize_unlocalized_dt
+from .intervals import (
+    SECOND, datetime_to_microseconds, intervals_length, merge_intervals, subtract_intervals)
+from .rules.rules import Rules
+from .timeline import split_rules
+
+
+class MultiCalendar(object):
+    """Evaluate the same query against many calendars at once.
+
+    Calendars often differ in little more than their holidays. Rules that are
+    defined the same way in several calendars are evaluated once per query,
+    after which each calendar only combines the periods it needs. Calendars
+    that consist of the same rules share their result altogether.
+    """
+    def __init__(self, calendars):
+        """
+        Args:
+            calendars: a list of rules, or a dict of names to rules.
+        """
+        self.names = list(calendars) if hasattr(calendars, 'keys') else None
+        self.calendars = [calendars[x] for x in self.names] if self.names is not None else list(calendars)
+
+        # The distinct rules of all calendars, and for each calendar the positions of
+        # its available, unavailable and override rules among them.
+        self.rules = []
+        positions = {}
+        self._plans = []
+        for calendar in self.calendars:
+            plan = []
+            for rules in _split_calendar(calendar):
+                keys = set()
+                for rule in rules:
+                    # Rules that are defined the same way are equal
+                    if rule not in positions:
+                        positions[rule] = len(self.rules)
+                        self.rules.append(rule)
+                    keys.add(positions[rule])
+                plan.append(tuple(sorted(keys)))
+            self._plans.append(tuple(plan))
+
+    def __repr__(self):
+        return '<MultiCalendar: %s calendars, %s rules>' % (len(self.calendars), len(self.rules))
+
+    def difference(self, dt1, dt2):
+        """Calculate the business time between two datetime objects in every calendar.
+        Output:
+            list of BusinessTimeDelta objects in the order of the calendars,
+            or a dict of them if the calendars were given as a dict.
+        """
+        results = [
+            BusinessTimeDelta(calendar, seconds=result // SECOND)
+            for calendar, result in zip(self.calendars, self._difference_microseconds(dt1, dt2))]
+        return self._output(results)
+
+    def difference_microseconds(self, dt1, dt2):
+        """Same as difference, as exact numbers of microseconds."""
+        return self._output(self._difference_microseconds(dt1, dt2))
+
+    def _difference_microseconds(self, dt1, dt2):
+        start_dt, end_dt = sorted([localize_unlocalized_dt(dt1), localize_unlocalized_dt(dt2)])
+
+        # Each distinct rule, and each distinct combination of them, is worked out only once
+        periods = {}
+        merged = {}
+        totals = {}
+
+        def rule_periods(i):
+            if i not in periods:
+                periods[i] = [
+                    (datetime_to_microseconds(period_start), datetime_to_microseconds(period_end))
+                    for period_start, period_end in self.rules[i].iter_periods(start_dt, end_dt)]
+            return periods[i]
+
+        def merged_periods(keys):
+            if keys not in merged:
+                intervals = []
+                for i in keys:
+                    intervals.extend(rule_periods(i))
+                merged[keys] = merge_intervals(intervals)
+            return merged[keys]
+
+        results = []
+        for plan in self._plans:
+            if plan not in totals:
+                available, unavailable, overrides = plan
+                business = subtract_intervals(merged_periods(available), merged_periods(unavailable))
+                if overrides:
+                    business = merge_intervals(business + merged_periods(overrides))
+                totals[plan] = intervals_length(business)
+            results.append(totals[plan])
+        return results
+
+    def _output(self, results):
+        if self.names is None:
+            return results
+        return dict(zip(self.names, results))
+
+
+def _split_calendar(calendar):
+    """The available, unavailable and override rules of a calendar."""
+    if isinstance(calendar, Rules):
+        return (calendar.available_rules, calendar.unavailable_rules, calendar.override_rules)
+    return split_rules([calendar])
+
@@ -0,0 +1,91 @@
+import datetime
+import pytz
+from .businesstimedelta import BusinessTimeDelta, localize_unlocalized_dt
+
+
+class BusinessClock(object):
+    """A running total of the business time that has passed since a start.
+
+    Each tick adds the business time since the previous tick, so an update costs
+    the same however long the clock has been running. While the clock is paused,
+    ticks move it along without adding any business time.
+
+    Methods that take the current time use the actual time when it is left out.
+    """
+    def __init__(self, rule, start=None, paused=False):
+        """
+        Args:
+            rule: the rule that defines business time.
+            start: datetime at which the clock starts.
+            paused: whether the clock starts out paused.
+        """
+        self.rule = rule
+        self.last_tick = self._now(start)
+        self.paused = paused
+        self._microseconds = 0
+
+    def __repr__(self):
+        return '<BusinessClock: %s%s>' % (self.elapsed, ' paused' if self.paused else '')
+
+    @property
+    def elapsed(self):
+        """The business time on the clock as of the last tick, as a BusinessTimeDelta."""
+        return BusinessTimeDelta(self.rule, microseconds=self._microseconds)
+
+    def tick(self, now=None):
+        """Bring the clock up to a datetime. Raises ValueError if it lies before the last tick.
+        Returns the elapsed business time."""
+        now = self._now(now)
+        if now < self.last_tick:
+            raise ValueError('The clock is at %s and can not go back to %s' % (self.last_tick, now))
+
+        if not self.paused:
+            self._microseconds += self.rule.difference_microseconds(self.last_tick, now)
+        self.last_tick = now
+        return self.elapsed
+
+    def pause(self, now=None):
+        """Stop adding business time from a datetime on."""
+        self.tick(now)
+        self.paused = True
+        return self.elapsed
+
+    def resume(self, now=None):
+        """Start adding business time again from a datetime on."""
+        self.tick(now)
+        self.paused = False
+        return self.elapsed
+
+    def to_dict(self):
+        """The state of the clock in a dict that can be serialized as json. The rule is left out."""
+        return {
+            'last_tick': self.last_tick.astimezone(pytz.utc).isoformat(),
+            'paused': self.paused,
+            'elapsed': self._microseconds,
+        }
+
+    @classmethod
+    def from_dict(cls, rule, data):
+        """Restore a clock from the output of to_dict.
+        Args:
+            rule: the rule of the clock.
+            data: the dict from to_dict.
+        """
+        clock = cls(rule, _parse_isoformat(data['last_tick']), paused=data['paused'])
+        clock._microseconds = data['elapsed']
+        return clock
+
+    @staticmethod
+    def _now(dt):
+        if dt is None:
+            return datetime.datetime.now(pytz.utc)
+        return localize_unlocalized_dt(dt)
+
+
+def _parse_isoformat(value):
+    """Read the isoformat of an aware datetime, as UTC. Python 2 has neither
+    datetime.fromisoformat nor %z in strptime."""
+    value, sign, offset = value[:-6], value[-6], value[-5:]
+    dt = datetime.datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f' if '.' in value else '%Y-%m-%dT%H:%M:%S')
+    offset = datetime.timedelta(hours=int(offset[:2]), minutes=int(offset[3:]))
+    return pytz.utc.localize(dt - offset if sign == '+' else dt + offset)
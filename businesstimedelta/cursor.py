@@ -0,0 +1,53 @@
+from .businesstimedelta import localize_unlocalized_dt
+
+
+class Cursor(object):
+    """Answers next and is_business_time for datetimes that only move forward.
+
+    The cursor walks through the periods of a rule once, lazily, and keeps its
+    place. Each query moves it past the periods that have ended since the
+    previous query, so a stream of increasing datetimes costs about one step
+    per period instead of a full search per datetime.
+    """
+    def __init__(self, rule):
+        """
+        Args:
+            rule: the rule to walk through.
+        """
+        self.rule = rule
+        self.position = None
+        self._periods = None
+        self._period = None
+
+    def __repr__(self):
+        return '<Cursor: at %s>' % (self.position,)
+
+    def next(self, dt):
+        """Same as Rule.next. Raises ValueError if dt lies before the previous query."""
+        dt = self._advance(dt)
+        if self._period is None:
+            return self.rule.next(dt)
+
+        start, end = self._period
+        return (max(start, dt), end)
+
+    def is_business_time(self, dt):
+        """Same as Rule.is_business_time. Raises ValueError if dt lies before the previous query."""
+        dt = self._advance(dt)
+        return self._period is not None and self._period[0] <= dt
+
+    def _advance(self, dt):
+        """Move to the first period that hasn't ended at dt."""
+        dt = localize_unlocalized_dt(dt)
+        if self.position is not None and dt < self.position:
+            raise ValueError('The cursor is at %s and can not move back to %s' % (self.position, dt))
+
+        if self._periods is None:
+            self._periods = self.rule.iter_periods(dt)
+            self._period = next(self._periods, None)
+
+        while self._period is not None and self._period[1] <= dt:
+            self._period = next(self._periods, None)
+
+        self.position = dt
+        return dt
@@ -0,0 +1,92 @@
+import datetime
+import heapq
+from . import instrumentation
+from .businesstimedelta import BusinessTimeDelta, localize_unlocalized_dt
+from .intervals import datetime_to_microseconds, timedelta_to_microseconds
+
+
+def deadlines(rule, starts, deltas, reverse=False):
+    """Add business time to many datetimes with one sweep through the periods of a rule.
+
+    The datetimes are sorted, after which the periods are walked once from the
+    earliest of them. Each datetime joins the sweep once it is reached, and is
+    done once its business time is used up. This pays off when the datetimes lie
+    close together, as their periods are then only looked up once.
+
+    Args:
+        rule: the rule to calculate with.
+        starts: an iterable of datetime objects.
+        deltas: an iterable of timedelta or BusinessTimeDelta objects.
+        reverse: subtract the business time instead.
+    Output:
+        list of aware datetime objects, in the order of the input.
+    """
+    starts = [localize_unlocalized_dt(x) for x in starts]
+    amounts = [
+        timedelta_to_microseconds(x.timedelta if isinstance(x, BusinessTimeDelta) else x)
+        for x in deltas]
+    if len(starts) != len(amounts):
+        raise ValueError('Got %s datetimes and %s deltas' % (len(starts), len(amounts)))
+
+    results = [None] * len(starts)
+    if not starts:
+        return results
+    started = instrumentation.start()
+
+    # Going backwards, the moments are negated, so that the sweep can always go up
+    sign = -1 if reverse else 1
+    moments = [sign * datetime_to_microseconds(x) for x in starts]
+    order = sorted(range(len(starts)), key=moments.__getitem__)
+
+    # Business time is counted from the start of the sweep. The pending heap holds
+    # (counted business time at which it is done, position, start if within a period,
+    # counted business time at that start) for each datetime that joined the sweep.
+    position = 0
+    pending = []
+    used = 0
+    dt = starts[order[0]]
+    periods = 0
+    skips = 0
+
+    while position < len(order) or pending:
+        for period_start, period_end in rule.iter_periods(dt, reverse=reverse):
+            periods += 1
+            near, far = (period_end, period_start) if reverse else (period_start, period_end)
+            near_moment = sign * datetime_to_microseconds(near)
+            length = sign * datetime_to_microseconds(far) - near_moment
+
+            # Datetimes before the end of this period join the sweep here
+            while position < len(order) and moments[order[position]] < near_moment + length:
+                i = order[position]
+                position += 1
+                if moments[i] > near_moment:
+                    counted = used + moments[i] - near_moment
+                    heapq.heappush(pending, (counted + amounts[i], i, starts[i], counted))
+                else:
+                    heapq.heappush(pending, (used + amounts[i], i, None, used))
+
+            # Once everything has joined, jump over whole weeks at once if the rule allows it,
+            # and continue iterating from there
+            if position == len(order):
+                skipped = rule.skip_weeks(near, pending[0][0] - used, reverse=reverse)
+                if skipped:
+                    dt, amount = skipped
+                    used = pending[0][0] - amount
+                    skips += 1
+                    break
+
+            while pending and pending[0][0] <= used + length:
+                target, i, start, counted = heapq.heappop(pending)
+                # A datetime that started within this period counts from its start
+                if start is None or counted < used:
+                    start, counted = near, used
+                shift = datetime.timedelta(microseconds=target - counted)
+                results[i] = start - shift if reverse else start + shift
+
+            used += length
+            if position == len(order) and not pending:
+                break
+
+    if started is not None:
+        instrumentation.finish('deadlines', started, rule, periods=periods, skips=skips)
+    return results
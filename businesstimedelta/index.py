@@ -0,0 +1,432 @@
+import bisect
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import pytz
+from .businesstimedelta import BusinessTimeDelta, localize_unlocalized_dt
+from .intervals import (
+    datetime_to_microseconds, microseconds_to_datetime,
+    microseconds_to_timedelta, timedelta_to_microseconds)
+
+# The value numpy uses for NaT, marks results that can't be looked up in an index
+NAT = -2 ** 63
+
+# Index files start with this, followed by the header and the arrays of int64 in native byte order
+FILE_MAGIC = b'BTDINDEX'
+FILE_VERSION = 1
+FILE_HEADER = struct.Struct('=8sBBxxxxxxqqqq')
+
+# Moves a file over another one in one step. On Python 2 only rename does, on Unix.
+_replace = getattr(os, 'replace', os.rename)
+
+
+def _save_tz(tz):
+    """The time zone as it is written to an index file: the name of a named time
+    zone, or the UTC offset in minutes of a fixed offset, such as '+120'."""
+    name = getattr(tz, 'zone', None) or getattr(tz, 'key', None)
+    if name:
+        return name
+
+    offset = tz.utcoffset(None)
+    if offset is None or timedelta_to_microseconds(offset) % 60000000:
+        raise ValueError('The time zone %s can not be saved, use a named time zone' % (tz,))
+    return '%+d' % (timedelta_to_microseconds(offset) // 60000000)
+
+
+def _load_tz(name):
+    """Reverse of _save_tz"""
+    if name[0] in '+-':
+        return pytz.FixedOffset(int(name))
+    return pytz.timezone(name)
+
+
+class PeriodIndex(object):
+    """The business periods of a rule over a fixed horizon, together with the
+    business time that has passed at the start of each period.
+
+    With this index the business time between two moments is found with two
+    bisects and a subtraction, instead of a walk over all periods in between.
+    All moments are stored as integer microseconds since the unix epoch.
+    """
+    def __init__(self, starts, ends, cumulative, horizon_start, horizon_end, tz=pytz.utc):
+        """
+        Args:
+            starts: sorted start of each period.
+            ends: end of each period.
+            cumulative: business time before the start of each period, followed
+                by the total business time in the index.
+            horizon_start: first moment the index knows about.
+            horizon_end: last moment the index knows about.
+            tz: time zone of the datetime objects the index returns.
+        """
+        self.starts = starts
+        self.ends = ends
+        self.cumulative = cumulative
+        self.horizon_start = horizon_start
+        self.horizon_end = horizon_end
+        self.tz = tz
+        self.path = None
+        self._arrays = None
+
+    def __getstate__(self):
+        # An index that is mapped from a file is sent as its path, so that
+        # the other side maps the same file instead of receiving a copy.
+        if self.path is not None:
+            return {'path': self.path}
+
+        # The numpy arrays are a cache, leave them out when pickling
+        state = self.__dict__.copy()
+        state['_arrays'] = None
+        return state
+
+    def __setstate__(self, state):
+        if 'starts' not in state:
+            state = PeriodIndex.load(state['path']).__dict__
+        self.__dict__.update(state)
+
+    def __repr__(self):
+        return '<PeriodIndex: %s periods from %s to %s>' % (
+            len(self.starts),
+            microseconds_to_datetime(self.horizon_start, self.tz),
+            microseconds_to_datetime(self.horizon_end, self.tz))
+
+    @classmethod
+    def from_rule(cls, rule, start, end):
+        """Walk the periods of a rule once to build its index.
+        Args:
+            rule: the rule to index.
+            start: datetime at which the horizon starts.
+            end: datetime up to which the horizon extends at least.
+        """
+        start = localize_unlocalized_dt(start)
+        end = localize_unlocalized_dt(end)
+        starts = []
+        ends = []
+        cumulative = [0]
+
+        # There is no business time between the last period and the first one past
+        # the end, so the horizon extends up to the start of that one.
+        horizon_end = end
+        for period_start, period_end in rule.iter_periods(start):
+            if period_start >= end:
+                horizon_end = period_start
+                break
+
+            period_start_us = datetime_to_microseconds(period_start)
+            period_end_us = datetime_to_microseconds(period_end)
+
+            # Merge periods that follow each other without a gap
+            if ends and ends[-1] == period_start_us:
+                ends[-1] = period_end_us
+                cumulative[-1] += period_end_us - period_start_us
+            else:
+                starts.append(period_start_us)
+                ends.append(period_end_us)
+                cumulative.append(cumulative[-1] + period_end_us - period_start_us)
+
+        return cls(
+            starts, ends, cumulative,
+            datetime_to_microseconds(start),
+            datetime_to_microseconds(horizon_end),
+            tz=rule.tz)
+
+    def save(self, path):
+        """Write the index to a binary file, which load maps back into memory.
+
+        The file is written next to path and then moved over it, so indexes that
+        were loaded from an earlier version of the file keep reading that one.
+        """
+        tz_name = _save_tz(self.tz).encode('ascii')
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(FILE_HEADER.pack(
+                    FILE_MAGIC, FILE_VERSION, sys.byteorder == 'little',
+                    len(self.starts), self.horizon_start, self.horizon_end, len(tz_name)))
+                fh.write(tz_name.ljust((len(tz_name) + 7) // 8 * 8, b'\0'))
+                for values in (self.starts, self.ends, self.cumulative):
+                    fh.write(struct.pack('=%dq' % len(values), *values))
+            _replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """Map an index file written by save into memory, read-only.
+
+        The periods are read straight from the mapped file, so processes that load
+        the same file share one copy of it in the page cache, and nothing is read
+        until it is needed.
+        """
+        with open(path, 'rb') as fh:
+            mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(mapped) < FILE_HEADER.size:
+            raise ValueError('%s is not a period index file' % path)
+        magic, version, little_endian, count, horizon_start, horizon_end, tz_length = \
+            FILE_HEADER.unpack_from(mapped)
+        if magic != FILE_MAGIC or version != FILE_VERSION:
+            raise ValueError('%s is not a period index file' % path)
+        if little_endian != (sys.byteorder == 'little'):
+            raise ValueError('%s was written on a machine with a different byte order' % path)
+
+        offset = FILE_HEADER.size
+        tz = _load_tz(mapped[offset:offset + tz_length].decode('ascii'))
+        offset += (tz_length + 7) // 8 * 8
+        if len(mapped) < offset + (3 * count + 1) * 8:
+            raise ValueError('%s is cut short' % path)
+
+        arrays = []
+        for length in (count, count, count + 1):
+            if hasattr(memoryview, 'cast'):
+                arrays.append(memoryview(mapped)[offset:offset + 8 * length].cast('q'))
+            else:
+                # Python 2 can't view the mapped file as integers, it reads a copy
+                arrays.append(struct.unpack_from('=%dq' % length, mapped, offset))
+            offset += 8 * length
+
+        index = cls(arrays[0], arrays[1], arrays[2], horizon_start, horizon_end, tz=tz)
+        index.path = path
+        return index
+
+    def covers(self, dt):
+        """Whether a datetime lies within the horizon of this index."""
+        return self.horizon_start <= datetime_to_microseconds(localize_unlocalized_dt(dt)) <= self.horizon_end
+
+    def business_time(self, moment):
+        """Business time between the start of the horizon and a moment, both in microseconds."""
+        i = bisect.bisect_right(self.starts, moment) - 1
+        if i < 0:
+            return 0
+        return self.cumulative[i] + min(moment, self.ends[i]) - self.starts[i]
+
+    def contains_microseconds(self, moment):
+        """Whether a moment in microseconds falls within one of the periods,
+        or None if it is outside of the horizon."""
+        if not self._in_horizon(moment):
+            return None
+
+        i = bisect.bisect_right(self.starts, moment) - 1
+        return i >= 0 and moment < self.ends[i]
+
+    def next(self, dt):
+        """The current or upcoming period, like Rule.next, or None if it
+        isn't within the horizon."""
+        moment = datetime_to_microseconds(localize_unlocalized_dt(dt))
+        if not self._in_horizon(moment):
+            return None
+
+        i = bisect.bisect_right(self.ends, moment)
+        if i >= len(self.starts):
+            return None
+
+        return (
+            microseconds_to_datetime(max(self.starts[i], moment), self.tz),
+            microseconds_to_datetime(self.ends[i], self.tz))
+
+    def previous(self, dt):
+        """Same as next, but backwards in time"""
+        moment = datetime_to_microseconds(localize_unlocalized_dt(dt))
+        if not self._in_horizon(moment):
+            return None
+
+        # The first period may have started before the horizon
+        i = bisect.bisect_left(self.starts, moment) - 1
+        if i < 0 or self.starts[i] <= self.horizon_start:
+            return None
+
+        return (
+            microseconds_to_datetime(self.starts[i], self.tz),
+            microseconds_to_datetime(min(self.ends[i], moment), self.tz))
+
+    def difference(self, dt1, dt2):
+        """Business time between two datetimes as a timedelta,
+        or None if they are not both within the horizon."""
+        result = self.difference_microseconds(
+            datetime_to_microseconds(localize_unlocalized_dt(dt1)),
+            datetime_to_microseconds(localize_unlocalized_dt(dt2)))
+        if result is None:
+            return None
+        return microseconds_to_timedelta(result)
+
+    def difference_microseconds(self, moment1, moment2):
+        """Same as difference, for moments and a result in microseconds."""
+        if not self._in_horizon(moment1) or not self._in_horizon(moment2):
+            return None
+
+        return abs(self.business_time(moment2) - self.business_time(moment1))
+
+    def add(self, dt, td):
+        """Add an amount of business time to a datetime.
+        Returns None if either of them falls outside of the horizon."""
+        result = self.add_microseconds(
+            datetime_to_microseconds(localize_unlocalized_dt(dt)),
+            timedelta_to_microseconds(td))
+        if result is None:
+            return None
+        return microseconds_to_datetime(result, self.tz)
+
+    def add_microseconds(self, moment, amount):
+        """Same as add, for a moment, amount and result in microseconds."""
+        if amount < 0 or not self._in_horizon(moment):
+            return None
+
+        target = self.business_time(moment) + amount
+        if amount:
+            # The first period in which the target amount is reached
+            i = bisect.bisect_left(self.cumulative, target, 1) - 1
+        else:
+            # The first period that hasn't ended yet
+            i = bisect.bisect_right(self.ends, moment)
+
+        if i >= len(self.starts):
+            return None
+
+        return self.starts[i] + target - self.cumulative[i]
+
+    def subtract(self, dt, td):
+        """Subtract an amount of business time from a datetime.
+        Returns None if either of them falls outside of the horizon."""
+        result = self.subtract_microseconds(
+            datetime_to_microseconds(localize_unlocalized_dt(dt)),
+            timedelta_to_microseconds(td))
+        if result is None:
+            return None
+        return microseconds_to_datetime(result, self.tz)
+
+    def subtract_microseconds(self, moment, amount):
+        """Same as subtract, for a moment, amount and result in microseconds."""
+        if amount < 0 or not self._in_horizon(moment):
+            return None
+
+        target = self.business_time(moment) - amount
+        if target < 0:
+            return None
+
+        if amount:
+            # The last period that starts before the target amount is reached
+            i = bisect.bisect_right(self.cumulative, target, 0, len(self.starts)) - 1
+            return self.starts[i] + target - self.cumulative[i]
+
+        # The last period that started before this moment
+        i = bisect.bisect_left(self.starts, moment) - 1
+        if i < 0:
+            return None
+        return min(self.ends[i], moment)
+
+    def _in_horizon(self, moment):
+        return self.horizon_start <= moment <= self.horizon_end
+
+    def arrays(self):
+        """The starts, ends and cumulative business time of the periods as numpy arrays."""
+        if self._arrays is None:
+            import numpy
+            self._arrays = (
+                numpy.asarray(self.starts, dtype=numpy.int64),
+                numpy.asarray(self.ends, dtype=numpy.int64),
+                numpy.asarray(self.cumulative, dtype=numpy.int64))
+        return self._arrays
+
+    def business_time_many(self, moments):
+        """Vectorized business_time for a numpy array of moments in microseconds."""
+        import numpy
+        starts, ends, cumulative = self.arrays()
+        if not len(starts):
+            return numpy.zeros(len(moments), dtype=numpy.int64)
+
+        i = numpy.searchsorted(starts, moments, side='right') - 1
+        period = numpy.maximum(i, 0)
+        result = cumulative[period] + numpy.minimum(moments, ends[period]) - starts[period]
+        return numpy.where(i < 0, 0, result)
+
+    def contains_many(self, moments):
+        """Vectorized contains_microseconds for a numpy array of moments in microseconds.
+        Returns a boolean array, moments outside of the horizon are False."""
+        import numpy
+        starts, ends, cumulative = self.arrays()
+        if not len(starts):
+            return numpy.zeros(len(moments), dtype=bool)
+
+        i = numpy.searchsorted(starts, moments, side='right') - 1
+        return (i >= 0) & (moments < ends[numpy.maximum(i, 0)]) & self._in_horizon_many(moments)
+
+    def difference_many(self, starts, ends):
+        """Vectorized difference for numpy arrays of moments in microseconds.
+        Returns the business time in microseconds, or NAT where a moment is
+        outside of the horizon."""
+        import numpy
+        result = numpy.abs(self.business_time_many(ends) - self.business_time_many(starts))
+        valid = self._in_horizon_many(starts) & self._in_horizon_many(ends)
+        return numpy.where(valid, result, NAT)
+
+    def add_many(self, moments, amounts):
+        """Vectorized add for numpy arrays of moments and amounts in microseconds.
+        Returns the resulting moments, or NAT where they are outside of the horizon."""
+        import numpy
+        starts, ends, cumulative = self.arrays()
+        target = self.business_time_many(moments) + amounts
+        i = numpy.where(
+            amounts > 0,
+            numpy.searchsorted(cumulative[1:], target, side='left'),
+            numpy.searchsorted(ends, moments, side='right'))
+
+        valid = self._in_horizon_many(moments) & (amounts >= 0) & (i < len(starts))
+        if not len(starts):
+            return numpy.full(len(moments), NAT, dtype=numpy.int64)
+
+        period = numpy.minimum(i, len(starts) - 1)
+        return numpy.where(valid, starts[period] + target - cumulative[period], NAT)
+
+    def subtract_many(self, moments, amounts):
+        """Vectorized subtract for numpy arrays of moments and amounts in microseconds.
+        Returns the resulting moments, or NAT where they are outside of the horizon."""
+        import numpy
+        starts, ends, cumulative = self.arrays()
+        target = self.business_time_many(moments) - amounts
+        i = numpy.where(
+            amounts > 0,
+            numpy.searchsorted(cumulative[:-1], target, side='right') - 1,
+            numpy.searchsorted(starts, moments, side='left') - 1)
+
+        valid = self._in_horizon_many(moments) & (amounts >= 0) & (target >= 0) & (i >= 0)
+        if not len(starts):
+            return numpy.full(len(moments), NAT, dtype=numpy.int64)
+
+        period = numpy.maximum(i, 0)
+        result = numpy.where(
+            amounts > 0,
+            starts[period] + target - cumulative[period],
+            numpy.minimum(ends[period], moments))
+        return numpy.where(valid, result, NAT)
+
+    def _in_horizon_many(self, moments):
+        return (moments >= self.horizon_start) & (moments <= self.horizon_end)
+
+
+def datetimes_to_microseconds(values):
+    """Convert a numpy datetime64 array or a list of datetimes to a numpy array
+    of microseconds since the unix epoch. Naive values are taken to be UTC."""
+    import numpy
+    values = numpy.asarray(values)
+    if values.dtype.kind == 'M':
+        return values.astype('datetime64[us]').astype(numpy.int64)
+
+    return numpy.array(
+        [datetime_to_microseconds(localize_unlocalized_dt(x)) for x in values],
+        dtype=numpy.int64)
+
+
+def timedeltas_to_microseconds(values):
+    """Convert a numpy timedelta64 array or a list of timedelta or BusinessTimeDelta
+    objects to a numpy array of microseconds."""
+    import numpy
+    values = numpy.asarray(values)
+    if values.dtype.kind == 'm':
+        return values.astype('timedelta64[us]').astype(numpy.int64)
+
+    return numpy.array(
+        [timedelta_to_microseconds(x.timedelta if isinstance(x, BusinessTimeDelta) else x) for x in values],
+        dtype=numpy.int64)
@@ -0,0 +1,102 @@
+"""Opt-in counters and timings of rule evaluation.
+
+While disabled, which is the default, the calculations only check the
+`enabled` flag of this module. Once enabled, they record events such as:
+
+    add.calls, add.seconds, add.periods, add.skips, add.index_hits
+    subtract.*, difference.*, deadlines.* (the same as for add)
+    difference.totals (cached monthly and yearly totals that were used)
+    Rules.next.restarts, Rules.previous.restarts
+    WorkDayRule.next, WorkDayRule.previous, HolidayRule.next
+    HolidayRule.next_holiday.years, HolidayRule.index_year.days (days of the years expanded)
+    localize
+
+Every event has a value, which is 1 for plain counts. The values are summed
+up in `stats`, in total and per rule (equal rules count as one), and passed
+on to any callbacks, for example to export them to a metrics system:
+
+    instrumentation.enable(lambda event, value, rule: statsd.incr(event, value))
+"""
+import collections
+import time
+import weakref
+
+enabled = False
+
+_callbacks = []
+
+# Python 2 has no perf_counter
+_clock = getattr(time, 'perf_counter', time.time)
+
+
+class Stats(object):
+    """Totals of the recorded events."""
+    def __init__(self):
+        self.reset()
+
+    def __repr__(self):
+        return '<Stats: %s events>' % len(self.totals)
+
+    def record(self, event, value=1, rule=None):
+        self.counts[event] += 1
+        self.totals[event] += value
+        if rule is not None:
+            try:
+                self.by_rule[rule][event] += value
+            except KeyError:
+                self.by_rule[rule] = collections.Counter({event: value})
+
+    def reset(self):
+        """Forget everything that was recorded so far."""
+        self.counts = collections.Counter()
+        self.totals = collections.Counter()
+        self.by_rule = weakref.WeakKeyDictionary()
+
+    def snapshot(self):
+        """The totals as a plain dict of event name to value."""
+        return dict(self.totals)
+
+
+stats = Stats()
+
+
+def enable(callback=None):
+    """Start recording, and optionally add a callback(event, value, rule)."""
+    global enabled
+    if callback is not None:
+        add_callback(callback)
+    enabled = True
+
+
+def disable():
+    """Stop recording. The stats and callbacks are kept."""
+    global enabled
+    enabled = False
+
+
+def add_callback(callback):
+    _callbacks.append(callback)
+
+
+def remove_callback(callback):
+    _callbacks.remove(callback)
+
+
+def record(event, value=1, rule=None):
+    """Record an event. Callers check the enabled flag first."""
+    stats.record(event, value, rule)
+    for callback in _callbacks:
+        callback(event, value, rule)
+
+
+def start():
+    """The moment a timed calculation starts, or None if disabled."""
+    return _clock() if enabled else None
+
+
+def finish(event, started, rule=None, **counts):
+    """Record the calls, duration and counts of a calculation that was started with start."""
+    record(event + '.calls', 1, rule)
+    record(event + '.seconds', _clock() - started, rule)
+    for name, value in counts.items():
+        record('%s.%s' % (event, name), value, rule)
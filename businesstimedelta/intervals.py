@@ -0,0 +1,89 @@
+import datetime
+import pytz
+
+# Lengths of time in microseconds
+SECOND = 10 ** 6
+MINUTE = 60 * SECOND
+DAY = 24 * 60 * 60 * SECOND
+WEEK = 7 * DAY
+
+EPOCH = pytz.utc.localize(datetime.datetime(1970, 1, 1))
+EPOCH_ORDINAL = EPOCH.toordinal()
+
+
+def time_to_microseconds(time):
+    """Microseconds between midnight and a time object."""
+    return ((time.hour * 60 + time.minute) * 60 + time.second) * SECOND + time.microsecond
+
+
+def timedelta_to_microseconds(td):
+    """Express a timedelta as an integer amount of microseconds."""
+    return (td.days * DAY) + (td.seconds * SECOND) + td.microseconds
+
+
+def microseconds_to_timedelta(microseconds):
+    return datetime.timedelta(microseconds=microseconds)
+
+
+def datetime_to_microseconds(dt):
+    """Microseconds between the unix epoch and an aware datetime."""
+    return timedelta_to_microseconds(dt - EPOCH)
+
+
+def microseconds_to_datetime(microseconds, tz=pytz.utc):
+    """Aware datetime in tz for an amount of microseconds since the unix epoch."""
+    return (EPOCH + datetime.timedelta(microseconds=microseconds)).astimezone(tz)
+
+
+def microseconds_to_date(microseconds):
+    """Date of a wall-clock time, given in microseconds since the epoch of the wall clock."""
+    return datetime.date.fromordinal(EPOCH_ORDINAL + microseconds // DAY)
+
+
+def merge_intervals(intervals):
+    """Sort a list of (start, end) intervals and merge the ones that overlap or touch.
+    Empty intervals are dropped.
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+
+    return merged
+
+
+def subtract_intervals(intervals, removed):
+    """Remove one list of intervals from another with a single linear sweep.
+    Args:
+        intervals: merged (sorted and disjoint) intervals.
+        removed: merged intervals to take out of intervals.
+    """
+    result = []
+    i = 0
+    for start, end in intervals:
+        # Skip the removed intervals that end before this interval starts
+        while i < len(removed) and removed[i][1] <= start:
+            i += 1
+
+        j = i
+        while j < len(removed) and removed[j][0] < end:
+            if removed[j][0] > start:
+                result.append((start, removed[j][0]))
+            start = max(start, removed[j][1])
+            j += 1
+
+        if start < end:
+            result.append((start, end))
+
+    return result
+
+
+def intervals_length(intervals):
+    """Total length of a list of disjoint intervals."""
+    return sum(end - start for start, end in intervals)
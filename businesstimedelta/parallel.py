@@ -0,0 +1,141 @@
+from .businesstimedelta import BusinessTimeDelta, localize_unlocalized_dt
+from .intervals import (
+    SECOND, datetime_to_microseconds, microseconds_to_datetime, timedelta_to_microseconds)
+
+# The index of the worker process, set once when the worker starts
+_worker_index = None
+
+
+class ParallelCalculator(object):
+    """Spread business time calculations over a pool of processes.
+
+    The rule is compiled once, and only its PeriodIndex is sent to each worker
+    when the worker starts. The input is split into chunks of moments in
+    microseconds, which the workers look up in the index. Results come back
+    in the order of the input. Anything outside of the compiled horizon is
+    calculated by the rule itself, in this process.
+
+    Use it as a context manager, or call close when done, to stop the workers.
+    """
+    def __init__(self, rule, start, end, max_workers=None, chunksize=10000):
+        """
+        Args:
+            rule: the rule to calculate with.
+            start: datetime at which the compiled horizon starts.
+            end: datetime up to which the compiled horizon extends at least.
+            max_workers: number of worker processes, the number of CPUs by default.
+            chunksize: number of calculations sent to a worker at once.
+        """
+        self.rule = rule
+        self.chunksize = chunksize
+        self.max_workers = max_workers
+
+        index = rule.period_index
+        if index is None or not (index.covers(start) and index.covers(end)):
+            index = rule.compile(start, end)
+        self.index = index
+        self._pool = None
+
+    def __repr__(self):
+        return '<ParallelCalculator: %s>' % (self.index,)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Shut down the worker processes."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def difference(self, starts, ends):
+        """Calculate the business time between many pairs of datetimes.
+
+        Args:
+            starts: an iterable of datetime objects.
+            ends: an iterable of datetime objects.
+        Output:
+            list of BusinessTimeDelta objects.
+        """
+        starts = [localize_unlocalized_dt(x) for x in starts]
+        ends = [localize_unlocalized_dt(x) for x in ends]
+        results = self._map(_difference_chunk, list(zip(
+            [datetime_to_microseconds(x) for x in starts],
+            [datetime_to_microseconds(x) for x in ends])))
+
+        return [
+            self.rule.difference(starts[i], ends[i]) if result is None
+            else BusinessTimeDelta(self.rule, seconds=result // SECOND)
+            for i, result in enumerate(results)]
+
+    def add(self, starts, deltas):
+        """Add business time to many datetimes.
+
+        Args:
+            starts: an iterable of datetime objects.
+            deltas: an iterable of timedelta or BusinessTimeDelta objects.
+        Output:
+            list of aware datetime objects.
+        """
+        return self._shift(_add_chunk, starts, deltas, reverse=False)
+
+    def subtract(self, starts, deltas):
+        """Same as add, but backwards in time"""
+        return self._shift(_subtract_chunk, starts, deltas, reverse=True)
+
+    def _shift(self, func, starts, deltas, reverse):
+        starts = [localize_unlocalized_dt(x) for x in starts]
+        deltas = [x.timedelta if isinstance(x, BusinessTimeDelta) else x for x in deltas]
+        results = self._map(func, list(zip(
+            [datetime_to_microseconds(x) for x in starts],
+            [timedelta_to_microseconds(x) for x in deltas])))
+
+        shifted = []
+        for i, result in enumerate(results):
+            if result is not None:
+                shifted.append(microseconds_to_datetime(result, self.index.tz))
+            elif reverse:
+                shifted.append(starts[i] - BusinessTimeDelta(self.rule, timedelta=deltas[i]))
+            else:
+                shifted.append(starts[i] + BusinessTimeDelta(self.rule, timedelta=deltas[i]))
+        return shifted
+
+    def _map(self, func, items):
+        """Run func over chunks of items in the worker processes, and join the results."""
+        if not items:
+            return []
+
+        if self._pool is None:
+            # A multiprocessing pool takes an initializer on every Python version
+            import multiprocessing
+            self._pool = multiprocessing.Pool(
+                processes=self.max_workers,
+                initializer=_initialize_worker,
+                initargs=(self.index,))
+
+        chunks = [items[i:i + self.chunksize] for i in range(0, len(items), self.chunksize)]
+        results = []
+        for chunk in self._pool.imap(func, chunks):
+            results.extend(chunk)
+        return results
+
+
+def _initialize_worker(index):
+    global _worker_index
+    _worker_index = index
+
+
+def _difference_chunk(chunk):
+    return [_worker_index.difference_microseconds(start, end) for start, end in chunk]
+
+
+def _add_chunk(chunk):
+    return [_worker_index.add_microseconds(moment, amount) for moment, amount in chunk]
+
+
+def _subtract_chunk(chunk):
+    return [_worker_index.subtract_microseconds(moment, amount) for moment, amount in chunk]
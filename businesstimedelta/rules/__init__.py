@@ -1,4 +1,7 @@
 from .rule import *
 from .rules import *
 from .workdayrules import *
+from .holidayproviders import *
 from .holidayrules import *
+from .dateoverriderules import *
+from .intervalrules import *
@@ -0,0 +1,205 @@
+import bisect
+import datetime
+from .rule import REGULAR_MARGIN, Rule
+from ..businesstimedelta import localize_unlocalized_dt
+from ..cache import LRUCache
+from ..intervals import merge_intervals, microseconds_to_date
+from ..timezones import localize, wall_clock
+
+# How far next and previous look for an override, like HolidayRule does
+HORIZON = datetime.timedelta(days=365 * 5)
+
+
+class DateOverrideRule(Rule):
+    """Special business hours on specific dates, such as half days, longer
+    opening hours or closures. Within Rules, the hours of an overridden date
+    replace whatever the other rules say about that date.
+
+    The dates are kept in a sorted index, so a lookup takes a bisect however
+    many overrides there are.
+    """
+    __slots__ = ('overrides', 'days', 'period_cache', '_dates')
+
+    # Rules takes the days of this rule out of the other rules, and adds its periods back in
+    override = True
+
+    def __init__(self, overrides, *args, **kwargs):
+        """
+        Args:
+            overrides: a dict of date to a list of (start_time, end_time) tuples
+                with the business hours of that date. An empty list closes the date.
+                Intervals that end before they start run past midnight.
+            tz: a pytz timezone
+            cache_size: number of dates to remember the localized hours of (0 = no cache)
+        """
+        cache_size = kwargs.pop('cache_size', 1024)
+        super(DateOverrideRule, self).__init__(*args, **kwargs)
+        self.overrides = dict(overrides)
+        self.period_cache = LRUCache(cache_size)
+        self._dates = sorted(self.overrides)
+        self.days = OverrideDays(self)
+
+    def __repr__(self):
+        return '<DateOverrideRule: %s dates>' % len(self._dates)
+
+    def next(self, dt, reverse=False):
+        dt = localize_unlocalized_dt(dt)
+        date = microseconds_to_date(wall_clock(self.tz, dt))
+
+        # Hours that run past midnight start on the date before
+        if reverse:
+            for i in range(bisect.bisect_right(self._dates, date + datetime.timedelta(days=1)) - 1, -1, -1):
+                for start, end in reversed(self.periods(self._dates[i])[1]):
+                    if start < dt:
+                        return (start, min(end, dt))
+        else:
+            for i in range(bisect.bisect_left(self._dates, date - datetime.timedelta(days=1)), len(self._dates)):
+                for start, end in self.periods(self._dates[i])[1]:
+                    if end > dt:
+                        return (max(start, dt), end)
+
+        # There are no more overrides. Like HolidayRule, return an empty block of time.
+        horizon = dt - HORIZON if reverse else dt + HORIZON
+        return (horizon, horizon)
+
+    def previous(self, *args, **kwargs):
+        """Reverse of next function"""
+        kwargs['reverse'] = True
+        return self.next(*args, **kwargs)
+
+    def iter_periods(self, start, end=None, reverse=False):
+        """Lazily yield the overridden hours between two datetimes, clipped to them.
+        Stops after the last override."""
+        start = localize_unlocalized_dt(start)
+        end = localize_unlocalized_dt(end) if end is not None else None
+        dt = start
+
+        while True:
+            period_start, period_end = self.next(dt, reverse=reverse)
+            if period_start == period_end:
+                return
+
+            if reverse:
+                if end is not None:
+                    if period_end <= end:
+                        return
+                    period_start = max(period_start, end)
+                dt = period_start
+            else:
+                if end is not None:
+                    if period_start >= end:
+                        return
+                    period_end = min(period_end, end)
+                dt = period_end
+
+            yield (period_start, period_end)
+
+    def periods(self, date):
+        """The localized span of an overridden date and its business hours.
+        Localizing is relatively slow, so the result is kept in a LRU cache.
+        Output:
+            tuple of ((start, end) of the date, sorted and merged list of (start, end) of its hours).
+        """
+        result = self.period_cache.get(date)
+        if result is None:
+            next_date = date + datetime.timedelta(days=1)
+            day_start = localize(self.tz, datetime.datetime.combine(date, datetime.time(0)))
+            day_end = localize(self.tz, datetime.datetime.combine(next_date, datetime.time(0)))
+
+            hours = []
+            for start_time, end_time in self.overrides[date]:
+                start = localize(self.tz, datetime.datetime.combine(date, start_time))
+                end = localize(self.tz, datetime.datetime.combine(
+                    next_date if end_time < start_time else date, end_time))
+
+                hours.append((start, end))
+
+            # Overlapping hours are joined, and hours within wall-clock time that is skipped are dropped
+            hours = merge_intervals(hours)
+
+            # The date lasts at least until its last hours end
+            if hours:
+                day_end = max(day_end, max(x[1] for x in hours))
+
+            result = ((day_start, day_end), hours)
+            self.period_cache.set(date, result)
+
+        return result
+
+    def _definition(self):
+        return tuple(sorted(
+            (date.isoformat(), tuple(sorted((x.isoformat(), y.isoformat()) for x, y in hours)))
+            for date, hours in self.overrides.items()))
+
+    def weekly_template(self):
+        # Outside of the overridden dates this rule doesn't cover any time
+        return (self.tz, [])
+
+    def regular_until(self, dt, reverse=False):
+        return self.days.regular_until(dt, reverse=reverse)
+
+    def _is_regular_around(self, dt):
+        return self.days._is_regular_around(dt)
+
+    def cache_info(self):
+        """Hits, misses and size of the cache of overridden dates."""
+        return self.period_cache.info()
+
+
+class OverrideDays(Rule):
+    """The whole of the dates of a DateOverrideRule, as time off. Rules takes
+    these out of its other rules, before adding the overridden hours back in."""
+    __slots__ = ('rule',)
+
+    def __init__(self, rule):
+        """
+        Args:
+            rule: the DateOverrideRule.
+        """
+        super(OverrideDays, self).__init__(tz=rule.tz, time_off=True)
+        self.rule = rule
+
+    def __repr__(self):
+        return '<OverrideDays: %s dates>' % len(self.rule._dates)
+
+    def next(self, dt, reverse=False):
+        dt = localize_unlocalized_dt(dt)
+        date = microseconds_to_date(wall_clock(self.tz, dt))
+        dates = self.rule._dates
+
+        if reverse:
+            for i in range(bisect.bisect_right(dates, date + datetime.timedelta(days=1)) - 1, -1, -1):
+                start, end = self.rule.periods(dates[i])[0]
+                if start < dt:
+                    return (start, min(end, dt))
+        else:
+            for i in range(bisect.bisect_left(dates, date - datetime.timedelta(days=1)), len(dates)):
+                start, end = self.rule.periods(dates[i])[0]
+                if end > dt:
+                    return (max(start, dt), end)
+
+        horizon = dt - HORIZON if reverse else dt + HORIZON
+        return (horizon, horizon)
+
+    def previous(self, *args, **kwargs):
+        """Reverse of next function"""
+        kwargs['reverse'] = True
+        return self.next(*args, **kwargs)
+
+    def _definition(self):
+        fingerprint = self.rule.fingerprint()
+        return None if fingerprint is None else (fingerprint,)
+
+    def weekly_template(self):
+        return (self.tz, [])
+
+    def regular_until(self, dt, reverse=False):
+        start, end = self.next(dt, reverse=reverse)
+        if start == end:
+            return None
+        return end if reverse else start
+
+    def _is_regular_around(self, dt):
+        date = microseconds_to_date(wall_clock(self.tz, dt))
+        i = bisect.bisect_left(self.rule._dates, date - REGULAR_MARGIN)
+        return i == len(self.rule._dates) or self.rule._dates[i] > date + REGULAR_MARGIN
@@ -0,0 +1,173 @@
+import bisect
+import datetime
+
+
+class HolidayProvider(object):
+    """A source of holidays for HolidayRule, one year at a time.
+
+    HolidayRule asks for a year only when a calculation reaches it, and keeps a
+    limited number of years. Subclass this to look holidays up elsewhere, for
+    example in a database.
+    """
+    def holidays(self, year):
+        """The holidays of a year.
+        Output:
+            sorted list of date objects.
+        """
+        raise NotImplementedError
+
+    def definition(self):
+        """The settings that define the holidays, as a tuple of strings, numbers and
+        tuples of them, or None. Equal rules are found by it, see Rule.fingerprint."""
+        return None
+
+
+class DateListProvider(HolidayProvider):
+    """A fixed list of dates."""
+    def __init__(self, dates):
+        """
+        Args:
+            dates: an iterable of date objects.
+        """
+        self.dates = sorted(set(dates))
+
+    def __repr__(self):
+        return '<DateListProvider: %s dates>' % len(self.dates)
+
+    def holidays(self, year):
+        return self.dates[
+            bisect.bisect_left(self.dates, datetime.date(year, 1, 1)):
+            bisect.bisect_left(self.dates, datetime.date(year + 1, 1, 1))]
+
+    def definition(self):
+        return tuple(x.isoformat() for x in self.dates)
+
+
+class ContainerProvider(HolidayProvider):
+    """Any object that supports `date in holidays`, checked one date at a time."""
+    def __init__(self, container):
+        """
+        Args:
+            container: an object such as a dict or set of dates.
+        """
+        self.container = container
+
+    def __repr__(self):
+        return '<ContainerProvider: %s>' % (self.container,)
+
+    def holidays(self, year):
+        date = datetime.date(year, 1, 1)
+        dates = []
+        while date.year == year:
+            if date in self.container:
+                dates.append(date)
+            date += datetime.timedelta(days=1)
+        return dates
+
+    def definition(self):
+        # Only the keys of a plain dict are all of its holidays. Others, such as
+        # calendars of the Holidays module, may hold more than they show.
+        if type(self.container) is dict:
+            return tuple(sorted(x.isoformat() for x in self.container))
+        return None
+
+
+class HolidaysModuleProvider(HolidayProvider):
+    """A calendar of the Holidays module.
+
+    Such a calendar keeps every year it has been asked about. Instead, each year
+    is expanded by a new calendar of the same class and options, which is dropped
+    afterwards, so only the years that HolidayRule keeps take up memory. This only
+    works for calendars that a new one would match exactly, see calendar_options.
+    """
+    def __init__(self, calendar):
+        """
+        Args:
+            calendar: an object from the Holidays module, such as holidays.US(subdiv='CA').
+        """
+        self.options = calendar_options(calendar)
+        if self.options is None:
+            raise ValueError(
+                '%s can not be expanded by a new calendar, use a ContainerProvider' % (calendar,))
+        self.calendar = calendar
+
+    def __repr__(self):
+        return '<HolidaysModuleProvider: %s>' % (self.calendar,)
+
+    def holidays(self, year):
+        return sorted(date for date in type(self.calendar)(years=year, **self.options) if date.year == year)
+
+    def definition(self):
+        # A new calendar of the class with these options has the same holidays,
+        # as long as the version of the Holidays module is the same
+        import holidays as holidaymodule
+        cls = type(self.calendar)
+        options = tuple(
+            (name, tuple(sorted(value)) if isinstance(value, (set, frozenset)) else value)
+            for name, value in sorted(self.options.items()))
+        return ('%s.%s' % (cls.__module__, cls.__name__), holidaymodule.__version__, options)
+
+
+# Arguments that every calendar of the Holidays module takes
+HOLIDAY_BASE_OPTIONS = frozenset([
+    'self', 'years', 'expand', 'observed', 'subdiv', 'prov', 'state', 'language', 'categories'])
+
+
+def calendar_options(calendar):
+    """The options with which a new calendar of the same class has the same holidays
+    as a calendar of the Holidays module. There are none for a sum of calendars,
+    classes from other modules, calendars that don't expand, options that the
+    calendar doesn't keep, or holidays that were added or removed by hand.
+    Output:
+        dict, or None."""
+    cls = type(calendar)
+    if not cls.__module__.startswith(('holidays.countries.', 'holidays.financial.')):
+        return None
+    if not getattr(calendar, 'expand', False):
+        return None
+
+    options = {'observed': calendar.observed}
+    # Before version 0.13 of the Holidays module subdivisions were states or provinces
+    names = ['subdiv'] if hasattr(calendar, 'subdiv') else ['prov', 'state']
+    for name in names + ['categories']:
+        if getattr(calendar, name, None) is not None:
+            options[name] = getattr(calendar, name)
+
+    # Options of the class itself, such as include_sundays
+    import inspect
+    try:
+        if hasattr(inspect, 'signature'):
+            names = [
+                x.name for x in inspect.signature(cls.__init__).parameters.values()
+                if x.kind in (x.POSITIONAL_OR_KEYWORD, x.KEYWORD_ONLY)]
+        else:
+            names = inspect.getargspec(cls.__init__).args
+    except (TypeError, ValueError):
+        return None
+    for name in names:
+        if name not in HOLIDAY_BASE_OPTIONS:
+            if not hasattr(calendar, name):
+                return None
+            options[name] = getattr(calendar, name)
+
+    # The years the calendar has expanded hold any holidays added or removed by hand
+    if calendar.years and set(calendar) != set(cls(years=calendar.years, **options)):
+        return None
+    return options
+
+
+def holiday_provider(holidays):
+    """The provider for the holidays given to a HolidayRule.
+    Args:
+        holidays: a HolidayProvider, a list of dates, an object from the Holidays
+            module, or any other object that supports `date in holidays`.
+    """
+    if isinstance(holidays, HolidayProvider):
+        return holidays
+    if isinstance(holidays, (list, tuple, set, frozenset)):
+        return DateListProvider(holidays)
+    try:
+        return HolidaysModuleProvider(holidays)
+    except ValueError:
+        # Anything that a new calendar might not match is checked date by date
+        return ContainerProvider(holidays)
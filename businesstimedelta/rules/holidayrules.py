@@ -1,18 +1,39 @@
+import bisect
 import datetime
-from .rule import Rule
+from .holidayproviders import DateListProvider, holiday_provider
+from .rule import REGULAR_MARGIN, Rule
+from .. import instrumentation
 from ..businesstimedelta import localize_unlocalized_dt
+from ..cache import LRUCache
+from ..intervals import microseconds_to_date
+from ..timezones import localize, wall_clock
 
 
 class HolidayRule(Rule):
+    __slots__ = ('holidays', 'provider', 'years_cache', '_dates')
+
     def __init__(self, holidays, *args, **kwargs):
         """This rule represents a set of holidays.
         Args:
-            holidays: a list with dates, or an object from the Holidays python module.
+            holidays: a list with dates, an object from the Holidays python module,
+                or a HolidayProvider.
+            years_cache_size: number of years of holidays to remember, when they are
+                not given as a list (default 64).
         """
         kwargs['time_off'] = kwargs.get('time_off', True)
+        years_cache_size = kwargs.pop('years_cache_size', 64)
         self.holidays = holidays
         super(HolidayRule, self).__init__(*args, **kwargs)
 
+        # Holidays from a list are indexed at once. Other holidays are expanded one
+        # year at a time when needed, and only the most recently used years are kept.
+        self.provider = holiday_provider(holidays)
+        self.years_cache = LRUCache(years_cache_size)
+        if isinstance(self.provider, DateListProvider):
+            self._dates = self.provider.dates
+        else:
+            self._dates = None
+
     def __repr__(self):
         return '<HolidayRule: %s>' % (self.holidays)
 
@@ -23,21 +44,46 @@ class HolidayRule(Rule):
             max_days: Allowing both a list of dates as well as an object defined by
                 the Holidays module requires a loop to test the holidays object against
                 individual dates. To avoid getting stuck in an infinite loop here we need
-                to give an upper limit of days to look into the future."""
+                to give an upper limit of days to look into the future.
+        Output:
+            the date of the holiday, or None if there is no holiday within max_days."""
+        limit = date + datetime.timedelta(days=-max_days if reverse else max_days)
+        step = -1 if reverse else 1
 
-        count = 0
-        while True:
-            if date in self.holidays:
-                return date
+        # Look through the holidays year by year, so that no year is skipped
+        for year in range(date.year, limit.year + step, step):
+            if instrumentation.enabled:
+                instrumentation.record('HolidayRule.next_holiday.years', 1, self)
+            dates = self._dates if self._dates is not None else self.holidays_of_year(year)
 
             if reverse:
-                date -= datetime.timedelta(days=1)
+                i = bisect.bisect_right(dates, date) - 1
+                holiday = dates[i] if i >= 0 else None
             else:
-                date += datetime.timedelta(days=1)
+                i = bisect.bisect_left(dates, date)
+                holiday = dates[i] if i < len(dates) else None
 
-            count += 1
-            if count > max_days:
-                return None
+            if holiday is not None and holiday.year == year:
+                if (holiday < limit) if reverse else (holiday > limit):
+                    return None
+                return holiday
+
+        return None
+
+    def holidays_of_year(self, year):
+        """Get the holidays of a year from the provider, or from the years it
+        was asked about recently.
+        Output:
+            sorted list of date objects."""
+        dates = self.years_cache.get(year)
+        if dates is None:
+            if instrumentation.enabled:
+                instrumentation.record(
+                    'HolidayRule.index_year.days', (datetime.date(year + 1, 1, 1) - datetime.date(year, 1, 1)).days,
+                    self)
+            dates = self.provider.holidays(year)
+            self.years_cache.set(year, dates)
+        return dates
 
     def next(self, dt, reverse=False):
         """Get the start and end of the next holiday after a datetime
@@ -45,12 +91,22 @@ class HolidayRule(Rule):
             dt: datetime
         """
         dt = localize_unlocalized_dt(dt)
-        localized_dt = dt.astimezone(self.tz)
-        next_holiday = self.next_holiday(localized_dt.date(), reverse=reverse)
-        start = self.tz.localize(
-            datetime.datetime.combine(
-                next_holiday, datetime.time(0, 0, 0)))
-        end = start + datetime.timedelta(days=1)
+        if instrumentation.enabled:
+            instrumentation.record('HolidayRule.next', 1, self)
+        if reverse:
+            # A holiday that starts exactly at dt lies ahead of it
+            date = microseconds_to_date(wall_clock(self.tz, dt - datetime.timedelta(microseconds=1)))
+        else:
+            date = microseconds_to_date(wall_clock(self.tz, dt))
+
+        next_holiday = self.next_holiday(date, reverse=reverse)
+        if next_holiday is None:
+            # There is no holiday as far as the search goes. Return an empty block
+            # of time at that point, which takes nothing away from other rules.
+            horizon = dt + datetime.timedelta(days=-365 * 5 if reverse else 365 * 5)
+            return (horizon, horizon)
+
+        start, end = self.period(next_holiday)
 
         # If we are in the range now, set the start or end date to now.
         if start < dt and end > dt:
@@ -61,6 +117,68 @@ class HolidayRule(Rule):
 
         return (start, end)
 
+    def period(self, holiday):
+        """Get the localized start and end of a holiday. A holiday lasts from midnight
+        to midnight, which is not always 24 hours when the UTC offset changes."""
+        start = localize(self.tz, datetime.datetime.combine(holiday, datetime.time(0, 0, 0)))
+        end = localize(self.tz, datetime.datetime.combine(
+            holiday + datetime.timedelta(days=1), datetime.time(0, 0, 0)))
+        return (start, end)
+
+    def iter_periods(self, start, end=None, reverse=False):
+        """Lazily yield the holidays between two datetimes, clipped to them.
+        Stops when there is no holiday within max_days of the last one."""
+        start = localize_unlocalized_dt(start)
+        end = localize_unlocalized_dt(end) if end is not None else None
+
+        if reverse:
+            holiday = microseconds_to_date(wall_clock(self.tz, start - datetime.timedelta(microseconds=1)))
+        else:
+            holiday = microseconds_to_date(wall_clock(self.tz, start))
+
+        while True:
+            holiday = self.next_holiday(holiday, reverse=reverse)
+            if holiday is None:
+                return
+
+            period_start, period_end = self.period(holiday)
+            if reverse:
+                if end is not None and period_end <= end:
+                    return
+                period_start = max(period_start, end) if end is not None else period_start
+                period_end = min(period_end, start)
+                holiday -= datetime.timedelta(days=1)
+            else:
+                if end is not None and period_start >= end:
+                    return
+                period_start = max(period_start, start)
+                period_end = min(period_end, end) if end is not None else period_end
+                holiday += datetime.timedelta(days=1)
+
+            if period_start < period_end:
+                yield (period_start, period_end)
+
+    def _definition(self):
+        return self.provider.definition()
+
+    def weekly_template(self):
+        # Outside of the holidays themselves this rule doesn't cover any time
+        return (self.tz, [])
+
+    def regular_until(self, dt, reverse=False, max_days=365 * 5):
+        date = microseconds_to_date(wall_clock(self.tz, localize_unlocalized_dt(dt)))
+        next_holiday = self.next_holiday(date, reverse=reverse, max_days=max_days)
+        if next_holiday is None:
+            return dt + datetime.timedelta(days=-max_days if reverse else max_days)
+
+        start, end = self.period(next_holiday)
+        return end if reverse else start
+
+    def _is_regular_around(self, dt):
+        # Look for holidays in the index directly, without localizing their periods
+        date = microseconds_to_date(wall_clock(self.tz, dt))
+        return self.next_holiday(date - REGULAR_MARGIN, max_days=2 * REGULAR_MARGIN.days) is None
+
     def previous(self, *args, **kwargs):
         """Reverse of next function
         """
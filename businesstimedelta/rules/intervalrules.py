@@ -0,0 +1,129 @@
+import bisect
+import datetime
+from .rule import REGULAR_MARGIN, Rule
+from ..businesstimedelta import localize_unlocalized_dt
+from ..intervals import (
+    datetime_to_microseconds, merge_intervals, microseconds_to_datetime, timedelta_to_microseconds)
+
+# How far next and previous look for an interval, like HolidayRule does
+HORIZON = datetime.timedelta(days=365 * 5)
+
+
+class IntervalRule(Rule):
+    """Arbitrary ranges of time, such as maintenance windows, outages or
+    someone's time off. Overlapping ranges are merged, and the result is kept
+    in sorted arrays, so a lookup takes a bisect however many ranges there are.
+
+    Unlike other rules, this rule is time off unless time_off=False is given.
+    """
+    __slots__ = ('starts', 'ends')
+
+    def __init__(self, intervals, *args, **kwargs):
+        """
+        Args:
+            intervals: an iterable of (start, end) tuples of datetime objects.
+                Naive datetimes are taken to be UTC.
+            tz: time zone of the datetime objects this rule returns.
+            time_off: whether the ranges are time off (the default) or business time.
+        """
+        kwargs['time_off'] = kwargs.get('time_off', True)
+        super(IntervalRule, self).__init__(*args, **kwargs)
+        merged = merge_intervals([
+            (datetime_to_microseconds(localize_unlocalized_dt(start)),
+             datetime_to_microseconds(localize_unlocalized_dt(end)))
+            for start, end in intervals])
+        self.starts = [x[0] for x in merged]
+        self.ends = [x[1] for x in merged]
+
+    def __repr__(self):
+        return '<IntervalRule: %s intervals>' % len(self.starts)
+
+    def next(self, dt, reverse=False):
+        dt = localize_unlocalized_dt(dt)
+        moment = datetime_to_microseconds(dt)
+
+        if reverse:
+            # The last interval that starts before dt
+            i = bisect.bisect_left(self.starts, moment) - 1
+            if i >= 0:
+                if self.ends[i] >= moment:
+                    return (microseconds_to_datetime(self.starts[i], self.tz), dt)
+                return (
+                    microseconds_to_datetime(self.starts[i], self.tz),
+                    microseconds_to_datetime(self.ends[i], self.tz))
+        else:
+            # The first interval that ends after dt
+            i = bisect.bisect_right(self.ends, moment)
+            if i < len(self.ends):
+                if self.starts[i] <= moment:
+                    return (dt, microseconds_to_datetime(self.ends[i], self.tz))
+                return (
+                    microseconds_to_datetime(self.starts[i], self.tz),
+                    microseconds_to_datetime(self.ends[i], self.tz))
+
+        # There are no more intervals. Like HolidayRule, return an empty block of time.
+        horizon = dt - HORIZON if reverse else dt + HORIZON
+        return (horizon, horizon)
+
+    def previous(self, *args, **kwargs):
+        """Reverse of next function"""
+        kwargs['reverse'] = True
+        return self.next(*args, **kwargs)
+
+    def iter_periods(self, start, end=None, reverse=False):
+        """Lazily yield the intervals between two datetimes, clipped to them.
+        Stops after the last interval."""
+        start = datetime_to_microseconds(localize_unlocalized_dt(start))
+        end = datetime_to_microseconds(localize_unlocalized_dt(end)) if end is not None else None
+
+        if reverse:
+            positions = range(bisect.bisect_left(self.starts, start) - 1, -1, -1)
+        else:
+            positions = range(bisect.bisect_right(self.ends, start), len(self.ends))
+
+        for i in positions:
+            period_start = self.starts[i]
+            period_end = self.ends[i]
+            if reverse:
+                if end is not None:
+                    if period_end <= end:
+                        return
+                    period_start = max(period_start, end)
+                period_end = min(period_end, start)
+            else:
+                if end is not None:
+                    if period_start >= end:
+                        return
+                    period_end = min(period_end, end)
+                period_start = max(period_start, start)
+
+            yield (microseconds_to_datetime(period_start, self.tz), microseconds_to_datetime(period_end, self.tz))
+
+    def _definition(self):
+        return tuple(zip(self.starts, self.ends))
+
+    def weekly_template(self):
+        # Outside of the intervals themselves this rule doesn't cover any time
+        return (self.tz, [])
+
+    def regular_until(self, dt, reverse=False):
+        dt = localize_unlocalized_dt(dt)
+        moment = datetime_to_microseconds(dt)
+
+        if reverse:
+            i = bisect.bisect_left(self.starts, moment) - 1
+            if i < 0:
+                return None
+            return microseconds_to_datetime(min(self.ends[i], moment), self.tz)
+
+        i = bisect.bisect_right(self.ends, moment)
+        if i == len(self.ends):
+            return None
+        return microseconds_to_datetime(max(self.starts[i], moment), self.tz)
+
+    def _is_regular_around(self, dt):
+        # Whether no interval lies within the margin on either side of dt
+        moment = datetime_to_microseconds(dt)
+        margin = timedelta_to_microseconds(REGULAR_MARGIN)
+        i = bisect.bisect_right(self.ends, moment - margin)
+        return i == len(self.ends) or self.starts[i] >= moment + margin
@@ -1,14 +1,90 @@
 import pytz
 import datetime
+import weakref
+from .. import deadlines, instrumentation
 from ..businesstimedelta import BusinessTimeDelta, localize_unlocalized_dt
+from ..cache import LRUCache
+from ..cursor import Cursor
+from ..bitmap import WeeklyBitmap
+from ..index import NAT, PeriodIndex, datetimes_to_microseconds, timedeltas_to_microseconds
+from ..intervals import (
+    SECOND, DAY, WEEK, datetime_to_microseconds, intervals_length,
+    microseconds_to_datetime, timedelta_to_microseconds)
+from ..timezones import localize, tz_name, wall_clock
+
+# How far a moment must be from a holiday or an irregular change of UTC offset
+# for the weekly bitmap to apply to it
+REGULAR_MARGIN = datetime.timedelta(days=2)
+
+# Compiled indexes by the fingerprint of their rule, so that equal rules share them
+_compiled = weakref.WeakValueDictionary()
 
 
 class Rule(object):
     """This object defines 'blocks' of time. It can define either working hours
     or an exclusion of working hours (such as holidays, lunch breaks, etc)"""
-    def __init__(self, tz=pytz.utc, time_off=False):
+    __slots__ = (
+        'tz', 'time_off', 'period_index', 'totals_cache', '_stride', '_bitmap', '_fingerprint', '__weakref__')
+
+    # Whether Rules lets the time of this rule replace that of the other rules, see DateOverrideRule
+    override = False
+
+    def __init__(self, tz=pytz.utc, time_off=False, totals_cache_size=256):
+        """
+        Args:
+            tz: a pytz timezone
+            time_off: whether the blocks of time of this rule are time off
+            totals_cache_size: number of monthly and yearly totals of business time
+                to remember for long differences (0 = no cache)
+        """
         self.tz = tz
         self.time_off = time_off
+        self.period_index = None
+        self.totals_cache = LRUCache(totals_cache_size)
+        self._stride = None
+        self._bitmap = None
+        self._fingerprint = None
+
+    def __eq__(self, other):
+        """Rules are equal when they are defined the same way, see fingerprint."""
+        if self is other:
+            return True
+        if not isinstance(other, Rule):
+            return NotImplemented
+        fingerprint = self.fingerprint()
+        return fingerprint is not None and fingerprint == other.fingerprint()
+
+    def __hash__(self):
+        fingerprint = self.fingerprint()
+        return object.__hash__(self) if fingerprint is None else hash(fingerprint)
+
+    def fingerprint(self):
+        """A hash of the definition of this rule: its class, time zone, time_off
+        and the settings of the class, such as times, weekdays and holidays.
+        It is the same in every process, so it can be used as a cache key.
+
+        The definition is taken when the fingerprint is first needed, rules are
+        not meant to be changed after that.
+
+        Output:
+            hex string, or None if the rule only equals itself.
+        """
+        if self._fingerprint is None:
+            definition = self._definition()
+            self._fingerprint = False
+            if definition is not None:
+                import hashlib
+                cls = type(self)
+                key = ('%s.%s' % (cls.__module__, cls.__name__), tz_name(self.tz), bool(self.time_off), definition)
+                self._fingerprint = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+
+        return self._fingerprint or None
+
+    def _definition(self):
+        """The settings that define this rule besides its class, time zone and time_off,
+        as a tuple of strings, numbers and tuples of them. None if the rule has no
+        definition like that, in which case it only equals itself."""
+        return None
 
     def next(self, dt):
         """Returns the start and end of the upcoming (or current) block of time
@@ -26,23 +102,352 @@ class Rule(object):
         """Same as next, but backwards in time"""
         raise NotImplementedError
 
+    def iter_periods(self, start, end=None, reverse=False):
+        """Lazily yield the blocks of time of this rule, one at a time.
+
+        Args:
+            start: datetime to start from.
+            end: datetime to stop at, or None to go on indefinitely.
+            reverse: go backwards in time, in which case end lies before start.
+        Output:
+            tuples of (start, end) in aware datetime objects, clipped to
+            start and end. Empty blocks of time are skipped.
+        """
+        dt = localize_unlocalized_dt(start)
+        end = localize_unlocalized_dt(end) if end is not None else None
+
+        while True:
+            if reverse:
+                period_start, period_end = self.previous(dt)
+                if end is not None:
+                    if period_end <= end:
+                        return
+                    period_start = max(period_start, end)
+                dt = period_start
+            else:
+                period_start, period_end = self.next(dt)
+                if end is not None:
+                    if period_start >= end:
+                        return
+                    period_end = min(period_end, end)
+                dt = period_end
+
+            if period_start < period_end:
+                yield (period_start, period_end)
+
+    def cursor(self):
+        """A Cursor over the periods of this rule, for datetimes that only move forward."""
+        return Cursor(self)
+
+    def is_business_time(self, dt):
+        """Whether a datetime falls within the blocks of time of this rule.
+
+        Away from holidays and irregular changes of UTC offset, the answer is
+        looked up in a bitmap of the weekly template of the rule. Otherwise the
+        period index is used if it covers dt, or else the next block of time.
+        """
+        dt = localize_unlocalized_dt(dt)
+        bitmap = self.weekly_bitmap()
+        if bitmap is not None and self._is_regular_around(dt):
+            return bitmap.covers(wall_clock(bitmap.tz, dt))
+
+        if self.period_index is not None:
+            result = self.period_index.contains_microseconds(datetime_to_microseconds(dt))
+            if result is not None:
+                return result
+
+        return self._covers(dt)
+
+    def is_business_time_many(self, values):
+        """Check many datetimes at once. The rule is compiled over the range of
+        the input if needed. Requires numpy.
+
+        Args:
+            values: a numpy datetime64 array or a list of datetime objects.
+        Output:
+            numpy boolean array.
+        """
+        import numpy
+        moments = datetimes_to_microseconds(values)
+        if not len(moments):
+            return numpy.zeros(0, dtype=bool)
+
+        index = self._covering_index(int(moments.min()), int(moments.max()))
+        return index.contains_many(moments)
+
+    def weekly_bitmap(self):
+        """The WeeklyBitmap of the weekly template of this rule, or None if it has none."""
+        if self._bitmap is None:
+            template = self.weekly_template()
+            self._bitmap = False
+            if template:
+                self._bitmap = WeeklyBitmap(template[0] or pytz.utc, template[1])
+
+        return self._bitmap or None
+
+    def _is_regular_around(self, dt):
+        """Whether this rule follows its weekly template for a while around dt."""
+        limit = self.regular_until(dt)
+        if limit is not None and limit - dt < REGULAR_MARGIN:
+            return False
+
+        limit = self.regular_until(dt, reverse=True)
+        return limit is None or dt - limit >= REGULAR_MARGIN
+
+    def _covers(self, dt):
+        """Whether dt falls within a block of time, found without the bitmap."""
+        start, end = self.next(dt)
+        return start <= dt < end
+
+    def compile(self, start, end):
+        """Index the periods of this rule between two datetimes. Within that horizon,
+        differences and BusinessTimeDelta arithmetic are looked up in the index
+        instead of walking through the periods one by one.
+
+        Returns the PeriodIndex.
+        """
+        # An equal rule may have compiled this already
+        fingerprint = self.fingerprint()
+        index = _compiled.get(fingerprint) if fingerprint is not None else None
+        if index is None or not (index.covers(start) and index.covers(end)):
+            index = PeriodIndex.from_rule(self, start, end)
+            if fingerprint is not None:
+                _compiled[fingerprint] = index
+
+        self.period_index = index
+        return self.period_index
+
+    def load_index(self, path):
+        """Use a PeriodIndex that was compiled earlier and saved to a file, instead
+        of compiling it again. The file is mapped into memory read-only.
+
+        Returns the PeriodIndex.
+        """
+        self.period_index = PeriodIndex.load(path)
+        return self.period_index
+
+    def difference_many(self, starts, ends):
+        """Calculate the business time between many pairs of datetimes at once.
+        The rule is compiled over the range of the input if needed, after which
+        all pairs are looked up in one vectorized pass. Requires numpy.
+
+        Args:
+            starts: a numpy datetime64 array or a list of datetime objects.
+            ends: a numpy datetime64 array or a list of datetime objects.
+        Output:
+            numpy timedelta64[ns] array.
+        """
+        starts = datetimes_to_microseconds(starts)
+        ends = datetimes_to_microseconds(ends)
+        if len(starts):
+            index = self._covering_index(min(starts.min(), ends.min()), max(starts.max(), ends.max()))
+            starts = index.difference_many(starts, ends)
+        return starts.view('timedelta64[us]').astype('timedelta64[ns]')
+
+    def deadlines(self, starts, deltas, reverse=False):
+        """Add business time to many datetimes, in one sweep through the periods
+        of this rule. Faster than adding one at a time when the datetimes lie
+        close together. Does not need numpy.
+
+        Args:
+            starts: an iterable of datetime objects.
+            deltas: an iterable of timedelta or BusinessTimeDelta objects.
+            reverse: subtract the business time instead.
+        Output:
+            list of aware datetime objects, in the order of the input.
+        """
+        return deadlines.deadlines(self, starts, deltas, reverse=reverse)
+
+    def add_many(self, starts, deltas):
+        """Add business time to many datetimes at once. Requires numpy.
+
+        Args:
+            starts: a numpy datetime64 array or a list of datetime objects.
+            deltas: a numpy timedelta64 array or a list of timedelta or
+                BusinessTimeDelta objects.
+        Output:
+            numpy datetime64[ns] array in UTC. Negative deltas result in NaT.
+        """
+        return self._shift_many(starts, deltas, reverse=False)
+
+    def subtract_many(self, starts, deltas):
+        """Same as add_many, but backwards in time"""
+        return self._shift_many(starts, deltas, reverse=True)
+
+    def _shift_many(self, starts, deltas, reverse):
+        moments = datetimes_to_microseconds(starts)
+        amounts = timedeltas_to_microseconds(deltas)
+        if not len(moments):
+            return moments.view('datetime64[us]').astype('datetime64[ns]')
+
+        # Business time usually is a fraction of calendar time. Start with a guess of the
+        # calendar time needed and widen the index until all results can be looked up.
+        span = max(int(amounts.max()), 0) * 5 + WEEK
+        while True:
+            if reverse:
+                index = self._covering_index(int(moments.min()) - span, int(moments.max()))
+                result = index.subtract_many(moments, amounts)
+            else:
+                index = self._covering_index(int(moments.min()), int(moments.max()) + span)
+                result = index.add_many(moments, amounts)
+
+            if not ((result == NAT) & (amounts >= 0)).any() or span > 100 * 366 * DAY:
+                return result.view('datetime64[us]').astype('datetime64[ns]')
+            span *= 4
+
+    def _covering_index(self, start, end):
+        """The period index of this rule, compiled to cover at least start to end (in microseconds)."""
+        index = self.period_index
+        if index is None or start < index.horizon_start or end > index.horizon_end:
+            if index is not None:
+                start = min(start, index.horizon_start)
+                end = max(end, index.horizon_end)
+            self.compile(microseconds_to_datetime(int(start)), microseconds_to_datetime(int(end)))
+        return self.period_index
+
+    def weekly_template(self):
+        """Describe the time this rule covers in a regular week.
+
+        Output:
+            tuple of (tz, intervals) where intervals is a merged list of (start, end)
+            microsecond offsets from Monday midnight in wall-clock time of tz,
+            or None if this rule does not repeat itself every week.
+        """
+        return None
+
+    def regular_until(self, dt, reverse=False):
+        """Returns the first moment after dt (or before dt if reverse) at which this
+        rule stops following its weekly template, or None if it never does."""
+        return dt
+
+    def skip_weeks(self, dt, amount, reverse=False):
+        """Jump over whole weeks of business time at once.
+
+        Args:
+            dt: an aware datetime within (or at the edge of) a business period.
+            amount: the business time that is left to cover, in microseconds.
+            reverse: jump backwards in time.
+        Output:
+            tuple of (dt, amount) after skipping as many whole weeks as possible while
+            keeping some of the amount left, or None if no week can be skipped.
+        """
+        if self._stride is None:
+            template = self.weekly_template()
+            self._stride = False
+            if template and template[0] is not None and intervals_length(template[1]):
+                self._stride = (template[0], intervals_length(template[1]))
+
+        if not self._stride:
+            return None
+
+        tz, week = self._stride
+        if amount <= week:
+            return None
+
+        weeks = (amount - 1) // week
+        limit = self.regular_until(dt, reverse=reverse)
+        if limit is not None:
+            # Keep a day of margin for the wall-clock shift across UTC offset changes
+            weeks = min(weeks, (timedelta_to_microseconds(abs(limit - dt)) - DAY) // WEEK)
+
+        if weeks < 1:
+            return None
+
+        shift = datetime.timedelta(weeks=-weeks if reverse else weeks)
+        wall_clock = dt.astimezone(tz).replace(tzinfo=None) + shift
+        return (localize(tz, wall_clock), amount - week * weeks)
+
     def difference(self, dt1, dt2):
         """Calculate the business time between two datetime objects."""
+        return BusinessTimeDelta(self, seconds=self.difference_microseconds(dt1, dt2) // SECOND)
+
+    def difference_microseconds(self, dt1, dt2):
+        """Same as difference, as an exact number of microseconds."""
         dt1 = localize_unlocalized_dt(dt1)
         dt2 = localize_unlocalized_dt(dt2)
+        started = instrumentation.start()
+
+        if self.period_index is not None:
+            result = self.period_index.difference_microseconds(
+                datetime_to_microseconds(dt1), datetime_to_microseconds(dt2))
+            if result is not None:
+                if started is not None:
+                    instrumentation.finish('difference', started, self, index_hits=1)
+                return result
+
         start_dt, end_dt = sorted([dt1, dt2])
-        td_sum = datetime.timedelta()
-        dt = start_dt
+        first, last = self._whole_months(start_dt, end_dt)
+        if first is None:
+            result, periods = self._walk(start_dt, end_dt)
+            totals = 0
+        else:
+            # Walk the partial months at either end, and add up the whole months
+            # and years in between from their totals
+            result, periods = self._walk(start_dt, self._month_start(first))
+            tail, tail_periods = self._walk(self._month_start(last), end_dt)
+            result += tail
+            periods += tail_periods
 
-        while True:
-            period_start, period_end = self.next(dt)
-            period_delta = period_end - period_start
+            totals = 0
+            year, month = first
+            while (year, month) < last:
+                if month == 1 and (year + 1, 1) <= last:
+                    result += self._year_total(year)
+                    year += 1
+                else:
+                    result += self._month_total(year, month)
+                    year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+                totals += 1
+
+        if started is not None:
+            instrumentation.finish('difference', started, self, periods=periods, totals=totals)
+        return result
+
+    def _walk(self, start_dt, end_dt):
+        """Business time between two datetimes, and the number of periods in between."""
+        result = 0
+        periods = 0
+        for period_start, period_end in self.iter_periods(start_dt, end_dt):
+            result += timedelta_to_microseconds(period_end - period_start)
+            periods += 1
+        return result, periods
+
+    def _whole_months(self, start_dt, end_dt):
+        """The first and last (year, month) whose start in the wall-clock time of this rule
+        lies between two datetimes, or (None, None) if there is no whole month in between."""
+        if end_dt - start_dt < datetime.timedelta(days=27):
+            return (None, None)
+
+        wall = start_dt.astimezone(self.tz)
+        first = (wall.year, wall.month)
+        if self._month_start(first) < start_dt:
+            first = (wall.year + 1, 1) if wall.month == 12 else (wall.year, wall.month + 1)
+
+        wall = end_dt.astimezone(self.tz)
+        last = (wall.year, wall.month)
+        if self._month_start(last) > end_dt:
+            last = (wall.year - 1, 12) if wall.month == 1 else (wall.year, wall.month - 1)
+
+        if first >= last:
+            return (None, None)
+        return (first, last)
+
+    def _month_start(self, month):
+        return localize(self.tz, datetime.datetime(month[0], month[1], 1))
 
-            # If we are past the end_dt, we are done!
-            if period_end > end_dt:
-                last_day_add = max(end_dt - period_start, datetime.timedelta())
-                result = td_sum + last_day_add
-                return BusinessTimeDelta(self, hours=result.days * 24, seconds=result.seconds)
+    def _month_total(self, year, month):
+        """Business time in a month, in microseconds. Kept in the totals cache."""
+        total = self.totals_cache.get((year, month))
+        if total is None:
+            next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+            total = self._walk(self._month_start((year, month)), self._month_start(next_month))[0]
+            self.totals_cache.set((year, month), total)
+        return total
 
-            dt = period_end
-            td_sum += period_delta
+    def _year_total(self, year):
+        """Business time in a year, in microseconds. Kept in the totals cache."""
+        total = self.totals_cache.get(year)
+        if total is None:
+            total = self._walk(self._month_start((year, 1)), self._month_start((year + 1, 1)))[0]
+            self.totals_cache.set(year, total)
+        return total
@@ -1,31 +1,107 @@
+import weakref
 from .rule import Rule
+from .. import instrumentation
 from ..businesstimedelta import localize_unlocalized_dt
+from ..intervals import merge_intervals, subtract_intervals
+from ..timeline import Timeline, split_rules
+
+# Compiled timelines by the fingerprint of their rules, so that equal rules share them
+_timelines = weakref.WeakValueDictionary()
 
 
 class Rules(Rule):
     """Combine a list of rules together to form one rule.
+
+    Business time is the time of the available rules, minus the time of the
+    rules that are time off. On the dates of a DateOverrideRule, its hours
+    are the business time instead.
+
     Args:
         rules: a list of rule objects.
+        compiled: merge the periods of all rules into one timeline, that is
+            materialized as far as the queries go. This avoids querying every
+            rule again on each call of next and previous.
     """
+    __slots__ = ('available_rules', 'unavailable_rules', 'override_rules', 'timeline')
+
     def __init__(self, rules, *args, **kwargs):
-        self.available_rules = [x for x in rules if not x.time_off]
-        self.unavailable_rules = [x for x in rules if x.time_off]
+        compiled = kwargs.pop('compiled', False)
+        self.available_rules, self.unavailable_rules, self.override_rules = split_rules(rules)
         super(Rules, self).__init__(*args, **kwargs)
+        self.timeline = None
+        if compiled:
+            # Equal rules share their timeline
+            fingerprint = self.fingerprint()
+            self.timeline = _timelines.get(fingerprint) if fingerprint is not None else None
+            if self.timeline is None:
+                self.timeline = Timeline(rules, tz=self.tz)
+                if fingerprint is not None:
+                    _timelines[fingerprint] = self.timeline
 
     def next(self, dt):
+        if self.timeline is not None:
+            return self.timeline.next(dt)
+
+        dt = localize_unlocalized_dt(dt)
+        if not self.override_rules:
+            return self._next(dt)
+        return self._override(dt, self._next(dt) if self.available_rules else None, reverse=False)
+
+    def previous(self, dt):
+        if self.timeline is not None:
+            return self.timeline.previous(dt)
+
         dt = localize_unlocalized_dt(dt)
+        if not self.override_rules:
+            return self._previous(dt)
+        return self._override(dt, self._previous(dt) if self.available_rules else None, reverse=True)
+
+    def _override(self, dt, period, reverse):
+        """Combine a period of the other rules with the hours of the override rules.
+        The other rules have the overridden dates taken out already, so the first
+        of them in time is the period to return."""
+        if period is not None and period[0] == period[1]:
+            # The other rules have no more time
+            period = None
+
+        for rule in self.override_rules:
+            start, end = rule.next(dt, reverse=reverse)
+            if start == end:
+                continue
+
+            if period is None or (end > period[1] if reverse else start < period[0]):
+                period = (start, end)
+
+        if period is None:
+            # Nothing at all as far as the overrides go
+            return self.override_rules[0].next(dt, reverse=reverse)
+        return period
+
+    def _next(self, dt):
         min_start = None
         min_end = None
+        restarts = -1  # The first pass isn't a restart
 
         while True:
+            restarts += 1
+
             # Find the first upcoming available time
+            empty = None
             for rule in self.available_rules:
                 start, end = rule.next(dt)
+                if start == end:
+                    # This rule has no more time, as far as it looks
+                    empty = empty or (start, end)
+                    continue
 
                 if not min_start or start < min_start:
                     min_start = start
                     min_end = end
 
+            if not min_start:
+                # Neither has any other rule. Return the empty block of time.
+                return empty
+
             # Check whether that time is not unavailable due to an
             # unavailability rule. If so, restart this process beginning
             # at the end of this unavailability period.
@@ -43,26 +119,37 @@ class Rules(Rule):
                 for rule in self.unavailable_rules:
                     start, end = rule.next(min_start)
 
-                    if end < min_end:
+                    if start < min_end:
                         min_end = start
 
                 if min_end != min_start:
+                    if instrumentation.enabled:
+                        instrumentation.record('Rules.next.restarts', restarts, self)
                     return (min_start, min_end)
 
-    def previous(self, dt):
-        dt = localize_unlocalized_dt(dt)
+    def _previous(self, dt):
         min_start = None
         min_end = None
+        restarts = -1  # The first pass isn't a restart
 
         while True:
+            restarts += 1
+
             # Find the first available time in the past
+            empty = None
             for rule in self.available_rules:
                 start, end = rule.previous(dt)
+                if start == end:
+                    empty = empty or (start, end)
+                    continue
 
                 if not min_end or end > min_end:
                     min_start = start
                     min_end = end
 
+            if not min_end:
+                return empty
+
             # Check whether that time is not unavailable due to an
             # unavailability rule. If so, restart this process beginning
             # at the start of this unavailability period.
@@ -83,4 +170,55 @@ class Rules(Rule):
                         min_start = end
 
                 if min_end != min_start:
+                    if instrumentation.enabled:
+                        instrumentation.record('Rules.previous.restarts', restarts, self)
                     return (min_start, min_end)
+
+    def iter_periods(self, start, end=None, reverse=False):
+        if self.timeline is not None:
+            return self.timeline.iter_periods(start, end, reverse=reverse)
+        return super(Rules, self).iter_periods(start, end, reverse=reverse)
+
+    def _is_regular_around(self, dt):
+        return all(rule._is_regular_around(dt) for rule in self.available_rules + self.unavailable_rules)
+
+    def _covers(self, dt):
+        # Each rule answers on its own, most of them from their bitmaps
+        if any(rule.is_business_time(dt) for rule in self.override_rules):
+            return True
+        return (
+            any(rule.is_business_time(dt) for rule in self.available_rules) and
+            not any(rule.is_business_time(dt) for rule in self.unavailable_rules))
+
+    def _definition(self):
+        # The order of the rules makes no difference
+        rules = self.available_rules + self.unavailable_rules + self.override_rules
+        fingerprints = [rule.fingerprint() for rule in rules]
+        if None in fingerprints:
+            return None
+        return tuple(sorted(set(fingerprints)))
+
+    def weekly_template(self):
+        tz = None
+        intervals = {False: [], True: []}
+        for rule in self.available_rules + self.unavailable_rules:
+            template = rule.weekly_template()
+            if template is None:
+                return None
+
+            # All the weekly time has to be expressed in the same wall-clock time
+            rule_tz, rule_intervals = template
+            if rule_intervals:
+                if tz is not None and rule_tz != tz:
+                    return None
+                tz = rule_tz
+                intervals[rule.time_off].extend(rule_intervals)
+
+        return (tz, subtract_intervals(merge_intervals(intervals[False]), merge_intervals(intervals[True])))
+
+    def regular_until(self, dt, reverse=False):
+        limits = [rule.regular_until(dt, reverse=reverse) for rule in self.available_rules + self.unavailable_rules]
+        limits = [x for x in limits if x is not None]
+        if not limits:
+            return None
+        return max(limits) if reverse else min(limits)
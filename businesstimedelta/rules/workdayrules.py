@@ -1,6 +1,12 @@
+import bisect
 import datetime
-from .rule import Rule
+from .rule import REGULAR_MARGIN, Rule
+from .. import instrumentation
 from ..businesstimedelta import localize_unlocalized_dt
+from ..cache import LRUCache
+from ..intervals import (
+    DAY, WEEK, merge_intervals, microseconds_to_date, time_to_microseconds, timedelta_to_microseconds)
+from ..timezones import localize, utc_transitions, wall_clock
 
 
 class WorkDayRule(Rule):
@@ -9,6 +15,7 @@ class WorkDayRule(Rule):
 
     Overnight shifts can be represented by setting end time less than start time.
     """
+    __slots__ = ('start_time', 'end_time', 'working_days', 'period_cache', '_irregular_transitions')
 
     def __init__(self, start_time=datetime.time(9), end_time=datetime.time(18),
                  working_days=[0, 1, 2, 3, 4], *args, **kwargs):
@@ -18,40 +25,31 @@ class WorkDayRule(Rule):
             end_time: a Time object that defines the end of a work day
             working_days: days of the working week (0 = Monday)
             tz: a pytz timezone
+            cache_size: number of work day periods to remember (0 = no cache)
         """
         kwargs['time_off'] = kwargs.get('time_off', False)
+        cache_size = kwargs.pop('cache_size', 1024)
         super(WorkDayRule, self).__init__(*args, **kwargs)
         self.start_time = start_time
         self.end_time = end_time
         self.working_days = working_days
+        self.period_cache = LRUCache(cache_size)
+        self._irregular_transitions = None
 
     def next(self, dt, reverse=False):
         dt = localize_unlocalized_dt(dt)
-        localized_dt = dt.astimezone(self.tz)
+        if instrumentation.enabled:
+            instrumentation.record('WorkDayRule.next', 1, self)
 
-        # Figure out what the first upcoming working date is
-        working_date = localized_dt.date()
+        # Figure out what the first upcoming working date is, and its start and end times
+        working_date = self._next_working_date(wall_clock(self.tz, dt))
+        start, end = self.period(working_date)
 
-        if working_date.weekday() in self.working_days and localized_dt.time() < max(self.start_time, self.end_time):
-            # Today is the working day to use in further calculations if there is
-            # any working time left in this day. Ie, if the current time is
-            # - less than the end time (for normal cases)
-            # - less than the start time (for overnight work days)
-            pass
-        else:
-            while True:
-                working_date += datetime.timedelta(days=1)
-                if working_date.weekday() in self.working_days:
-                    break
-
-        # We know the target working date now. Just figure out the start and end times.
-        start = self.tz.localize(datetime.datetime.combine(working_date, self.start_time))
-
-        # In the case this working day has some overnight time, add one day to the end date
-        if self.end_time < self.start_time:
-            working_date += datetime.timedelta(days=1)
-
-        end = self.tz.localize(datetime.datetime.combine(working_date, self.end_time))
+        # A work day within wall-clock time that is skipped when the clocks
+        # go forward has no time in it, move on to the next one.
+        while start >= end and self.start_time != self.end_time:
+            working_date = self._step_working_date(working_date)
+            start, end = self.period(working_date)
 
         # If we are in the range now, set the start or end date to now.
         if start < dt and end > dt:
@@ -61,22 +59,15 @@ class WorkDayRule(Rule):
 
     def previous(self, dt, *args, **kwargs):
         dt = localize_unlocalized_dt(dt)
-        localized_dt = dt.astimezone(self.tz)
+        if instrumentation.enabled:
+            instrumentation.record('WorkDayRule.previous', 1, self)
 
-        # Figure out what is the first upcoming working date
-        working_date = localized_dt.date()
-        if working_date.weekday() in self.working_days \
-           and localized_dt.time() > self.start_time:
-            pass  # Today is the working date
-        else:
-            while True:
-                working_date -= datetime.timedelta(days=1)
-                if working_date.weekday() in self.working_days:
-                    break
-
-        # We know the target working date now. Just figure out the start and end times.
-        start = self.tz.localize(datetime.datetime.combine(working_date, self.start_time))
-        end = self.tz.localize(datetime.datetime.combine(working_date, self.end_time))
+        # Figure out what the last working date is, and its start and end times
+        working_date = self._previous_working_date(wall_clock(self.tz, dt))
+        start, end = self.period(working_date)
+        while start >= end and self.start_time != self.end_time:
+            working_date = self._step_working_date(working_date, reverse=True)
+            start, end = self.period(working_date)
 
         # If we are in the range now, set the start or end date to now.
         if start < dt and end > dt:
@@ -84,9 +75,173 @@ class WorkDayRule(Rule):
 
         return (start, end)
 
+    def iter_periods(self, start, end=None, reverse=False):
+        # Step from one working date to the next, instead of searching
+        # for the working date again at every period.
+        start = localize_unlocalized_dt(start)
+        end = localize_unlocalized_dt(end) if end is not None else None
+        wall = wall_clock(self.tz, start)
+
+        if reverse:
+            working_date = self._previous_working_date(wall)
+        else:
+            working_date = self._next_working_date(wall)
+
+        while True:
+            period_start, period_end = self.period(working_date)
+            if reverse:
+                if end is not None and period_end <= end:
+                    return
+                period_start = max(period_start, end) if end is not None else period_start
+                period_end = min(period_end, start)
+            else:
+                if end is not None and period_start >= end:
+                    return
+                period_start = max(period_start, start)
+                period_end = min(period_end, end) if end is not None else period_end
+
+            if period_start < period_end:
+                yield (period_start, period_end)
+
+            working_date = self._step_working_date(working_date, reverse=reverse)
+
+    def _next_working_date(self, wall):
+        """The date of the first work day that hasn't ended at a wall-clock time in microseconds."""
+        working_date = microseconds_to_date(wall)
+        previous_date = working_date - datetime.timedelta(days=1)
+        end_time = time_to_microseconds(self.end_time)
+
+        if self.end_time < self.start_time and previous_date.weekday() in self.working_days \
+           and wall % DAY < end_time:
+            # We are in the part of yesterday's overnight shift that runs past midnight
+            return previous_date
+        elif working_date.weekday() in self.working_days and \
+                (self.end_time < self.start_time or wall % DAY < end_time):
+            # Today is the working day to use in further calculations if there is
+            # any working time left in this day. Ie, if
+            # - the current time is less than the end time (for normal cases)
+            # - always for overnight work days, which end tomorrow
+            return working_date
+
+        return self._step_working_date(working_date)
+
+    def _previous_working_date(self, wall):
+        """The date of the last work day that started before a wall-clock time in microseconds."""
+        working_date = microseconds_to_date(wall)
+        if working_date.weekday() in self.working_days \
+           and wall % DAY > time_to_microseconds(self.start_time):
+            return working_date  # Today is the working date
+
+        return self._step_working_date(working_date, reverse=True)
+
+    def _step_working_date(self, working_date, reverse=False):
+        """The first working date after (or before if reverse) a date."""
+        step = datetime.timedelta(days=-1 if reverse else 1)
+        while True:
+            working_date += step
+            if working_date.weekday() in self.working_days:
+                return working_date
+
+    def period(self, working_date):
+        """Get the localized start and end of the work day on a working date.
+        Localizing is relatively slow, so the result is kept in a LRU cache."""
+        period = self.period_cache.get(working_date)
+        if period is None:
+            start = localize(self.tz, datetime.datetime.combine(working_date, self.start_time))
+
+            # In the case this working day has some overnight time, add one day to the end date
+            end_date = working_date
+            if self.end_time < self.start_time:
+                end_date += datetime.timedelta(days=1)
+
+            end = localize(self.tz, datetime.datetime.combine(end_date, self.end_time))
+            period = (start, end)
+            self.period_cache.set(working_date, period)
+
+        return period
+
+    def cache_info(self):
+        """Hits, misses and size of the cache of work day periods."""
+        return self.period_cache.info()
+
+    def _definition(self):
+        return (self.start_time.isoformat(), self.end_time.isoformat(), tuple(sorted(set(self.working_days))))
+
+    def weekly_template(self):
+        start = time_to_microseconds(self.start_time)
+        length = time_to_microseconds(self.end_time) - start
+        if self.end_time < self.start_time:
+            length += DAY
+
+        intervals = []
+        for day in set(self.working_days):
+            day_start = day * DAY + start
+            intervals.append((day_start, min(day_start + length, WEEK)))
+
+            # A Sunday overnight shift continues at the start of the week
+            if day_start + length > WEEK:
+                intervals.append((0, day_start + length - WEEK))
+
+        return (self.tz, merge_intervals(intervals))
+
+    def regular_until(self, dt, reverse=False):
+        if self._irregular_transitions is None:
+            self._irregular_transitions = self._find_irregular_transitions()
+
+        transitions = self._irregular_transitions
+        if transitions is False:
+            return dt
+
+        # A transition right at dt counts, it may be part of the period that ends (or starts) at dt
+        if reverse:
+            i = bisect.bisect_right(transitions, dt)
+            return transitions[i - 1] if i else None
+
+        i = bisect.bisect_left(transitions, dt)
+        return transitions[i] if i < len(transitions) else None
+
+    def _is_regular_around(self, dt):
+        if self._irregular_transitions is None:
+            self._irregular_transitions = self._find_irregular_transitions()
+
+        transitions = self._irregular_transitions
+        if transitions is False:
+            return False
+
+        i = bisect.bisect_left(transitions, dt - REGULAR_MARGIN)
+        return i == len(transitions) or transitions[i] > dt + REGULAR_MARGIN
+
+    def _find_irregular_transitions(self):
+        """List the UTC offset changes of self.tz that happen during working hours.
+        Those make the working week that contains them longer or shorter than usual.
+        Returns False if the offset changes of self.tz are unknown.
+        """
+        transitions = utc_transitions(self.tz)
+        if transitions is None:
+            return False
+
+        intervals = self.weekly_template()[1]
+        irregular = []
+        for utc_dt, before, after in transitions:
+            # The range of wall-clock times that is skipped or repeated
+            naive = utc_dt.replace(tzinfo=None)
+            affected_start = naive + min(before, after)
+            affected_start = affected_start.weekday() * DAY + time_to_microseconds(affected_start.time())
+            affected_end = affected_start + abs(timedelta_to_microseconds(after - before))
+
+            for start, end in intervals:
+                if (affected_start <= end and start <= affected_end) or \
+                   (affected_start <= end + WEEK and start + WEEK <= affected_end):
+                    irregular.append(utc_dt)
+                    break
+
+        return irregular
+
 
 class LunchTimeRule(WorkDayRule):
     """Convenience function for lunch breaks."""
+    __slots__ = ()
+
     def __init__(self, start_time=datetime.time(12), end_time=datetime.time(13),
                  working_days=[0, 1, 2, 3, 4], *args, **kwargs):
         super(LunchTimeRule, self).__init__(
@@ -0,0 +1,122 @@
+"""Business time calculations on pandas Series and DatetimeIndex objects.
+
+Importing this module registers the `business` accessor on Series:
+
+    import businesstimedelta.series
+    df['duration'] = df['opened'].business.difference(rule, df['closed'])
+
+The same calculations are available as functions that take a rule first.
+Naive values are taken to be UTC, like everywhere else in this package.
+Missing values (NaT) stay missing. Requires pandas.
+"""
+import datetime
+import numpy
+import pandas
+from .businesstimedelta import BusinessTimeDelta
+
+
+def difference(rule, starts, ends):
+    """Calculate the business time between two columns of datetimes.
+
+    Args:
+        rule: the rule to calculate with.
+        starts: a Series, DatetimeIndex or list of datetimes.
+        ends: the same, of the same length.
+    Output:
+        Series of timedelta64[ns].
+    """
+    start_values = _to_utc(starts)
+    end_values = _to_utc(ends)
+    valid = ~(numpy.isnat(start_values) | numpy.isnat(end_values))
+
+    result = numpy.full(len(start_values), numpy.timedelta64('NaT'), dtype='timedelta64[ns]')
+    result[valid] = rule.difference_many(start_values[valid], end_values[valid])
+    return pandas.Series(result, index=_index(starts))
+
+
+def add(rule, starts, deltas):
+    """Add business time to a column of datetimes.
+
+    Args:
+        rule: the rule to calculate with.
+        starts: a Series, DatetimeIndex or list of datetimes.
+        deltas: a Series, TimedeltaIndex or list of timedelta or BusinessTimeDelta
+            objects, or a single one of them to add to every datetime.
+    Output:
+        Series of datetimes in the time zone of the rule.
+    """
+    return _shift(rule, starts, deltas, reverse=False)
+
+
+def subtract(rule, starts, deltas):
+    """Same as add, but backwards in time"""
+    return _shift(rule, starts, deltas, reverse=True)
+
+
+def is_business_time(rule, values):
+    """Check a column of datetimes for business time.
+
+    Args:
+        rule: the rule to check with.
+        values: a Series, DatetimeIndex or list of datetimes.
+    Output:
+        Series of booleans, False for missing values.
+    """
+    moments = _to_utc(values)
+    valid = ~numpy.isnat(moments)
+
+    result = numpy.zeros(len(moments), dtype=bool)
+    result[valid] = rule.is_business_time_many(moments[valid])
+    return pandas.Series(result, index=_index(values))
+
+
+def _shift(rule, starts, deltas, reverse):
+    moments = _to_utc(starts)
+    if isinstance(deltas, (datetime.timedelta, BusinessTimeDelta, numpy.timedelta64)):
+        deltas = [deltas] * len(moments)
+    if not hasattr(deltas, 'dtype'):
+        deltas = [x.timedelta if isinstance(x, BusinessTimeDelta) else x for x in deltas]
+    amounts = pandas.to_timedelta(deltas).to_numpy(dtype='timedelta64[us]')
+    valid = ~(numpy.isnat(moments) | numpy.isnat(amounts))
+
+    result = numpy.full(len(moments), numpy.datetime64('NaT'), dtype='datetime64[ns]')
+    if reverse:
+        result[valid] = rule.subtract_many(moments[valid], amounts[valid])
+    else:
+        result[valid] = rule.add_many(moments[valid], amounts[valid])
+
+    result = pandas.Series(result, index=_index(starts))
+    return result.dt.tz_localize('UTC').dt.tz_convert(rule.tz)
+
+
+def _to_utc(values):
+    """Naive datetime64[us] numpy array in UTC."""
+    values = pandas.DatetimeIndex(pandas.to_datetime(values, utc=True))
+    return values.tz_convert(None).to_numpy(dtype='datetime64[us]')
+
+
+def _index(values):
+    """The index for the result of a calculation on values."""
+    if isinstance(values, pandas.Series):
+        return values.index
+    return None
+
+
+@pandas.api.extensions.register_series_accessor('business')
+class BusinessAccessor(object):
+    """Business time calculations on a Series of datetimes, as `series.business`."""
+    def __init__(self, series):
+        self._series = series
+
+    def difference(self, rule, ends):
+        """Business time from each datetime in the series to the one in ends."""
+        return difference(rule, self._series, ends)
+
+    def add(self, rule, deltas):
+        return add(rule, self._series, deltas)
+
+    def subtract(self, rule, deltas):
+        return subtract(rule, self._series, deltas)
+
+    def is_business_time(self, rule):
+        return is_business_time(rule, self._series)
@@ -0,0 +1,95 @@
+import datetime
+import unittest
+import pytz
+from ..businesstimedelta import BusinessTimeDelta
+from ..rules import Rules, WorkDayRule, LunchTimeRule
+
+try:
+    import asyncio
+    from ..aio import AsyncCalculator
+except (ImportError, SyntaxError):
+    AsyncCalculator = None
+
+
+@unittest.skipIf(AsyncCalculator is None, 'asyncio needs Python 3.5')
+class AsyncCalculatorTest(unittest.TestCase):
+    def setUp(self):
+        self.utc = pytz.timezone('UTC')
+        self.rules = Rules([
+            WorkDayRule(
+                start_time=datetime.time(9),
+                end_time=datetime.time(17),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.utc),
+            LunchTimeRule(
+                start_time=datetime.time(12),
+                end_time=datetime.time(13),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.utc)])
+        self.starts = [datetime.datetime(2016, 1, 18, 9, 0, 0) + datetime.timedelta(hours=7 * i) for i in range(50)]
+        self.ends = [x + datetime.timedelta(days=9) for x in self.starts]
+
+    def run_calculator(self, func, return_exceptions=False, **kwargs):
+        """Run the calls that func makes on a calculator concurrently, and return their results."""
+        loop = asyncio.new_event_loop()
+        calculator = AsyncCalculator(self.rules, **kwargs)
+        try:
+            calls = [loop.create_task(x) for x in func(calculator)]
+            return loop.run_until_complete(asyncio.gather(*calls, return_exceptions=return_exceptions))
+        finally:
+            calculator.close()
+            loop.close()
+
+    def test_difference(self):
+        def func(calculator):
+            return [calculator.difference(self.starts[i], self.ends[i]) for i in range(len(self.starts))]
+
+        self.assertEqual(
+            self.run_calculator(func),
+            [self.rules.difference(self.starts[i], self.ends[i]) for i in range(len(self.starts))])
+
+    def test_add_and_subtract(self):
+        delta = datetime.timedelta(hours=20)
+
+        def func(calculator):
+            return [
+                calculator.add(self.starts[0], delta),
+                calculator.subtract(self.ends[0], BusinessTimeDelta(self.rules, timedelta=delta))]
+
+        self.assertEqual(self.run_calculator(func), [
+            self.starts[0] + BusinessTimeDelta(self.rules, timedelta=delta),
+            self.ends[0] - BusinessTimeDelta(self.rules, timedelta=delta)])
+
+    def test_batches(self):
+        batches = []
+
+        def func(calculator):
+            flush = calculator._flush
+
+            def counting_flush():
+                batches.append(len(calculator._pending))
+                flush()
+            calculator._flush = counting_flush
+
+            return [calculator.difference(self.starts[i], self.ends[i]) for i in range(len(self.starts))]
+
+        self.run_calculator(func, max_batch=20)
+        self.assertEqual(batches, [20, 20, 10])
+
+    def test_error(self):
+        def func(calculator):
+            return [
+                calculator.difference(self.starts[0], self.ends[0]),
+                calculator.difference(self.starts[0], 'not a datetime')]
+
+        result = self.run_calculator(func, return_exceptions=True)
+        self.assertEqual(result[0], self.rules.difference(self.starts[0], self.ends[0]))
+        self.assertIsInstance(result[1], Exception)
+
+    def test_compile(self):
+        self.run_calculator(
+            lambda calculator: [calculator.difference(self.starts[0], self.ends[0])],
+            start=datetime.datetime(2016, 1, 1),
+            end=datetime.datetime(2017, 1, 1))
+
+        self.assertTrue(self.rules.period_index.covers(datetime.datetime(2016, 6, 1)))
@@ -0,0 +1,38 @@
+import datetime
+import unittest
+import pytz
+from ..bitmap import WeeklyBitmap
+from ..intervals import MINUTE, SECOND, DAY
+
+HOUR = 60 * MINUTE
+
+# Wall-clock time of a Monday at midnight, in microseconds since the epoch
+MONDAY = (datetime.datetime(2016, 1, 25) - datetime.datetime(1970, 1, 1)).days * DAY
+
+
+class WeeklyBitmapTest(unittest.TestCase):
+    def test_minutes(self):
+        bitmap = WeeklyBitmap(pytz.utc, [(9 * HOUR, 17 * HOUR), (DAY + 9 * HOUR, DAY + 17 * HOUR)])
+
+        self.assertEqual(bitmap.resolution, MINUTE)
+        self.assertFalse(bitmap.covers(MONDAY + 9 * HOUR - 1))
+        self.assertTrue(bitmap.covers(MONDAY + 9 * HOUR))
+        self.assertTrue(bitmap.covers(MONDAY + DAY + 17 * HOUR - 1))
+        self.assertFalse(bitmap.covers(MONDAY + DAY + 17 * HOUR))
+        self.assertFalse(bitmap.covers(MONDAY + 2 * DAY + 10 * HOUR))
+        self.assertTrue(bitmap.covers(MONDAY + 7 * DAY + 10 * HOUR))
+
+    def test_seconds(self):
+        bitmap = WeeklyBitmap(pytz.utc, [(9 * HOUR + SECOND, 17 * HOUR)])
+
+        self.assertEqual(bitmap.resolution, SECOND)
+        self.assertFalse(bitmap.covers(MONDAY + 9 * HOUR))
+        self.assertTrue(bitmap.covers(MONDAY + 9 * HOUR + SECOND))
+
+    def test_microseconds(self):
+        bitmap = WeeklyBitmap(pytz.utc, [(9 * HOUR + 1, 17 * HOUR)])
+
+        self.assertEqual(bitmap.bits, None)
+        self.assertFalse(bitmap.covers(MONDAY + 9 * HOUR))
+        self.assertTrue(bitmap.covers(MONDAY + 9 * HOUR + 1))
+        self.assertFalse(bitmap.covers(MONDAY + 17 * HOUR))
@@ -96,6 +96,21 @@ class BusinessTimeDeltaTest(unittest.TestCase):
         self.assertEqual(td.hours, 0)
         self.assertEqual(td.seconds, 1)
 
+    def test_negative_hours_and_seconds(self):
+        td = BusinessTimeDelta(self.workdayrule, hours=-1, seconds=1)
+        self.assertEqual(td.hours, -1)
+        self.assertEqual(td.seconds, 1)
+        self.assertEqual(td.timedelta, datetime.timedelta(hours=-1, seconds=1))
+
+    def test_microseconds(self):
+        td = BusinessTimeDelta(self.workdayrule, seconds=1, microseconds=500)
+        self.assertEqual(td.timedelta, datetime.timedelta(seconds=1, microseconds=500))
+
+    def test_slots(self):
+        td = BusinessTimeDelta(self.workdayrule, hours=1)
+        self.assertFalse(hasattr(td, '__dict__'))
+        self.assertFalse(hasattr(self.workdayrule, '__dict__'))
+
 
 class BusinessTimeDeltaArithmeticTest(unittest.TestCase):
     def setUp(self):
@@ -123,6 +138,74 @@ class BusinessTimeDeltaArithmeticTest(unittest.TestCase):
         )
 
 
+class BusinessTimeDeltaWeekStrideTest(unittest.TestCase):
+    def setUp(self):
+        self.utc = pytz.timezone('UTC')
+        self.pst = pytz.timezone('US/Pacific')
+        self.workdayrule = WorkDayRule(
+            start_time=datetime.time(9),
+            end_time=datetime.time(17),
+            working_days=[0, 1, 2, 3, 4],
+            tz=self.utc)
+        self.businesshrs = Rules([
+            self.workdayrule,
+            LunchTimeRule(tz=self.utc),
+            HolidayRule([
+                datetime.date(2015, 12, 25),
+                datetime.date(2016, 7, 4),
+                datetime.date(2016, 12, 26),
+                datetime.date(2017, 12, 25)])])
+
+    def test_add_many_weeks(self):
+        td = BusinessTimeDelta(self.workdayrule, hours=2000)
+        dt = self.utc.localize(datetime.datetime(2016, 1, 4, 9, 0, 0))
+
+        self.assertEqual(
+            dt + td,
+            self.utc.localize(datetime.datetime(2016, 12, 16, 17, 0, 0))
+        )
+
+    def test_add_many_weeks_with_holidays(self):
+        td = BusinessTimeDelta(self.businesshrs, hours=1750)
+        dt = self.utc.localize(datetime.datetime(2016, 1, 4, 9, 0, 0))
+
+        self.assertEqual(
+            dt + td,
+            self.utc.localize(datetime.datetime(2016, 12, 19, 17, 0, 0))
+        )
+
+    def test_subtract_many_weeks_with_holidays(self):
+        td = BusinessTimeDelta(self.businesshrs, hours=1750)
+        dt = self.utc.localize(datetime.datetime(2016, 12, 19, 17, 0, 0))
+
+        self.assertEqual(
+            dt - td,
+            self.utc.localize(datetime.datetime(2016, 1, 4, 9, 0, 0))
+        )
+
+    def test_add_many_weeks_across_dst(self):
+        # The night shift loses an hour on the night DST starts
+        businesshrs = Rules([
+            WorkDayRule(
+                start_time=datetime.time(9),
+                end_time=datetime.time(17),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.pst),
+            WorkDayRule(
+                start_time=datetime.time(22),
+                end_time=datetime.time(3),
+                working_days=[5, 6],
+                tz=self.pst)])
+        dt = self.pst.localize(datetime.datetime(2016, 1, 4, 9, 0, 0))
+
+        stepwise = dt
+        for i in range(60):
+            stepwise = stepwise + BusinessTimeDelta(businesshrs, hours=50)
+
+        self.assertEqual(dt + BusinessTimeDelta(businesshrs, hours=50 * 60), stepwise)
+        self.assertEqual(stepwise - BusinessTimeDelta(businesshrs, hours=50 * 60), dt)
+
+
 class ReadmeTest(unittest.TestCase):
     def test_readme(self):
         workday = WorkDayRule(
@@ -0,0 +1,69 @@
+import datetime
+import unittest
+import pytz
+from ..calendars import MultiCalendar
+from ..rules import Rules, WorkDayRule, LunchTimeRule, HolidayRule, DateOverrideRule
+
+
+class MultiCalendarTest(unittest.TestCase):
+    def setUp(self):
+        self.utc = pytz.timezone('UTC')
+        self.pst = pytz.timezone('US/Pacific')
+        self.start = datetime.datetime(2015, 12, 14, 0, 0, 0)
+        self.end = datetime.datetime(2016, 1, 11, 0, 0, 0)
+
+    def calendar(self, holidays, tz=None, extra=()):
+        tz = tz or self.utc
+        return Rules([
+            WorkDayRule(
+                start_time=datetime.time(9),
+                end_time=datetime.time(17),
+                working_days=[0, 1, 2, 3, 4],
+                tz=tz),
+            LunchTimeRule(
+                start_time=datetime.time(12),
+                end_time=datetime.time(13),
+                working_days=[0, 1, 2, 3, 4],
+                tz=tz),
+            HolidayRule(holidays, tz=tz)] + list(extra))
+
+    def test_difference(self):
+        calendars = [
+            self.calendar([datetime.date(2015, 12, 25), datetime.date(2016, 1, 1)]),
+            self.calendar([datetime.date(2015, 12, 25), datetime.date(2015, 12, 28)]),
+            self.calendar([datetime.date(2015, 12, 25), datetime.date(2016, 1, 1)], tz=self.pst),
+            self.calendar([datetime.date(2015, 12, 25)], extra=[DateOverrideRule({
+                datetime.date(2015, 12, 24): [(datetime.time(9), datetime.time(13))]}, tz=self.utc)]),
+        ]
+        multi = MultiCalendar(calendars)
+
+        self.assertEqual(
+            multi.difference(self.start, self.end),
+            [x.difference(self.start, self.end) for x in calendars])
+        self.assertEqual(
+            multi.difference_microseconds(self.end, self.start),
+            [x.difference_microseconds(self.start, self.end) for x in calendars])
+
+    def test_shared_rules(self):
+        calendars = [
+            self.calendar([datetime.date(2015, 12, 25)]),
+            self.calendar([datetime.date(2015, 12, 25)]),
+            self.calendar([datetime.date(2016, 1, 1)]),
+        ]
+        multi = MultiCalendar(calendars)
+
+        # One working day and lunch break, and two sets of holidays
+        self.assertEqual(len(multi.rules), 4)
+        self.assertEqual(str(multi), '<MultiCalendar: 3 calendars, 4 rules>')
+
+    def test_names(self):
+        multi = MultiCalendar({
+            'christmas': self.calendar([datetime.date(2015, 12, 25)]),
+            'new year': self.calendar([datetime.date(2016, 1, 1)]),
+            'workday': WorkDayRule(tz=self.utc),
+        })
+        results = multi.difference(self.start, self.end)
+
+        self.assertEqual(sorted(results), ['christmas', 'new year', 'workday'])
+        self.assertEqual(results['christmas'].hours, 19 * 7)
+        self.assertEqual(results['workday'].hours, 20 * 9)
@@ -0,0 +1,70 @@
+import datetime
+import json
+import unittest
+import pytz
+from ..clock import BusinessClock
+from ..rules import Rules, WorkDayRule, LunchTimeRule
+
+
+class BusinessClockTest(unittest.TestCase):
+    def setUp(self):
+        self.utc = pytz.timezone('UTC')
+        self.rules = Rules([
+            WorkDayRule(
+                start_time=datetime.time(9),
+                end_time=datetime.time(17),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.utc),
+            LunchTimeRule(
+                start_time=datetime.time(12),
+                end_time=datetime.time(13),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.utc)])
+        self.start = datetime.datetime(2016, 1, 25, 9, 0, 0)
+        self.clock = BusinessClock(self.rules, self.start)
+
+    def test_tick(self):
+        self.assertEqual(self.clock.tick(datetime.datetime(2016, 1, 25, 11, 0, 0)).hours, 2)
+        self.assertEqual(self.clock.tick(datetime.datetime(2016, 1, 26, 10, 30, 0)).hours, 8)
+        self.assertEqual(
+            self.clock.elapsed,
+            self.rules.difference(self.start, datetime.datetime(2016, 1, 26, 10, 30, 0)))
+
+    def test_tick_keeps_microseconds(self):
+        dt = self.utc.localize(self.start)
+        for i in range(10):
+            dt += datetime.timedelta(seconds=0.5)
+            self.clock.tick(dt)
+
+        self.assertEqual(self.clock.elapsed.seconds, 5)
+
+    def test_tick_backwards(self):
+        self.clock.tick(datetime.datetime(2016, 1, 25, 11, 0, 0))
+
+        self.assertRaises(ValueError, self.clock.tick, datetime.datetime(2016, 1, 25, 10, 0, 0))
+
+    def test_pause_and_resume(self):
+        self.clock.pause(datetime.datetime(2016, 1, 25, 10, 0, 0))
+        self.assertEqual(self.clock.tick(datetime.datetime(2016, 1, 25, 15, 0, 0)).hours, 1)
+
+        self.clock.resume(datetime.datetime(2016, 1, 25, 16, 0, 0))
+        self.assertEqual(self.clock.tick(datetime.datetime(2016, 1, 26, 10, 0, 0)).hours, 3)
+
+    def test_serialization(self):
+        self.clock.pause(datetime.datetime(2016, 1, 25, 10, 0, 0, 500))
+        data = json.loads(json.dumps(self.clock.to_dict()))
+        clock = BusinessClock.from_dict(self.rules, data)
+
+        self.assertTrue(clock.paused)
+        self.assertEqual(clock.last_tick, self.clock.last_tick)
+        self.assertEqual(clock.elapsed, self.clock.elapsed)
+        self.assertEqual(
+            clock.resume(datetime.datetime(2016, 1, 25, 11, 0, 0)),
+            self.clock.resume(datetime.datetime(2016, 1, 25, 11, 0, 0)))
+
+    def test_serialization_with_offset(self):
+        pst = pytz.timezone('US/Pacific')
+        data = {'last_tick': '2016-01-25T10:00:00-08:00', 'paused': False, 'elapsed': 0}
+        clock = BusinessClock.from_dict(self.rules, data)
+
+        self.assertEqual(clock.last_tick, pst.localize(datetime.datetime(2016, 1, 25, 10, 0, 0)))
@@ -0,0 +1,53 @@
+import datetime
+import unittest
+import pytz
+from ..rules import Rules, WorkDayRule, LunchTimeRule, HolidayRule
+
+
+class CursorTest(unittest.TestCase):
+    def setUp(self):
+        self.utc = pytz.timezone('UTC')
+        self.rules = Rules([
+            WorkDayRule(
+                start_time=datetime.time(9),
+                end_time=datetime.time(17),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.utc),
+            LunchTimeRule(
+                start_time=datetime.time(12),
+                end_time=datetime.time(13),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.utc),
+            HolidayRule([datetime.date(2016, 1, 26)])])
+        self.cursor = self.rules.cursor()
+
+    def test_next(self):
+        for dt in [
+                datetime.datetime(2016, 1, 25, 8, 0, 0),
+                datetime.datetime(2016, 1, 25, 10, 0, 0),
+                datetime.datetime(2016, 1, 25, 10, 0, 0),
+                datetime.datetime(2016, 1, 25, 12, 0, 0),
+                datetime.datetime(2016, 1, 25, 17, 0, 0),
+                datetime.datetime(2016, 1, 26, 10, 0, 0),
+                datetime.datetime(2016, 1, 30, 10, 0, 0)]:
+            self.assertEqual(self.cursor.next(dt), self.rules.next(dt))
+
+    def test_is_business_time(self):
+        self.assertTrue(self.cursor.is_business_time(datetime.datetime(2016, 1, 25, 9, 0, 0)))
+        self.assertFalse(self.cursor.is_business_time(datetime.datetime(2016, 1, 25, 12, 30, 0)))
+        self.assertFalse(self.cursor.is_business_time(datetime.datetime(2016, 1, 26, 10, 0, 0)))
+        self.assertTrue(self.cursor.is_business_time(datetime.datetime(2016, 1, 27, 16, 59, 59)))
+
+    def test_backwards(self):
+        self.cursor.next(datetime.datetime(2016, 1, 25, 10, 0, 0))
+
+        self.assertRaises(ValueError, self.cursor.next, datetime.datetime(2016, 1, 25, 9, 0, 0))
+
+    def test_past_last_holiday(self):
+        rule = HolidayRule([datetime.date(2016, 1, 26)])
+        cursor = rule.cursor()
+        dt = self.utc.localize(datetime.datetime(2016, 1, 26, 10, 0, 0))
+
+        self.assertEqual(cursor.next(dt), rule.next(dt))
+        dt = self.utc.localize(datetime.datetime(2016, 2, 1))
+        self.assertEqual(cursor.next(dt), rule.next(dt))
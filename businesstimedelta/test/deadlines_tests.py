@@ -0,0 +1,73 @@
+import datetime
+import unittest
+import pytz
+from ..businesstimedelta import BusinessTimeDelta
+from ..rules import Rules, WorkDayRule, LunchTimeRule, HolidayRule
+
+
+class DeadlinesTest(unittest.TestCase):
+    def setUp(self):
+        self.utc = pytz.timezone('UTC')
+        self.rules = Rules([
+            WorkDayRule(
+                start_time=datetime.time(9),
+                end_time=datetime.time(17),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.utc),
+            LunchTimeRule(
+                start_time=datetime.time(12),
+                end_time=datetime.time(13),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.utc),
+            HolidayRule([datetime.date(2016, 1, 27)], tz=self.utc)])
+        self.starts = [
+            datetime.datetime(2016, 1, 26, 16, 0, 0),
+            datetime.datetime(2016, 1, 25, 10, 0, 0),
+            datetime.datetime(2016, 1, 25, 12, 30, 0),
+            datetime.datetime(2016, 1, 30, 0, 0, 0),
+            datetime.datetime(2016, 1, 25, 10, 0, 0),
+        ]
+        self.deltas = [
+            datetime.timedelta(hours=2),
+            datetime.timedelta(hours=7),
+            BusinessTimeDelta(self.rules, hours=1),
+            datetime.timedelta(0),
+            datetime.timedelta(hours=80),
+        ]
+
+    def test_deadlines(self):
+        self.assertEqual(
+            self.rules.deadlines(self.starts, self.deltas),
+            [self.utc.localize(x) for x in [
+                datetime.datetime(2016, 1, 28, 10, 0, 0),
+                datetime.datetime(2016, 1, 26, 10, 0, 0),
+                datetime.datetime(2016, 1, 25, 14, 0, 0),
+                datetime.datetime(2016, 2, 1, 9, 0, 0),
+                datetime.datetime(2016, 2, 10, 14, 0, 0),
+            ]])
+
+    def test_reverse(self):
+        self.assertEqual(
+            self.rules.deadlines(self.starts, self.deltas, reverse=True),
+            [self.utc.localize(x) for x in [
+                datetime.datetime(2016, 1, 26, 14, 0, 0),
+                datetime.datetime(2016, 1, 22, 10, 0, 0),
+                datetime.datetime(2016, 1, 25, 11, 0, 0),
+                datetime.datetime(2016, 1, 29, 17, 0, 0),
+                datetime.datetime(2016, 1, 7, 15, 0, 0),
+            ]])
+
+    def test_same_as_adding(self):
+        for reverse in [False, True]:
+            results = self.rules.deadlines(self.starts, self.deltas, reverse=reverse)
+            for start, delta, result in zip(self.starts, self.deltas, results):
+                if not isinstance(delta, BusinessTimeDelta):
+                    delta = BusinessTimeDelta(self.rules, timedelta=delta)
+                self.assertEqual(result, start - delta if reverse else start + delta)
+
+    def test_empty(self):
+        self.assertEqual(self.rules.deadlines([], []), [])
+
+    def test_lengths_differ(self):
+        with self.assertRaises(ValueError):
+            self.rules.deadlines(self.starts, self.deltas[:2])
@@ -0,0 +1,312 @@
+import datetime
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+import pytz
+from ..rules import Rules, WorkDayRule, LunchTimeRule, HolidayRule
+from ..businesstimedelta import BusinessTimeDelta
+from ..index import PeriodIndex
+from ..timezones import fixed_offset
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class HalfMinuteOffset(datetime.tzinfo):
+    """A time zone without a name, 30 seconds ahead of UTC."""
+    def utcoffset(self, dt):
+        return datetime.timedelta(seconds=30)
+
+    def dst(self, dt):
+        return datetime.timedelta(0)
+
+
+class PeriodIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.utc = pytz.timezone('UTC')
+        self.holidays = [
+            datetime.date(2015, 12, 25),
+            datetime.date(2016, 12, 25),
+            datetime.date(2017, 12, 25)
+        ]
+        self.rules = self.build_rules()
+        self.compiled_rules = self.build_rules()
+        self.index = self.compiled_rules.compile(
+            datetime.datetime(2016, 1, 1),
+            datetime.datetime(2017, 1, 1))
+
+    def build_rules(self):
+        return Rules([
+            WorkDayRule(
+                start_time=datetime.time(9),
+                end_time=datetime.time(17),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.utc),
+            LunchTimeRule(
+                start_time=datetime.time(12),
+                end_time=datetime.time(13),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.utc),
+            HolidayRule(self.holidays)])
+
+    def test_difference(self):
+        start_dt = self.utc.localize(datetime.datetime(2016, 2, 3, 10, 30, 0))
+        end_dt = self.utc.localize(datetime.datetime(2016, 11, 30, 12, 30, 0))
+
+        self.assertEqual(
+            self.index.difference(start_dt, end_dt),
+            self.rules.difference(start_dt, end_dt).timedelta
+        )
+        self.assertEqual(
+            self.compiled_rules.difference(end_dt, start_dt),
+            self.rules.difference(start_dt, end_dt)
+        )
+
+    def test_difference_outside_horizon(self):
+        start_dt = self.utc.localize(datetime.datetime(2016, 2, 3, 10, 30, 0))
+        end_dt = self.utc.localize(datetime.datetime(2017, 3, 1, 12, 30, 0))
+
+        self.assertEqual(self.index.difference(start_dt, end_dt), None)
+        self.assertEqual(
+            self.compiled_rules.difference(start_dt, end_dt),
+            self.rules.difference(start_dt, end_dt)
+        )
+
+    def test_add(self):
+        dt = self.utc.localize(datetime.datetime(2016, 12, 20, 15, 0, 0))
+
+        for hours in [0, 2, 3, 7, 300]:
+            self.assertEqual(
+                dt + BusinessTimeDelta(self.compiled_rules, hours=hours),
+                dt + BusinessTimeDelta(self.rules, hours=hours)
+            )
+
+        self.assertEqual(
+            self.index.add(dt, datetime.timedelta(hours=7)),
+            self.utc.localize(datetime.datetime(2016, 12, 21, 15, 0, 0))
+        )
+
+    def test_add_outside_horizon(self):
+        dt = self.utc.localize(datetime.datetime(2016, 12, 20, 15, 0, 0))
+
+        self.assertEqual(self.index.add(dt, datetime.timedelta(hours=300)), None)
+
+    def test_subtract(self):
+        dt = self.utc.localize(datetime.datetime(2016, 12, 27, 10, 0, 0))
+
+        for hours in [0, 1, 2, 8, 300]:
+            self.assertEqual(
+                dt - BusinessTimeDelta(self.compiled_rules, hours=hours),
+                dt - BusinessTimeDelta(self.rules, hours=hours)
+            )
+
+        self.assertEqual(
+            self.index.subtract(dt, datetime.timedelta(hours=2)),
+            self.utc.localize(datetime.datetime(2016, 12, 26, 16, 0, 0))
+        )
+
+    def test_subtract_outside_horizon(self):
+        dt = self.utc.localize(datetime.datetime(2016, 1, 5, 10, 0, 0))
+
+        self.assertEqual(self.index.subtract(dt, datetime.timedelta(hours=20)), None)
+        self.assertEqual(
+            dt - BusinessTimeDelta(self.compiled_rules, hours=20),
+            dt - BusinessTimeDelta(self.rules, hours=20)
+        )
+
+    def test_covers(self):
+        self.assertTrue(self.index.covers(datetime.datetime(2016, 6, 1)))
+        self.assertFalse(self.index.covers(datetime.datetime(2015, 6, 1)))
+
+    def test_is_business_time(self):
+        for dt in [
+                datetime.datetime(2016, 6, 1, 9, 0, 0),
+                datetime.datetime(2016, 6, 1, 12, 30, 0),
+                datetime.datetime(2016, 12, 23, 16, 59, 59),
+                datetime.datetime(2016, 12, 26, 10, 0, 0)]:
+            self.assertEqual(self.compiled_rules.is_business_time(dt), self.rules.is_business_time(dt))
+
+    def test_next(self):
+        dt = datetime.datetime(2016, 1, 25, 12, 30, 0)
+
+        self.assertEqual(self.index.next(dt), self.rules.next(dt))
+        self.assertEqual(self.index.next(datetime.datetime(2015, 6, 1)), None)
+
+    def test_previous(self):
+        dt = datetime.datetime(2016, 1, 25, 12, 30, 0)
+
+        self.assertEqual(self.index.previous(dt), self.rules.previous(dt))
+        self.assertEqual(self.index.previous(datetime.datetime(2016, 1, 1, 8, 0, 0)), None)
+
+
+class IndexFileTest(unittest.TestCase):
+    def setUp(self):
+        self.pst = pytz.timezone('US/Pacific')
+        self.rules = Rules([
+            WorkDayRule(
+                start_time=datetime.time(9),
+                end_time=datetime.time(17),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.pst),
+            HolidayRule([datetime.date(2016, 12, 26)], tz=self.pst)],
+            tz=self.pst)
+        self.index = self.rules.compile(
+            datetime.datetime(2016, 1, 1),
+            datetime.datetime(2017, 1, 1))
+
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'calendar.idx')
+        self.index.save(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_load(self):
+        index = PeriodIndex.load(self.path)
+        start = datetime.datetime(2016, 3, 1, 10, 0, 0)
+        end = datetime.datetime(2016, 12, 30, 10, 0, 0)
+
+        self.assertEqual(index.tz, self.pst)
+        self.assertEqual(index.horizon_start, self.index.horizon_start)
+        self.assertEqual(index.horizon_end, self.index.horizon_end)
+        self.assertEqual(list(index.cumulative), self.index.cumulative)
+        self.assertEqual(index.difference(start, end), self.index.difference(start, end))
+        self.assertEqual(index.next(start), self.index.next(start))
+
+    def test_load_index(self):
+        rules = Rules([])
+        rules.load_index(self.path)
+        start = datetime.datetime(2016, 3, 1, 10, 0, 0)
+
+        self.assertEqual(
+            start + BusinessTimeDelta(rules, hours=100),
+            start + BusinessTimeDelta(self.rules, hours=100))
+
+    def test_pickle(self):
+        index = pickle.loads(pickle.dumps(PeriodIndex.load(self.path)))
+
+        self.assertEqual(index.path, self.path)
+        self.assertEqual(list(index.starts), self.index.starts)
+
+    def test_fixed_offset(self):
+        for tz in [pytz.FixedOffset(120), fixed_offset(datetime.timedelta(hours=-3))]:
+            rules = Rules([WorkDayRule(start_time=datetime.time(9), end_time=datetime.time(17), tz=tz)], tz=tz)
+            rules.compile(datetime.datetime(2016, 1, 1), datetime.datetime(2016, 2, 1)).save(self.path)
+            index = PeriodIndex.load(self.path)
+            start = datetime.datetime(2016, 1, 4, 12, 0, 0)
+
+            self.assertEqual(index.next(start), rules.next(start))
+            self.assertEqual(index.next(start)[0].utcoffset(), tz.utcoffset(None))
+
+    def test_unnamed_time_zone(self):
+        index = PeriodIndex([], [], [0], 0, 0, tz=HalfMinuteOffset())
+        self.assertRaises(ValueError, index.save, self.path)
+        self.assertEqual(os.listdir(self.directory), ['calendar.idx'])
+
+    def test_save_over_loaded(self):
+        # An index that was loaded keeps reading the file it was loaded from
+        index = PeriodIndex.load(self.path)
+        rules = Rules([WorkDayRule(tz=self.pst)], tz=self.pst)
+        rules.compile(datetime.datetime(2016, 1, 1), datetime.datetime(2016, 1, 8)).save(self.path)
+        start = datetime.datetime(2016, 3, 1, 10, 0, 0)
+
+        self.assertEqual(list(index.starts), self.index.starts)
+        self.assertEqual(index.next(start), self.index.next(start))
+        self.assertEqual(PeriodIndex.load(self.path).next(start), None)
+        self.assertEqual(os.listdir(self.directory), ['calendar.idx'])
+
+    def test_not_an_index_file(self):
+        with open(self.path, 'wb') as fh:
+            fh.write(b'\0' * 100)
+
+        self.assertRaises(ValueError, PeriodIndex.load, self.path)
+
+    def test_cut_short(self):
+        with open(self.path, 'rb') as fh:
+            data = fh.read()
+        with open(self.path, 'wb') as fh:
+            fh.write(data[:-8])
+
+        self.assertRaises(ValueError, PeriodIndex.load, self.path)
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class BatchTest(unittest.TestCase):
+    def setUp(self):
+        self.utc = pytz.timezone('UTC')
+        self.pst = pytz.timezone('US/Pacific')
+        self.rules = Rules([
+            WorkDayRule(
+                start_time=datetime.time(9),
+                end_time=datetime.time(17),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.pst),
+            LunchTimeRule(
+                start_time=datetime.time(12),
+                end_time=datetime.time(13),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.pst)])
+        self.starts = [
+            datetime.datetime(2016, 1, 18, 9, 0, 0),
+            datetime.datetime(2016, 3, 11, 23, 0, 0),
+            self.pst.localize(datetime.datetime(2016, 6, 1, 12, 30, 0)),
+        ]
+        self.ends = [
+            datetime.datetime(2016, 1, 25, 9, 0, 0),
+            datetime.datetime(2016, 3, 14, 23, 0, 0),
+            self.pst.localize(datetime.datetime(2016, 12, 31, 12, 30, 0)),
+        ]
+
+    def test_difference_many(self):
+        result = self.rules.difference_many(self.starts, self.ends)
+
+        self.assertEqual(result.dtype, numpy.dtype('timedelta64[ns]'))
+        for i in range(len(self.starts)):
+            self.assertEqual(
+                result[i].astype('timedelta64[us]').item(),
+                self.rules.difference(self.starts[i], self.ends[i]).timedelta)
+
+    def test_difference_many_datetime64(self):
+        starts = numpy.array(['2016-01-18T09:00', '2016-01-18T16:00'], dtype='datetime64[ns]')
+        ends = numpy.array(['2016-01-25T09:00', '2016-01-19T09:00'], dtype='datetime64[ns]')
+
+        self.assertEqual(
+            list(self.rules.difference_many(starts, ends)),
+            [numpy.timedelta64(35, 'h'), numpy.timedelta64(7, 'h')])
+
+    def test_is_business_time_many(self):
+        values = [
+            datetime.datetime(2016, 1, 18, 16, 59, 0),
+            datetime.datetime(2016, 1, 18, 17, 0, 0),
+            datetime.datetime(2016, 3, 14, 16, 30, 0),
+            self.pst.localize(datetime.datetime(2016, 6, 1, 12, 30, 0))]
+
+        self.assertEqual(
+            list(self.rules.is_business_time_many(values)),
+            [self.rules.is_business_time(x) for x in values])
+        self.assertEqual(list(self.rules.is_business_time_many(values)), [False, True, True, False])
+
+    def test_add_many(self):
+        deltas = [
+            BusinessTimeDelta(self.rules, hours=2),
+            BusinessTimeDelta(self.rules, hours=300),
+            BusinessTimeDelta(self.rules, hours=0)]
+        result = self.rules.add_many(self.starts, deltas)
+
+        for i in range(len(self.starts)):
+            self.assertEqual(
+                pytz.utc.localize(result[i].astype('datetime64[us]').item()),
+                self.starts[i] + deltas[i])
+
+    def test_subtract_many(self):
+        deltas = numpy.array([2, 300, 0], dtype='timedelta64[h]')
+        result = self.rules.subtract_many(self.ends, deltas)
+
+        for i in range(len(self.ends)):
+            self.assertEqual(
+                pytz.utc.localize(result[i].astype('datetime64[us]').item()),
+                self.ends[i] - BusinessTimeDelta(self.rules, hours=int(deltas[i] / numpy.timedelta64(1, 'h'))))
@@ -0,0 +1,66 @@
+import datetime
+import unittest
+import pytz
+from .. import instrumentation
+from ..rules import Rules, WorkDayRule, HolidayRule
+from ..businesstimedelta import BusinessTimeDelta
+
+
+class InstrumentationTest(unittest.TestCase):
+    def setUp(self):
+        self.utc = pytz.timezone('UTC')
+        self.workdayrule = WorkDayRule(
+            start_time=datetime.time(9),
+            end_time=datetime.time(17),
+            working_days=[0, 1, 2, 3, 4],
+            tz=self.utc)
+        self.holidayrule = HolidayRule([datetime.date(2016, 1, 26)])
+        self.rules = Rules([self.workdayrule, self.holidayrule])
+        self.events = []
+        self.callback = lambda event, value, rule: self.events.append((event, value, rule))
+
+        instrumentation.stats.reset()
+        instrumentation.enable(self.callback)
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.remove_callback(self.callback)
+        instrumentation.stats.reset()
+
+    def test_add(self):
+        dt = self.utc.localize(datetime.datetime(2016, 1, 25, 9, 0, 0))
+        dt + BusinessTimeDelta(self.rules, hours=16)
+        totals = instrumentation.stats.totals
+
+        self.assertEqual(totals['add.calls'], 1)
+        self.assertEqual(totals['add.periods'], 2)
+        self.assertTrue(totals['add.seconds'] > 0)
+        self.assertTrue(totals['Rules.next.restarts'] >= 1)
+        self.assertTrue(totals['WorkDayRule.next'] > 0)
+        self.assertEqual(instrumentation.stats.by_rule[self.rules]['add.calls'], 1)
+
+    def test_difference_with_index(self):
+        self.rules.compile(datetime.datetime(2016, 1, 1), datetime.datetime(2016, 2, 1))
+        self.rules.difference(datetime.datetime(2016, 1, 4), datetime.datetime(2016, 1, 11))
+
+        self.assertEqual(instrumentation.stats.totals['difference.index_hits'], 1)
+        self.assertEqual(instrumentation.stats.totals['difference.periods'], 0)
+
+    def test_holiday_scan(self):
+        rule = HolidayRule({datetime.date(2016, 1, 26): 'holiday'})
+        rule.next_holiday(datetime.date(2016, 1, 1), max_days=365 * 2)
+
+        self.assertEqual(instrumentation.stats.totals['HolidayRule.next_holiday.years'], 1)
+        self.assertEqual(instrumentation.stats.totals['HolidayRule.index_year.days'], 366)
+
+    def test_callback(self):
+        self.workdayrule.next(datetime.datetime(2016, 1, 25, 9, 0, 0))
+
+        self.assertIn(('WorkDayRule.next', 1, self.workdayrule), self.events)
+
+    def test_disabled(self):
+        instrumentation.disable()
+        self.rules.difference(datetime.datetime(2016, 1, 4), datetime.datetime(2016, 1, 11))
+
+        self.assertEqual(instrumentation.stats.totals, {})
+        self.assertEqual(self.events, [])
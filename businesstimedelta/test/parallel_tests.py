@@ -0,0 +1,70 @@
+import datetime
+import pickle
+import unittest
+import pytz
+from ..rules import Rules, WorkDayRule, LunchTimeRule, HolidayRule
+from ..businesstimedelta import BusinessTimeDelta
+from ..parallel import ParallelCalculator
+
+
+class ParallelCalculatorTest(unittest.TestCase):
+    def setUp(self):
+        self.pst = pytz.timezone('US/Pacific')
+        self.rules = Rules([
+            WorkDayRule(
+                start_time=datetime.time(9),
+                end_time=datetime.time(17),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.pst),
+            LunchTimeRule(
+                start_time=datetime.time(12),
+                end_time=datetime.time(13),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.pst),
+            HolidayRule([datetime.date(2016, 12, 26)], tz=self.pst)])
+        self.serial_rules = Rules(self.rules.available_rules + self.rules.unavailable_rules)
+
+        # One start per day, the last ones outside of the compiled horizon
+        self.starts = [
+            self.pst.localize(datetime.datetime(2016, 1, 1, 10, 30, 0)) + datetime.timedelta(days=i, hours=i)
+            for i in range(400)]
+        self.ends = [x + datetime.timedelta(days=40) for x in self.starts]
+        self.calculator = ParallelCalculator(
+            self.rules,
+            datetime.datetime(2016, 1, 1),
+            datetime.datetime(2017, 1, 1),
+            max_workers=2,
+            chunksize=50)
+
+    def tearDown(self):
+        self.calculator.close()
+
+    def test_difference(self):
+        self.assertEqual(
+            self.calculator.difference(self.starts, self.ends),
+            [self.serial_rules.difference(x, y) for x, y in zip(self.starts, self.ends)])
+
+    def test_add(self):
+        deltas = [BusinessTimeDelta(self.rules, hours=i % 90) for i in range(len(self.starts))]
+
+        self.assertEqual(
+            self.calculator.add(self.starts, deltas),
+            [x + BusinessTimeDelta(self.serial_rules, timedelta=y.timedelta) for x, y in zip(self.starts, deltas)])
+
+    def test_subtract(self):
+        deltas = [datetime.timedelta(hours=i % 90) for i in range(len(self.ends))]
+
+        self.assertEqual(
+            self.calculator.subtract(self.ends, deltas),
+            [x - BusinessTimeDelta(self.serial_rules, timedelta=y) for x, y in zip(self.ends, deltas)])
+
+    def test_empty_input(self):
+        self.assertEqual(self.calculator.difference([], []), [])
+
+    def test_index_is_picklable(self):
+        index = pickle.loads(pickle.dumps(self.calculator.index))
+        dt = self.pst.localize(datetime.datetime(2016, 6, 1, 10, 0, 0))
+
+        self.assertEqual(
+            index.add(dt, datetime.timedelta(hours=10)),
+            self.calculator.index.add(dt, datetime.timedelta(hours=10)))
@@ -0,0 +1,171 @@
+import datetime
+import unittest
+import pytz
+from ...rules.rules import Rules
+from ...rules.workdayrules import WorkDayRule, LunchTimeRule
+from ...rules.holidayrules import HolidayRule
+from ...rules.dateoverriderules import DateOverrideRule
+
+
+class DateOverrideRuleTest(unittest.TestCase):
+    def setUp(self):
+        self.utc = pytz.timezone('UTC')
+        self.overrides = DateOverrideRule({
+            # Half day
+            datetime.date(2016, 1, 26): [(datetime.time(9), datetime.time(13))],
+            # Long day, without the lunch break
+            datetime.date(2016, 1, 27): [(datetime.time(8), datetime.time(20))],
+            # Closed
+            datetime.date(2016, 1, 28): [],
+            # Saturday night
+            datetime.date(2016, 1, 30): [(datetime.time(22), datetime.time(2))],
+        }, tz=self.utc)
+        self.rules = [
+            WorkDayRule(
+                start_time=datetime.time(9),
+                end_time=datetime.time(17),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.utc),
+            LunchTimeRule(
+                start_time=datetime.time(12),
+                end_time=datetime.time(13),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.utc),
+            self.overrides]
+
+    def dt(self, *args):
+        return self.utc.localize(datetime.datetime(*args))
+
+    def test_repr(self):
+        self.assertEqual(str(self.overrides), '<DateOverrideRule: 4 dates>')
+
+    def test_next(self):
+        self.assertEqual(
+            self.overrides.next(self.dt(2016, 1, 26, 10)),
+            (self.dt(2016, 1, 26, 10), self.dt(2016, 1, 26, 13)))
+        self.assertEqual(
+            self.overrides.next(self.dt(2016, 1, 26, 14)),
+            (self.dt(2016, 1, 27, 8), self.dt(2016, 1, 27, 20)))
+        self.assertEqual(
+            self.overrides.next(self.dt(2016, 1, 31, 1)),
+            (self.dt(2016, 1, 31, 1), self.dt(2016, 1, 31, 2)))
+
+    def test_next_after_last_override(self):
+        start, end = self.overrides.next(self.dt(2016, 2, 1))
+        self.assertEqual(start, end)
+
+    def test_previous(self):
+        self.assertEqual(
+            self.overrides.previous(self.dt(2016, 1, 29, 12)),
+            (self.dt(2016, 1, 27, 8), self.dt(2016, 1, 27, 20)))
+        self.assertEqual(
+            self.overrides.previous(self.dt(2016, 1, 31, 1)),
+            (self.dt(2016, 1, 30, 22), self.dt(2016, 1, 31, 1)))
+
+    def test_rules_next(self):
+        rules = Rules(self.rules)
+
+        # The half day has no lunch break, and ends early
+        self.assertEqual(
+            rules.next(self.dt(2016, 1, 26, 12, 30)),
+            (self.dt(2016, 1, 26, 12, 30), self.dt(2016, 1, 26, 13)))
+        self.assertEqual(
+            rules.next(self.dt(2016, 1, 26, 13)),
+            (self.dt(2016, 1, 27, 8), self.dt(2016, 1, 27, 20)))
+
+        # The closed day is skipped
+        self.assertEqual(
+            rules.next(self.dt(2016, 1, 27, 20)),
+            (self.dt(2016, 1, 29, 9), self.dt(2016, 1, 29, 12)))
+
+        self.assertEqual(
+            rules.next(self.dt(2016, 1, 29, 17)),
+            (self.dt(2016, 1, 30, 22), self.dt(2016, 1, 31, 2)))
+        self.assertEqual(
+            rules.next(self.dt(2016, 1, 31, 2)),
+            (self.dt(2016, 2, 1, 9), self.dt(2016, 2, 1, 12)))
+
+    def test_rules_previous(self):
+        rules = Rules(self.rules)
+
+        self.assertEqual(
+            rules.previous(self.dt(2016, 2, 1, 9)),
+            (self.dt(2016, 1, 30, 22), self.dt(2016, 1, 31, 2)))
+        self.assertEqual(
+            rules.previous(self.dt(2016, 1, 29, 9)),
+            (self.dt(2016, 1, 27, 8), self.dt(2016, 1, 27, 20)))
+        self.assertEqual(
+            rules.previous(self.dt(2016, 1, 26, 11)),
+            (self.dt(2016, 1, 26, 9), self.dt(2016, 1, 26, 11)))
+        self.assertEqual(
+            rules.previous(self.dt(2016, 1, 26, 9)),
+            (self.dt(2016, 1, 25, 13), self.dt(2016, 1, 25, 17)))
+
+    def test_compiled(self):
+        rules = Rules(self.rules)
+        compiled = Rules(self.rules, compiled=True)
+        start = self.dt(2016, 1, 20)
+        end = self.dt(2016, 2, 10)
+
+        self.assertEqual(
+            list(compiled.iter_periods(start, end)),
+            list(rules.iter_periods(start, end)))
+        self.assertEqual(
+            list(compiled.iter_periods(end, start, reverse=True)),
+            list(rules.iter_periods(end, start, reverse=True)))
+
+    def test_compiled_overrides_only(self):
+        # After the last override there is no business time left
+        rules = Rules([self.overrides])
+        compiled = Rules([self.overrides], compiled=True)
+        start = self.dt(2016, 1, 1)
+        end = self.dt(2016, 3, 1)
+
+        self.assertEqual(rules.difference(start, end).timedelta, datetime.timedelta(hours=4 + 12 + 4))
+        self.assertEqual(compiled.difference(start, end), rules.difference(start, end))
+        self.assertEqual(compiled.difference(end, start), rules.difference(end, start))
+        self.assertEqual(
+            list(compiled.iter_periods(end, start, reverse=True)),
+            list(rules.iter_periods(end, start, reverse=True)))
+
+        period_start, period_end = compiled.next(end)
+        self.assertEqual(period_start, period_end)
+        period_start, period_end = compiled.previous(start)
+        self.assertEqual(period_start, period_end)
+
+    def test_is_business_time(self):
+        rules = Rules(self.rules)
+
+        self.assertTrue(rules.is_business_time(self.dt(2016, 1, 25, 10)))
+        self.assertFalse(rules.is_business_time(self.dt(2016, 1, 26, 14)))
+        self.assertTrue(rules.is_business_time(self.dt(2016, 1, 27, 12, 30)))
+        self.assertTrue(rules.is_business_time(self.dt(2016, 1, 27, 19)))
+        self.assertFalse(rules.is_business_time(self.dt(2016, 1, 28, 10)))
+        self.assertTrue(rules.is_business_time(self.dt(2016, 1, 31, 1)))
+        self.assertFalse(rules.is_business_time(self.dt(2016, 1, 31, 2)))
+
+    def test_difference(self):
+        rules = Rules(self.rules)
+
+        # 7 hours on Monday, 4 on Tuesday, 12 on Wednesday, none on Thursday,
+        # 7 on Friday and 4 on Saturday night
+        self.assertEqual(
+            rules.difference(self.dt(2016, 1, 25), self.dt(2016, 2, 1)).timedelta,
+            datetime.timedelta(hours=34))
+
+    def test_holidays(self):
+        # The hours of an overridden date replace a holiday as well
+        rules = Rules(self.rules + [HolidayRule([datetime.date(2016, 1, 27)], tz=self.utc)])
+
+        self.assertEqual(
+            rules.next(self.dt(2016, 1, 26, 13)),
+            (self.dt(2016, 1, 27, 8), self.dt(2016, 1, 27, 20)))
+
+    def test_many_overrides(self):
+        overrides = DateOverrideRule(dict(
+            (datetime.date(2000, 1, 1) + datetime.timedelta(days=i), [(datetime.time(10), datetime.time(11))])
+            for i in range(0, 10000, 2)), tz=self.utc)
+
+        self.assertEqual(
+            overrides.next(self.dt(2020, 1, 1, 12)),
+            (self.dt(2020, 1, 2, 10), self.dt(2020, 1, 2, 11)))
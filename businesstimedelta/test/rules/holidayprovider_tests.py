@@ -0,0 +1,105 @@
+import datetime
+import unittest
+import holidays as holidaymodule
+from ...rules.holidayrules import HolidayRule
+from ...rules.holidayproviders import (
+    ContainerProvider, DateListProvider, HolidayProvider, HolidaysModuleProvider, holiday_provider)
+
+
+def state(code):
+    """The options for a US state, by the name that the installed Holidays module uses."""
+    if hasattr(holidaymodule.US(), 'subdiv'):
+        return {'subdiv': code}
+    return {'state': code}
+
+
+class CountingProvider(HolidayProvider):
+    """New Year's Day of every year, counting the years asked for."""
+    def __init__(self):
+        self.years = []
+
+    def holidays(self, year):
+        self.years.append(year)
+        return [datetime.date(year, 1, 1)]
+
+
+class HolidayProviderTest(unittest.TestCase):
+    def test_holiday_provider(self):
+        self.assertIsInstance(holiday_provider([datetime.date(2016, 1, 1)]), DateListProvider)
+        self.assertIsInstance(holiday_provider(holidaymodule.US()), HolidaysModuleProvider)
+        self.assertIsInstance(holiday_provider({datetime.date(2016, 1, 1): 'holiday'}), ContainerProvider)
+
+        provider = CountingProvider()
+        self.assertIs(holiday_provider(provider), provider)
+
+    def test_date_list(self):
+        provider = DateListProvider([datetime.date(2016, 12, 25), datetime.date(2015, 12, 25), datetime.date(2016, 1, 1)])
+        self.assertEqual(provider.holidays(2016), [datetime.date(2016, 1, 1), datetime.date(2016, 12, 25)])
+        self.assertEqual(provider.holidays(2017), [])
+
+    def test_container(self):
+        provider = ContainerProvider({datetime.date(2016, 12, 25): 'Christmas', datetime.date(2016, 1, 1): 'New Year'})
+        self.assertEqual(provider.holidays(2016), [datetime.date(2016, 1, 1), datetime.date(2016, 12, 25)])
+        self.assertEqual(provider.holidays(2015), [])
+
+    def test_holidays_module(self):
+        calendar = holidaymodule.US(**state('CA'))
+        provider = HolidaysModuleProvider(calendar)
+
+        self.assertEqual(provider.holidays(2016), sorted(holidaymodule.US(years=2016, **state('CA'))))
+        # The calendar itself doesn't grow
+        self.assertEqual(len(calendar), 0)
+
+    def test_holidays_module_added_by_hand(self):
+        calendar = holidaymodule.US()
+        calendar.append({datetime.date(2024, 3, 4): 'Company day'})
+        self.assertIsInstance(holiday_provider(calendar), ContainerProvider)
+        self.assertEqual(HolidayRule(calendar).next_holiday(datetime.date(2024, 3, 1)), datetime.date(2024, 3, 4))
+
+        calendar = holidaymodule.US()
+        calendar.update({datetime.date(2024, 3, 4): 'Company day'})
+        self.assertEqual(HolidayRule(calendar).next_holiday(datetime.date(2024, 3, 1)), datetime.date(2024, 3, 4))
+
+        calendar = holidaymodule.US(years=2024)
+        calendar.pop(datetime.date(2024, 7, 4))
+        self.assertEqual(HolidayRule(calendar).next_holiday(datetime.date(2024, 7, 1)), datetime.date(2024, 9, 2))
+
+        self.assertRaises(ValueError, HolidaysModuleProvider, calendar)
+
+    def test_holidays_module_sum(self):
+        calendar = holidaymodule.US() + holidaymodule.CA()
+        self.assertIsInstance(holiday_provider(calendar), ContainerProvider)
+
+        # Canada Day and Independence Day
+        holiday = HolidayRule(calendar)
+        self.assertEqual(holiday.next_holiday(datetime.date(2016, 6, 2)), datetime.date(2016, 7, 1))
+        self.assertEqual(holiday.next_holiday(datetime.date(2016, 7, 2)), datetime.date(2016, 7, 4))
+
+    def test_holidays_module_class_options(self):
+        # Sundays are holidays in Sweden unless include_sundays=False
+        self.assertEqual(
+            HolidaysModuleProvider(holidaymodule.SE(include_sundays=False)).holidays(2016),
+            sorted(holidaymodule.SE(include_sundays=False, years=2016)))
+
+    def test_lazy_years(self):
+        provider = CountingProvider()
+        holiday = HolidayRule(provider)
+        self.assertEqual(provider.years, [])
+
+        self.assertEqual(holiday.next_holiday(datetime.date(2016, 6, 1)), datetime.date(2017, 1, 1))
+        self.assertEqual(holiday.next_holiday(datetime.date(2016, 12, 1)), datetime.date(2017, 1, 1))
+        self.assertEqual(provider.years, [2016, 2017])
+
+    def test_years_cache_size(self):
+        provider = CountingProvider()
+        holiday = HolidayRule(provider, years_cache_size=2)
+
+        for year in [2016, 2030, 2016, 2045, 2016]:
+            holiday.next_holiday(datetime.date(year, 1, 1))
+        self.assertEqual(len(holiday.years_cache), 2)
+        self.assertIn(2016, holiday.years_cache)
+        self.assertEqual(provider.years, [2016, 2030, 2045])
+
+    def test_equal(self):
+        self.assertEqual(HolidayRule(holidaymodule.US(**state('CA'))), HolidayRule(holidaymodule.US(**state('CA'))))
+        self.assertNotEqual(HolidayRule(CountingProvider()), HolidayRule(CountingProvider()))
@@ -131,6 +131,18 @@ class HolidayRuleTest(unittest.TestCase):
             )
         )
 
+    def test_previous_at_holiday_start_edge(self):
+        dt = self.utc.localize(datetime.datetime(2016, 12, 25, 0, 0, 0))
+        holiday = HolidayRule(self.holidays)
+
+        self.assertEqual(
+            holiday.previous(dt),
+            (
+                self.utc.localize(datetime.datetime(2015, 12, 25, 0, 0, 0)),
+                self.utc.localize(datetime.datetime(2015, 12, 26, 0, 0, 0))
+            )
+        )
+
     def test_next_with_holiday_module(self):
         dt = self.utc.localize(datetime.datetime(2015, 12, 23, 12, 0, 0))
         holiday = HolidayRule(holidaymodule.US())
@@ -154,3 +166,85 @@ class HolidayRuleTest(unittest.TestCase):
                 self.utc.localize(datetime.datetime(2015, 12, 26, 0, 0, 0))
             )
         )
+
+    def test_next_holiday_sparse_list(self):
+        holiday = HolidayRule(self.holidays)
+
+        self.assertEqual(
+            holiday.next_holiday(datetime.date(2016, 1, 1)),
+            datetime.date(2016, 12, 25)
+        )
+        self.assertEqual(
+            holiday.next_holiday(datetime.date(2016, 12, 24), reverse=True),
+            datetime.date(2015, 12, 25)
+        )
+
+    def test_next_holiday_max_days(self):
+        holiday = HolidayRule(self.holidays)
+
+        self.assertEqual(holiday.next_holiday(datetime.date(2016, 1, 1), max_days=300), None)
+        self.assertEqual(holiday.next_holiday(datetime.date(2018, 1, 1)), None)
+
+    def test_next_holiday_with_holiday_module_across_years(self):
+        holiday = HolidayRule(holidaymodule.US())
+
+        self.assertEqual(
+            holiday.next_holiday(datetime.date(2015, 12, 26)),
+            datetime.date(2016, 1, 1)
+        )
+        self.assertEqual(
+            holiday.next_holiday(datetime.date(2015, 12, 31), reverse=True),
+            datetime.date(2015, 12, 25)
+        )
+
+    def test_next_after_last_holiday(self):
+        dt = self.utc.localize(datetime.datetime(2018, 1, 1, 0, 0, 0))
+        holiday = HolidayRule(self.holidays)
+        start, end = holiday.next(dt)
+
+        # An empty block of time past the search horizon
+        self.assertEqual(start, end)
+        self.assertTrue(start > dt)
+
+    def test_iter_periods(self):
+        start = self.utc.localize(datetime.datetime(2015, 12, 25, 12, 0, 0))
+        holiday = HolidayRule(self.holidays)
+
+        self.assertEqual(
+            list(holiday.iter_periods(start)),
+            [
+                (start, self.utc.localize(datetime.datetime(2015, 12, 26, 0, 0, 0))),
+                (
+                    self.utc.localize(datetime.datetime(2016, 12, 25, 0, 0, 0)),
+                    self.utc.localize(datetime.datetime(2016, 12, 26, 0, 0, 0))
+                ),
+                (
+                    self.utc.localize(datetime.datetime(2017, 12, 25, 0, 0, 0)),
+                    self.utc.localize(datetime.datetime(2017, 12, 26, 0, 0, 0))
+                ),
+            ]
+        )
+
+    def test_iter_periods_reverse(self):
+        start = self.utc.localize(datetime.datetime(2017, 12, 25, 0, 0, 0))
+        end = self.utc.localize(datetime.datetime(2015, 12, 25, 12, 0, 0))
+        holiday = HolidayRule(self.holidays)
+
+        self.assertEqual(
+            list(holiday.iter_periods(start, end, reverse=True)),
+            [
+                (
+                    self.utc.localize(datetime.datetime(2016, 12, 25, 0, 0, 0)),
+                    self.utc.localize(datetime.datetime(2016, 12, 26, 0, 0, 0))
+                ),
+                (end, self.utc.localize(datetime.datetime(2015, 12, 26, 0, 0, 0))),
+            ]
+        )
+
+    def test_holiday_on_change_of_utc_offset(self):
+        # The clocks go back an hour on this day, which lasts 25 hours
+        holiday = HolidayRule([datetime.date(2016, 11, 6)], tz=self.pst)
+        start, end = holiday.next(self.pst.localize(datetime.datetime(2016, 11, 6, 23, 0, 0)))
+
+        self.assertEqual(end, self.pst.localize(datetime.datetime(2016, 11, 7, 0, 0, 0)))
+        self.assertEqual(end - self.pst.localize(datetime.datetime(2016, 11, 6, 0, 0, 0)), datetime.timedelta(hours=25))
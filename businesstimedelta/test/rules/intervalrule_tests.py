@@ -0,0 +1,152 @@
+import datetime
+import unittest
+import pytz
+from ...rules.rules import Rules
+from ...rules.workdayrules import WorkDayRule
+from ...rules.intervalrules import IntervalRule
+
+
+class IntervalRuleTest(unittest.TestCase):
+    def setUp(self):
+        self.utc = pytz.timezone('UTC')
+        self.pst = pytz.timezone('US/Pacific')
+        self.outages = IntervalRule([
+            (self.dt(2016, 1, 25, 10), self.dt(2016, 1, 25, 11)),
+            # Overlaps with the one before
+            (self.dt(2016, 1, 25, 10, 30), self.dt(2016, 1, 25, 12)),
+            (self.dt(2016, 1, 26, 16), self.dt(2016, 1, 27, 10)),
+        ])
+        self.workday = WorkDayRule(
+            start_time=datetime.time(9),
+            end_time=datetime.time(17),
+            working_days=[0, 1, 2, 3, 4],
+            tz=self.utc)
+
+    def dt(self, *args):
+        return self.utc.localize(datetime.datetime(*args))
+
+    def test_repr(self):
+        self.assertEqual(str(self.outages), '<IntervalRule: 2 intervals>')
+
+    def test_time_off(self):
+        self.assertTrue(self.outages.time_off)
+        self.assertFalse(IntervalRule([], time_off=False).time_off)
+
+    def test_next(self):
+        self.assertEqual(
+            self.outages.next(self.dt(2016, 1, 25, 9)),
+            (self.dt(2016, 1, 25, 10), self.dt(2016, 1, 25, 12)))
+        self.assertEqual(
+            self.outages.next(self.dt(2016, 1, 25, 11)),
+            (self.dt(2016, 1, 25, 11), self.dt(2016, 1, 25, 12)))
+        self.assertEqual(
+            self.outages.next(self.dt(2016, 1, 25, 12)),
+            (self.dt(2016, 1, 26, 16), self.dt(2016, 1, 27, 10)))
+
+        start, end = self.outages.next(self.dt(2016, 1, 27, 10))
+        self.assertEqual(start, end)
+
+    def test_previous(self):
+        self.assertEqual(
+            self.outages.previous(self.dt(2016, 1, 27, 12)),
+            (self.dt(2016, 1, 26, 16), self.dt(2016, 1, 27, 10)))
+        self.assertEqual(
+            self.outages.previous(self.dt(2016, 1, 25, 11)),
+            (self.dt(2016, 1, 25, 10), self.dt(2016, 1, 25, 11)))
+
+        start, end = self.outages.previous(self.dt(2016, 1, 25, 10))
+        self.assertEqual(start, end)
+
+    def test_time_zone(self):
+        # Naive datetimes are UTC, the periods are returned in the time zone of the rule
+        outages = IntervalRule(
+            [(datetime.datetime(2016, 1, 25, 18), datetime.datetime(2016, 1, 25, 19))], tz=self.pst)
+        self.assertEqual(
+            outages.next(datetime.datetime(2016, 1, 25)),
+            (
+                self.pst.localize(datetime.datetime(2016, 1, 25, 10)),
+                self.pst.localize(datetime.datetime(2016, 1, 25, 11))
+            ))
+        self.assertEqual(str(outages.next(datetime.datetime(2016, 1, 25))[0]), '2016-01-25 10:00:00-08:00')
+
+    def test_iter_periods(self):
+        self.assertEqual(
+            list(self.outages.iter_periods(self.dt(2016, 1, 25, 11), self.dt(2016, 1, 27))),
+            [
+                (self.dt(2016, 1, 25, 11), self.dt(2016, 1, 25, 12)),
+                (self.dt(2016, 1, 26, 16), self.dt(2016, 1, 27)),
+            ])
+        self.assertEqual(
+            list(self.outages.iter_periods(self.dt(2016, 1, 27), reverse=True)),
+            [
+                (self.dt(2016, 1, 26, 16), self.dt(2016, 1, 27)),
+                (self.dt(2016, 1, 25, 10), self.dt(2016, 1, 25, 12)),
+            ])
+
+    def test_rules(self):
+        rules = Rules([self.workday, self.outages])
+
+        self.assertEqual(
+            rules.next(self.dt(2016, 1, 25, 10)),
+            (self.dt(2016, 1, 25, 12), self.dt(2016, 1, 25, 17)))
+        self.assertEqual(
+            rules.previous(self.dt(2016, 1, 27, 12)),
+            (self.dt(2016, 1, 27, 10), self.dt(2016, 1, 27, 12)))
+        self.assertEqual(
+            rules.difference(self.dt(2016, 1, 25), self.dt(2016, 1, 28)).timedelta,
+            datetime.timedelta(hours=6 + 7 + 7))
+        self.assertFalse(rules.is_business_time(self.dt(2016, 1, 26, 16, 30)))
+        self.assertTrue(rules.is_business_time(self.dt(2016, 1, 26, 15, 30)))
+
+    def test_available(self):
+        # Extra hours on top of the working day
+        extra_hours = IntervalRule([(self.dt(2016, 1, 23, 10), self.dt(2016, 1, 23, 14))], time_off=False)
+        rules = Rules([self.workday, extra_hours])
+        self.assertEqual(
+            rules.difference(self.dt(2016, 1, 22), self.dt(2016, 1, 25)).timedelta,
+            datetime.timedelta(hours=12))
+
+    def test_available_only(self):
+        # After the last interval there is no business time left
+        rules = Rules([IntervalRule([(self.dt(2024, 1, 2), self.dt(2024, 1, 3))], time_off=False)])
+        self.assertEqual(
+            rules.difference(self.dt(2024, 1, 1), self.dt(2024, 3, 1)).timedelta,
+            datetime.timedelta(hours=24))
+
+        start, end = rules.next(self.dt(2024, 2, 1))
+        self.assertEqual(start, end)
+        start, end = rules.previous(self.dt(2024, 1, 1))
+        self.assertEqual(start, end)
+
+    def test_available_only_compiled(self):
+        intervals = IntervalRule([(self.dt(2024, 1, 2), self.dt(2024, 1, 3))], time_off=False)
+        rules = Rules([intervals])
+        compiled = Rules([intervals], compiled=True)
+        start = self.dt(2024, 1, 1)
+        end = self.dt(2024, 3, 1)
+
+        self.assertEqual(compiled.difference(start, end), rules.difference(start, end))
+        self.assertEqual(
+            list(compiled.iter_periods(start, end)),
+            list(rules.iter_periods(start, end)))
+
+        period_start, period_end = compiled.next(end)
+        self.assertEqual(period_start, period_end)
+
+    def test_many_intervals(self):
+        start = self.dt(2016, 1, 1)
+        outages = IntervalRule([
+            (start + datetime.timedelta(hours=i), start + datetime.timedelta(hours=i, minutes=30))
+            for i in range(10000)])
+
+        self.assertEqual(len(outages.starts), 10000)
+        self.assertEqual(
+            outages.next(self.dt(2016, 6, 1, 12, 45)),
+            (self.dt(2016, 6, 1, 13), self.dt(2016, 6, 1, 13, 30)))
+
+    def test_equal(self):
+        self.assertEqual(
+            IntervalRule([(self.dt(2016, 1, 25, 10), self.dt(2016, 1, 25, 12))]),
+            IntervalRule([
+                (self.dt(2016, 1, 25, 11), self.dt(2016, 1, 25, 12)),
+                (self.dt(2016, 1, 25, 10), self.dt(2016, 1, 25, 11, 30))]))
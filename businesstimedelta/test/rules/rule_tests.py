@@ -1,8 +1,17 @@
 import datetime
+import os
+import subprocess
+import sys
 import unittest
+import holidays as holidaymodule
 import pytz
-from ...rules.workdayrules import WorkDayRule
+from ...rules.holidayrules import HolidayRule
+from ...rules.rules import Rules
+from ...rules.workdayrules import WorkDayRule, LunchTimeRule
 from ...businesstimedelta import BusinessTimeDelta
+from .holidayprovider_tests import state
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 
 class RuleTest(unittest.TestCase):
@@ -76,3 +85,129 @@ class NightShiftRuleTest(unittest.TestCase):
             BusinessTimeDelta(self.workdayrule, hours=2),
             self.workdayrule.difference(start_dt, end_dt)
         )
+
+
+class RuleEqualityTest(unittest.TestCase):
+    def calendar(self, holidays=(datetime.date(2016, 12, 25), datetime.date(2016, 12, 26)), **kwargs):
+        return Rules([
+            WorkDayRule(
+                start_time=datetime.time(9),
+                end_time=datetime.time(17),
+                working_days=[0, 1, 2, 3, 4],
+                tz=pytz.timezone('US/Pacific')),
+            LunchTimeRule(tz=pytz.timezone('US/Pacific')),
+            HolidayRule(list(holidays), tz=pytz.timezone('US/Pacific'))], **kwargs)
+
+    def test_equal(self):
+        self.assertEqual(self.calendar(), self.calendar())
+        self.assertEqual(hash(self.calendar()), hash(self.calendar()))
+        self.assertEqual(self.calendar().fingerprint(), self.calendar().fingerprint())
+        self.assertEqual(len(set([self.calendar(), self.calendar()])), 1)
+
+        # The order of rules and holidays makes no difference
+        self.assertEqual(
+            self.calendar(),
+            Rules(list(reversed(self.calendar().available_rules + self.calendar().unavailable_rules)),
+                  tz=pytz.utc))
+        self.assertEqual(
+            self.calendar(),
+            self.calendar(holidays=[datetime.date(2016, 12, 26), datetime.date(2016, 12, 25)]))
+
+    def test_not_equal(self):
+        workday = WorkDayRule(tz=pytz.utc)
+        self.assertNotEqual(workday, WorkDayRule(tz=pytz.timezone('US/Pacific')))
+        self.assertNotEqual(workday, WorkDayRule(start_time=datetime.time(8), tz=pytz.utc))
+        self.assertNotEqual(workday, WorkDayRule(working_days=[0, 1, 2], tz=pytz.utc))
+        self.assertNotEqual(workday, WorkDayRule(tz=pytz.utc, time_off=True))
+        self.assertNotEqual(self.calendar(), self.calendar(holidays=[datetime.date(2016, 12, 25)]))
+        self.assertNotEqual(workday, None)
+
+    def test_holidays_module(self):
+        self.assertEqual(HolidayRule(holidaymodule.US(**state('CA'))), HolidayRule(holidaymodule.US(**state('CA'))))
+        self.assertNotEqual(HolidayRule(holidaymodule.US(**state('CA'))), HolidayRule(holidaymodule.US(**state('TX'))))
+        self.assertNotEqual(
+            HolidayRule(holidaymodule.US() + holidaymodule.CA()), HolidayRule(holidaymodule.US() + holidaymodule.MX()))
+
+    def test_holidays_module_added_by_hand(self):
+        company = holidaymodule.US()
+        company.append({datetime.date(2024, 3, 4): 'Company day'})
+        workday = WorkDayRule(start_time=datetime.time(9), end_time=datetime.time(17), tz=pytz.utc)
+        ra = Rules([workday, HolidayRule(holidaymodule.US())])
+        rb = Rules([workday, HolidayRule(company)])
+        self.assertNotEqual(ra, rb)
+
+        # Compiled indexes and timelines are not shared between them
+        ra.compile(datetime.datetime(2024, 1, 1), datetime.datetime(2025, 1, 1))
+        rb.compile(datetime.datetime(2024, 1, 1), datetime.datetime(2025, 1, 1))
+        self.assertEqual(rb.difference(datetime.datetime(2024, 3, 4), datetime.datetime(2024, 3, 5)).hours, 0)
+        self.assertEqual(ra.difference(datetime.datetime(2024, 3, 4), datetime.datetime(2024, 3, 5)).hours, 8)
+
+    def test_fingerprint_in_other_process(self):
+        code = (
+            'import datetime, pytz\n'
+            'from businesstimedelta import WorkDayRule\n'
+            'print(WorkDayRule(start_time=datetime.time(9), end_time=datetime.time(17), '
+            'working_days=[0, 1, 2, 3, 4], tz=pytz.timezone("US/Pacific")).fingerprint())\n')
+        env = dict(os.environ, PYTHONHASHSEED='123')
+        output = subprocess.check_output([sys.executable, '-c', code], env=env, cwd=ROOT)
+        self.assertEqual(output.decode('ascii').strip(), self.calendar().available_rules[0].fingerprint())
+
+    def test_business_time_delta(self):
+        self.assertEqual(
+            BusinessTimeDelta(self.calendar(), hours=1) + BusinessTimeDelta(self.calendar(), hours=2),
+            BusinessTimeDelta(self.calendar(), hours=3))
+
+    def test_shared_index(self):
+        start = datetime.datetime(2016, 1, 1)
+        end = datetime.datetime(2017, 1, 1)
+        rules = self.calendar()
+        index = rules.compile(start, end)
+        self.assertIs(self.calendar().compile(start, end), index)
+        self.assertIs(self.calendar(compiled=True).timeline, self.calendar(compiled=True).timeline)
+
+
+class DifferenceTotalsTest(unittest.TestCase):
+    def setUp(self):
+        self.pst = pytz.timezone('US/Pacific')
+        self.rules = Rules([
+            WorkDayRule(
+                start_time=datetime.time(9),
+                end_time=datetime.time(17),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.pst),
+            HolidayRule(holidaymodule.US(**state('CA')), tz=self.pst)], tz=self.pst)
+        self.start = self.pst.localize(datetime.datetime(2012, 3, 14, 15, 0, 0))
+        self.end = self.pst.localize(datetime.datetime(2016, 11, 2, 11, 30, 0))
+
+    def walk(self, start, end):
+        return sum(
+            (period_end - period_start for period_start, period_end in self.rules.iter_periods(start, end)),
+            datetime.timedelta(0))
+
+    def test_difference(self):
+        expected = self.walk(self.start, self.end)
+        self.assertEqual(self.rules.difference(self.start, self.end).timedelta, expected)
+        self.assertEqual(self.rules.difference(self.end, self.start).timedelta, expected)
+
+        # Months from April 2012 to October 2016, of which 2013 to 2015 as whole years
+        self.assertIn(2014, self.rules.totals_cache)
+        self.assertIn((2012, 4), self.rules.totals_cache)
+        self.assertNotIn((2016, 11), self.rules.totals_cache)
+
+    def test_cached(self):
+        self.rules.difference(self.start, self.end)
+        hits = self.rules.totals_cache.hits
+
+        start = self.start + datetime.timedelta(days=20)
+        self.assertEqual(self.rules.difference(start, self.end).timedelta, self.walk(start, self.end))
+        self.assertGreater(self.rules.totals_cache.hits, hits)
+
+    def test_month_boundaries(self):
+        start = self.pst.localize(datetime.datetime(2015, 3, 1))
+        end = self.pst.localize(datetime.datetime(2015, 12, 1))
+        self.assertEqual(self.rules.difference(start, end).timedelta, self.walk(start, end))
+
+    def test_no_cache(self):
+        rules = Rules(self.rules.available_rules + self.rules.unavailable_rules, totals_cache_size=0)
+        self.assertEqual(rules.difference(self.start, self.end).timedelta, self.walk(self.start, self.end))
+        self.assertEqual(len(rules.totals_cache), 0)
@@ -3,6 +3,7 @@ import unittest
 import pytz
 from ...rules.rules import Rules
 from ...rules.workdayrules import WorkDayRule, LunchTimeRule
+from ...rules.holidayrules import HolidayRule
 
 
 class RulesTest(unittest.TestCase):
@@ -76,3 +77,153 @@ class RulesTest(unittest.TestCase):
                 self.utc.localize(datetime.datetime(2016, 1, 25, 13, 30, 0))
             )
         )
+
+    def test_next_with_time_off_past_end_of_period(self):
+        rules = Rules([
+            self.workdayrule,
+            LunchTimeRule(
+                start_time=datetime.time(16),
+                end_time=datetime.time(18),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.utc)])
+        dt = self.utc.localize(datetime.datetime(2016, 1, 25, 10, 0, 0))
+
+        self.assertEqual(
+            rules.next(dt),
+            (
+                dt,
+                self.utc.localize(datetime.datetime(2016, 1, 25, 16, 0, 0))
+            )
+        )
+
+    def test_iter_periods(self):
+        start = self.utc.localize(datetime.datetime(2016, 1, 25, 10, 0, 0))
+        end = self.utc.localize(datetime.datetime(2016, 1, 26, 10, 0, 0))
+
+        self.assertEqual(
+            list(self.rules.iter_periods(start, end)),
+            [
+                (start, self.utc.localize(datetime.datetime(2016, 1, 25, 12, 0, 0))),
+                (
+                    self.utc.localize(datetime.datetime(2016, 1, 25, 13, 0, 0)),
+                    self.utc.localize(datetime.datetime(2016, 1, 25, 17, 0, 0))
+                ),
+                (self.utc.localize(datetime.datetime(2016, 1, 26, 9, 0, 0)), end),
+            ]
+        )
+
+    def test_weekly_template(self):
+        tz, intervals = self.rules.weekly_template()
+        hour = 3600 * 10 ** 6
+
+        self.assertEqual(tz, self.utc)
+        self.assertEqual(len(intervals), 10)
+        self.assertEqual(intervals[:2], [(9 * hour, 12 * hour), (13 * hour, 17 * hour)])
+
+    def test_is_business_time(self):
+        self.assertTrue(self.rules.is_business_time(datetime.datetime(2016, 1, 25, 9, 0, 0)))
+        self.assertFalse(self.rules.is_business_time(datetime.datetime(2016, 1, 25, 12, 30, 0)))
+        self.assertTrue(self.rules.is_business_time(datetime.datetime(2016, 1, 25, 16, 59, 59)))
+        self.assertFalse(self.rules.is_business_time(datetime.datetime(2016, 1, 25, 17, 0, 0)))
+        self.assertFalse(self.rules.is_business_time(datetime.datetime(2016, 1, 30, 10, 0, 0)))
+
+    def test_is_business_time_around_holiday(self):
+        rules = Rules([self.workdayrule, self.lunchbreak, HolidayRule([datetime.date(2016, 1, 26)])])
+
+        self.assertTrue(rules.is_business_time(datetime.datetime(2016, 1, 25, 10, 0, 0)))
+        self.assertFalse(rules.is_business_time(datetime.datetime(2016, 1, 26, 10, 0, 0)))
+        self.assertTrue(rules.is_business_time(datetime.datetime(2016, 1, 27, 10, 0, 0)))
+
+
+class CompiledRulesTest(unittest.TestCase):
+    def setUp(self):
+        self.utc = pytz.timezone('UTC')
+        self.rules = Rules([
+            WorkDayRule(
+                start_time=datetime.time(9),
+                end_time=datetime.time(17),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.utc),
+            LunchTimeRule(
+                start_time=datetime.time(12),
+                end_time=datetime.time(13),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.utc),
+            HolidayRule([datetime.date(2016, 1, 26)])],
+            compiled=True)
+
+    def test_next_during_lunch_break(self):
+        dt = self.utc.localize(datetime.datetime(2016, 1, 25, 12, 30, 0))
+
+        self.assertEqual(
+            self.rules.next(dt),
+            (
+                self.utc.localize(datetime.datetime(2016, 1, 25, 13, 0, 0)),
+                self.utc.localize(datetime.datetime(2016, 1, 25, 17, 0, 0))
+            )
+        )
+
+    def test_next_over_holiday(self):
+        dt = self.utc.localize(datetime.datetime(2016, 1, 25, 17, 0, 0))
+
+        self.assertEqual(
+            self.rules.next(dt),
+            (
+                self.utc.localize(datetime.datetime(2016, 1, 27, 9, 0, 0)),
+                self.utc.localize(datetime.datetime(2016, 1, 27, 12, 0, 0))
+            )
+        )
+
+    def test_previous_during_lunch_break(self):
+        dt = self.utc.localize(datetime.datetime(2016, 1, 25, 12, 30, 0))
+
+        self.assertEqual(
+            self.rules.previous(dt),
+            (
+                self.utc.localize(datetime.datetime(2016, 1, 25, 9, 0, 0)),
+                self.utc.localize(datetime.datetime(2016, 1, 25, 12, 0, 0))
+            )
+        )
+
+    def test_window_grows_in_both_directions(self):
+        self.rules.next(self.utc.localize(datetime.datetime(2016, 1, 25, 12, 30, 0)))
+        window = (self.rules.timeline.window_start, self.rules.timeline.window_end)
+
+        self.assertEqual(
+            self.rules.previous(self.utc.localize(datetime.datetime(2015, 1, 5, 10, 0, 0))),
+            (
+                self.utc.localize(datetime.datetime(2015, 1, 5, 9, 0, 0)),
+                self.utc.localize(datetime.datetime(2015, 1, 5, 10, 0, 0))
+            )
+        )
+        self.assertEqual(
+            self.rules.next(self.utc.localize(datetime.datetime(2017, 1, 6, 16, 0, 0))),
+            (
+                self.utc.localize(datetime.datetime(2017, 1, 6, 16, 0, 0)),
+                self.utc.localize(datetime.datetime(2017, 1, 6, 17, 0, 0))
+            )
+        )
+        self.assertTrue(self.rules.timeline.window_start < window[0])
+        self.assertTrue(self.rules.timeline.window_end > window[1])
+
+    def test_iter_periods_reverse(self):
+        start = self.utc.localize(datetime.datetime(2016, 1, 27, 10, 0, 0))
+        periods = self.rules.iter_periods(start, reverse=True)
+
+        self.assertEqual(
+            next(periods),
+            (self.utc.localize(datetime.datetime(2016, 1, 27, 9, 0, 0)), start)
+        )
+        self.assertEqual(
+            next(periods),
+            (
+                self.utc.localize(datetime.datetime(2016, 1, 25, 13, 0, 0)),
+                self.utc.localize(datetime.datetime(2016, 1, 25, 17, 0, 0))
+            )
+        )
+
+    def test_difference(self):
+        start = datetime.datetime(2016, 1, 18, 9, 0, 0)
+        end = datetime.datetime(2016, 2, 1, 9, 0, 0)
+
+        self.assertEqual(self.rules.difference(start, end).hours, 70 - 7)
@@ -3,6 +3,11 @@ import unittest
 import pytz
 from ...rules.workdayrules import WorkDayRule, LunchTimeRule
 
+try:
+    import zoneinfo
+except ImportError:
+    zoneinfo = None
+
 
 class WorkDayRuleTest(unittest.TestCase):
     def setUp(self):
@@ -102,6 +107,206 @@ class WorkDayRuleTest(unittest.TestCase):
             )
         )
 
+    def test_iter_periods(self):
+        start = self.utc.localize(datetime.datetime(2016, 1, 22, 10, 0, 0))
+        end = self.utc.localize(datetime.datetime(2016, 1, 26, 12, 0, 0))
+
+        self.assertEqual(
+            list(self.workdayrule.iter_periods(start, end)),
+            [
+                (start, self.utc.localize(datetime.datetime(2016, 1, 22, 17, 0, 0))),
+                (
+                    self.utc.localize(datetime.datetime(2016, 1, 25, 9, 0, 0)),
+                    self.utc.localize(datetime.datetime(2016, 1, 25, 17, 0, 0))
+                ),
+                (self.utc.localize(datetime.datetime(2016, 1, 26, 9, 0, 0)), end),
+            ]
+        )
+
+    def test_iter_periods_reverse(self):
+        start = self.utc.localize(datetime.datetime(2016, 1, 25, 12, 0, 0))
+        periods = self.workdayrule.iter_periods(start, reverse=True)
+
+        self.assertEqual(
+            next(periods),
+            (self.utc.localize(datetime.datetime(2016, 1, 25, 9, 0, 0)), start)
+        )
+        self.assertEqual(
+            next(periods),
+            (
+                self.utc.localize(datetime.datetime(2016, 1, 22, 9, 0, 0)),
+                self.utc.localize(datetime.datetime(2016, 1, 22, 17, 0, 0))
+            )
+        )
+
+    def test_period_cache(self):
+        dt = self.utc.localize(datetime.datetime(2016, 1, 25, 10, 0, 0))
+        self.workdayrule.next(dt)
+        self.workdayrule.previous(dt)
+
+        info = self.workdayrule.cache_info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.currsize, 1)
+
+    def test_period_cache_size(self):
+        workdayrule = WorkDayRule(tz=self.utc, cache_size=0)
+        dt = self.utc.localize(datetime.datetime(2016, 1, 25, 10, 0, 0))
+
+        self.assertEqual(workdayrule.next(dt), workdayrule.next(dt))
+        self.assertEqual(workdayrule.cache_info().currsize, 0)
+
+
+@unittest.skipIf(zoneinfo is None, 'zoneinfo is not available')
+class ZoneInfoWorkDayRuleTest(unittest.TestCase):
+    def setUp(self):
+        self.pst = pytz.timezone('US/Pacific')
+        self.workdayrule = WorkDayRule(
+            start_time=datetime.time(9),
+            end_time=datetime.time(17),
+            working_days=[0, 1, 2, 3, 4],
+            tz=zoneinfo.ZoneInfo('US/Pacific'))
+
+    def test_next_same_as_pytz(self):
+        pytz_workdayrule = WorkDayRule(
+            start_time=datetime.time(9),
+            end_time=datetime.time(17),
+            working_days=[0, 1, 2, 3, 4],
+            tz=self.pst)
+
+        for dt in [
+                datetime.datetime(2016, 3, 11, 20, 0, 0),
+                datetime.datetime(2016, 3, 14, 17, 0, 0),
+                datetime.datetime(2016, 11, 4, 23, 30, 0)]:
+            self.assertEqual(self.workdayrule.next(dt), pytz_workdayrule.next(dt))
+            self.assertEqual(self.workdayrule.previous(dt), pytz_workdayrule.previous(dt))
+
+    def test_difference_across_change_of_utc_offset(self):
+        start = self.pst.localize(datetime.datetime(2016, 3, 11, 9, 0, 0))
+        end = self.pst.localize(datetime.datetime(2016, 3, 15, 9, 0, 0))
+
+        self.assertEqual(self.workdayrule.difference(start, end).hours, 16)
+
+
+class OvernightWorkDayRuleTest(unittest.TestCase):
+    def setUp(self):
+        self.utc = pytz.timezone('UTC')
+        self.workdayrule = WorkDayRule(
+            start_time=datetime.time(22),
+            end_time=datetime.time(6),
+            working_days=[0, 1, 2, 3, 4],
+            tz=self.utc)
+
+    def test_next_after_midnight(self):
+        dt = self.utc.localize(datetime.datetime(2016, 1, 26, 2, 0, 0))
+
+        self.assertEqual(
+            self.workdayrule.next(dt),
+            (
+                dt,
+                self.utc.localize(datetime.datetime(2016, 1, 26, 6, 0, 0))
+            )
+        )
+
+    def test_next_before_midnight(self):
+        dt = self.utc.localize(datetime.datetime(2016, 1, 25, 23, 0, 0))
+
+        self.assertEqual(
+            self.workdayrule.next(dt),
+            (
+                dt,
+                self.utc.localize(datetime.datetime(2016, 1, 26, 6, 0, 0))
+            )
+        )
+
+    def test_previous_after_shift(self):
+        dt = self.utc.localize(datetime.datetime(2016, 1, 26, 12, 0, 0))
+
+        self.assertEqual(
+            self.workdayrule.previous(dt),
+            (
+                self.utc.localize(datetime.datetime(2016, 1, 25, 22, 0, 0)),
+                self.utc.localize(datetime.datetime(2016, 1, 26, 6, 0, 0))
+            )
+        )
+
+    def test_weekly_template_wraps_around_week(self):
+        workdayrule = WorkDayRule(
+            start_time=datetime.time(22),
+            end_time=datetime.time(6),
+            working_days=[6],
+            tz=self.utc)
+        hour = 3600 * 10 ** 6
+
+        self.assertEqual(
+            workdayrule.weekly_template(),
+            (self.utc, [(0, 6 * hour), (166 * hour, 168 * hour)])
+        )
+
+    def test_regular_until_dst(self):
+        pst = pytz.timezone('US/Pacific')
+        workdayrule = WorkDayRule(
+            start_time=datetime.time(22),
+            end_time=datetime.time(6),
+            working_days=[5],
+            tz=pst)
+        dt = pst.localize(datetime.datetime(2016, 1, 4, 9, 0, 0))
+
+        # DST starts during the night shift of Saturday 12 March 2016
+        self.assertEqual(
+            workdayrule.regular_until(dt),
+            pst.localize(datetime.datetime(2016, 3, 13, 3, 0, 0))
+        )
+
+
+class DaylightSavingWorkDayRuleTest(unittest.TestCase):
+    def setUp(self):
+        self.london = pytz.timezone('Europe/London')
+
+        # The clocks go from 1:00 to 2:00 on Sunday 27 March 2016
+        self.workdayrule = WorkDayRule(
+            start_time=datetime.time(1),
+            end_time=datetime.time(2),
+            working_days=[6],
+            tz=self.london)
+
+    def test_next_skips_day_without_time(self):
+        dt = self.london.localize(datetime.datetime(2016, 3, 26, 12, 0, 0))
+
+        self.assertEqual(
+            self.workdayrule.next(dt),
+            (
+                self.london.localize(datetime.datetime(2016, 4, 3, 1, 0, 0)),
+                self.london.localize(datetime.datetime(2016, 4, 3, 2, 0, 0))
+            )
+        )
+
+    def test_previous_skips_day_without_time(self):
+        dt = self.london.localize(datetime.datetime(2016, 3, 28, 12, 0, 0))
+
+        self.assertEqual(
+            self.workdayrule.previous(dt),
+            (
+                self.london.localize(datetime.datetime(2016, 3, 20, 1, 0, 0)),
+                self.london.localize(datetime.datetime(2016, 3, 20, 2, 0, 0))
+            )
+        )
+
+    def test_is_business_time(self):
+        pst = pytz.timezone('US/Pacific')
+        workdayrule = WorkDayRule(
+            start_time=datetime.time(1),
+            end_time=datetime.time(3),
+            working_days=[6],
+            tz=pst)
+
+        # 1:30 happens twice on Sunday 6 November 2016, the working day starts at 1:00 standard time
+        dt = pst.localize(datetime.datetime(2016, 11, 6, 1, 30, 0), is_dst=True)
+        self.assertFalse(workdayrule.is_business_time(dt))
+        self.assertTrue(workdayrule.is_business_time(dt + datetime.timedelta(hours=1)))
+        self.assertFalse(workdayrule.is_business_time(dt + datetime.timedelta(hours=3)))
+        self.assertTrue(workdayrule.is_business_time(dt + datetime.timedelta(days=7, hours=1)))
+
 
 class LunchTimeRuleTest(unittest.TestCase):
     def setUp(self):
@@ -0,0 +1,78 @@
+import datetime
+import unittest
+import pytz
+from ..rules import Rules, WorkDayRule, LunchTimeRule
+from ..businesstimedelta import BusinessTimeDelta
+
+try:
+    import pandas
+    from .. import series
+except ImportError:
+    pandas = None
+
+
+@unittest.skipIf(pandas is None, 'pandas is not installed')
+class SeriesTest(unittest.TestCase):
+    def setUp(self):
+        self.utc = pytz.timezone('UTC')
+        self.pst = pytz.timezone('US/Pacific')
+        self.rules = Rules([
+            WorkDayRule(
+                start_time=datetime.time(9),
+                end_time=datetime.time(17),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.pst),
+            LunchTimeRule(
+                start_time=datetime.time(12),
+                end_time=datetime.time(13),
+                working_days=[0, 1, 2, 3, 4],
+                tz=self.pst)])
+        self.starts = pandas.Series([
+            datetime.datetime(2016, 1, 18, 9, 0, 0),
+            datetime.datetime(2016, 3, 11, 23, 0, 0),
+            None], index=['a', 'b', 'c'])
+        self.ends = pandas.Series([
+            datetime.datetime(2016, 1, 25, 9, 0, 0),
+            datetime.datetime(2016, 3, 14, 23, 0, 0),
+            datetime.datetime(2016, 3, 14, 23, 0, 0)], index=['a', 'b', 'c'])
+
+    def test_difference(self):
+        result = self.starts.business.difference(self.rules, self.ends)
+
+        self.assertEqual(list(result.index), ['a', 'b', 'c'])
+        for i in range(2):
+            self.assertEqual(
+                result.iloc[i].to_pytimedelta(),
+                self.rules.difference(self.starts.iloc[i], self.ends.iloc[i]).timedelta)
+        self.assertTrue(pandas.isnull(result.iloc[2]))
+
+    def test_difference_aware_and_naive(self):
+        aware = self.ends.dt.tz_localize(self.utc).dt.tz_convert(self.pst)
+
+        self.assertTrue(series.difference(self.rules, self.starts, aware).equals(
+            series.difference(self.rules, self.starts, self.ends)))
+
+    def test_add(self):
+        delta = BusinessTimeDelta(self.rules, hours=5)
+        result = series.add(self.rules, pandas.DatetimeIndex(self.ends), delta)
+
+        for i in range(3):
+            self.assertEqual(result.iloc[i].to_pydatetime(), self.ends.iloc[i] + delta)
+
+    def test_subtract(self):
+        deltas = pandas.Series(pandas.to_timedelta(['2h', '30h', None]), index=['a', 'b', 'c'])
+        result = self.ends.business.subtract(self.rules, deltas)
+
+        for i in range(2):
+            self.assertEqual(
+                result.iloc[i].to_pydatetime(),
+                self.ends.iloc[i] - BusinessTimeDelta(self.rules, timedelta=deltas.iloc[i].to_pytimedelta()))
+        self.assertTrue(pandas.isnull(result.iloc[2]))
+
+    def test_is_business_time(self):
+        result = self.starts.business.is_business_time(self.rules)
+
+        self.assertEqual(list(result), [False, True, False])
+        self.assertEqual(
+            list(self.ends.business.is_business_time(self.rules)),
+            [self.rules.is_business_time(x) for x in self.ends])
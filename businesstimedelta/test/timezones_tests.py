@@ -0,0 +1,77 @@
+import datetime
+import unittest
+import pytz
+from ..intervals import EPOCH, timedelta_to_microseconds
+from ..timezones import NAIVE_EPOCH, localize, offset_table, wall_clock
+
+try:
+    import zoneinfo
+except ImportError:
+    zoneinfo = None
+
+
+class OffsetTableTest(unittest.TestCase):
+    def setUp(self):
+        self.pst = pytz.timezone('US/Pacific')
+        self.table = offset_table(self.pst)
+
+    def test_localize_like_pytz(self):
+        for naive in [
+                datetime.datetime(2016, 1, 18, 9, 0, 0),
+                datetime.datetime(2016, 3, 13, 1, 59, 0),
+                datetime.datetime(2016, 3, 13, 2, 30, 0),  # skipped
+                datetime.datetime(2016, 3, 13, 3, 0, 0),
+                datetime.datetime(2016, 11, 6, 0, 59, 0),
+                datetime.datetime(2016, 11, 6, 1, 30, 0),  # repeated
+                datetime.datetime(2016, 11, 6, 2, 0, 0),
+                datetime.datetime(1850, 1, 1, 0, 0, 0)]:
+            expected = self.pst.localize(naive)
+            result = self.table.localize(naive)
+
+            self.assertEqual(result, expected)
+            self.assertTrue(result.tzinfo is expected.tzinfo)
+
+    def test_wall_clock(self):
+        for naive in [
+                datetime.datetime(2016, 3, 13, 9, 59, 59),
+                datetime.datetime(2016, 3, 13, 10, 0, 0),
+                datetime.datetime(2016, 11, 6, 8, 30, 0),
+                datetime.datetime(2016, 11, 6, 9, 30, 0)]:
+            dt = pytz.utc.localize(naive)
+
+            self.assertEqual(
+                self.table.wall_clock(timedelta_to_microseconds(dt - EPOCH)),
+                timedelta_to_microseconds(dt.astimezone(self.pst).replace(tzinfo=None) - NAIVE_EPOCH))
+
+    def test_fixed_offset(self):
+        tz = pytz.FixedOffset(330)
+        table = offset_table(tz)
+        naive = datetime.datetime(2016, 1, 18, 9, 0, 0)
+
+        self.assertEqual(table.localize(naive), naive.replace(tzinfo=tz))
+        self.assertEqual(table.wall_clock(0), timedelta_to_microseconds(datetime.timedelta(hours=5, minutes=30)))
+        self.assertEqual(offset_table(pytz.utc).localize(naive), pytz.utc.localize(naive))
+
+    def test_table_is_shared(self):
+        self.assertTrue(offset_table(pytz.timezone('US/Pacific')) is self.table)
+
+
+@unittest.skipIf(zoneinfo is None, 'zoneinfo is not available')
+class ZoneInfoTest(unittest.TestCase):
+    def setUp(self):
+        self.tz = zoneinfo.ZoneInfo('US/Pacific')
+
+    def test_localize_fixes_offset(self):
+        dt = localize(self.tz, datetime.datetime(2016, 3, 12, 9, 0, 0))
+        self.assertEqual(dt.utcoffset(), datetime.timedelta(hours=-8))
+
+        # Adding to it is absolute, across the start of daylight saving time
+        self.assertEqual(
+            (dt + datetime.timedelta(days=1)).astimezone(self.tz),
+            datetime.datetime(2016, 3, 13, 10, 0, 0, tzinfo=self.tz))
+
+    def test_wall_clock(self):
+        dt = pytz.utc.localize(datetime.datetime(2016, 3, 13, 10, 0, 0))
+        self.assertEqual(
+            wall_clock(self.tz, dt),
+            timedelta_to_microseconds(datetime.datetime(2016, 3, 13, 3, 0, 0) - NAIVE_EPOCH))
@@ -0,0 +1,210 @@
+import bisect
+import datetime
+import pytz
+from .businesstimedelta import localize_unlocalized_dt
+from .intervals import (
+    datetime_to_microseconds, merge_intervals, microseconds_to_datetime,
+    subtract_intervals, timedelta_to_microseconds)
+
+
+class Timeline(object):
+    """The business periods of a set of rules, merged into one sorted list.
+
+    The periods of every rule are materialized over a window of time, after which
+    the time off is taken out of the available time with a single linear sweep.
+    The window grows by one chunk at a time whenever a query moves past its edges.
+    All moments are kept as integer microseconds since the unix epoch.
+    """
+    def __init__(self, rules, chunk=datetime.timedelta(days=91), tz=pytz.utc):
+        """
+        Args:
+            rules: a list of rule objects.
+            chunk: a timedelta by which the window grows.
+            tz: time zone of the datetime objects the timeline returns.
+        """
+        self.available_rules, self.unavailable_rules, self.override_rules = split_rules(rules)
+        self.chunk = timedelta_to_microseconds(chunk)
+        self.tz = tz
+        self.starts = []
+        self.ends = []
+        self.window_start = None
+        self.window_end = None
+
+    def __repr__(self):
+        return '<Timeline: %s periods>' % len(self.starts)
+
+    def next(self, dt):
+        moment = datetime_to_microseconds(localize_unlocalized_dt(dt))
+        self._cover(moment)
+
+        while True:
+            # The first period that hasn't ended yet. It must end inside the window,
+            # otherwise it may continue in the next chunk.
+            i = bisect.bisect_right(self.ends, moment)
+            if i < len(self.ends) and self.ends[i] < self.window_end:
+                return (
+                    microseconds_to_datetime(max(self.starts[i], moment), self.tz),
+                    microseconds_to_datetime(self.ends[i], self.tz))
+
+            if i == len(self.ends):
+                end = self._end(reverse=False)
+                if end is not None:
+                    return end
+            self._grow(reverse=False)
+
+    def previous(self, dt):
+        moment = datetime_to_microseconds(localize_unlocalized_dt(dt))
+        self._cover(moment)
+
+        while True:
+            # The last period that started before this moment
+            i = bisect.bisect_left(self.starts, moment) - 1
+            if i >= 0 and self.starts[i] > self.window_start:
+                return (
+                    microseconds_to_datetime(self.starts[i], self.tz),
+                    microseconds_to_datetime(min(self.ends[i], moment), self.tz))
+
+            if i < 0:
+                end = self._end(reverse=True)
+                if end is not None:
+                    return end
+            self._grow(reverse=True)
+
+    def iter_periods(self, start, end=None, reverse=False):
+        """Lazily yield the periods of the timeline from start towards end,
+        clipped to both. The window grows as the iteration goes on."""
+        moment = datetime_to_microseconds(localize_unlocalized_dt(start))
+        limit = datetime_to_microseconds(localize_unlocalized_dt(end)) if end is not None else None
+        self._cover(moment)
+
+        if reverse:
+            i = bisect.bisect_left(self.starts, moment) - 1
+            while True:
+                if i < 0 or self.starts[i] <= self.window_start:
+                    if i < 0 and self._end(reverse=True) is not None:
+                        return
+                    # Growing backwards moves the known periods, look the position up again
+                    self._grow(reverse=True)
+                    i = bisect.bisect_left(self.starts, moment) - 1
+                    continue
+
+                period_start = self.starts[i]
+                period_end = min(self.ends[i], moment)
+                if limit is not None:
+                    if period_end <= limit:
+                        return
+                    period_start = max(period_start, limit)
+
+                yield (
+                    microseconds_to_datetime(period_start, self.tz),
+                    microseconds_to_datetime(period_end, self.tz))
+                moment = period_start
+                i -= 1
+        else:
+            i = bisect.bisect_right(self.ends, moment)
+            while True:
+                if i >= len(self.ends) or self.ends[i] >= self.window_end:
+                    if i >= len(self.ends) and self._end(reverse=False) is not None:
+                        return
+                    self._grow(reverse=False)
+                    continue
+
+                period_start = max(self.starts[i], moment)
+                period_end = self.ends[i]
+                if limit is not None:
+                    if period_start >= limit:
+                        return
+                    period_end = min(period_end, limit)
+
+                yield (
+                    microseconds_to_datetime(period_start, self.tz),
+                    microseconds_to_datetime(period_end, self.tz))
+                moment = period_end
+                i += 1
+
+    def _end(self, reverse):
+        """The empty block of time that the rules return when none of them has any
+        time beyond the window, or None if they have."""
+        edge = microseconds_to_datetime(self.window_start if reverse else self.window_end, self.tz)
+        end = None
+        for rule in self.available_rules + self.override_rules:
+            start, stop = rule.previous(edge) if reverse else rule.next(edge)
+            if start != stop:
+                return None
+            end = end or (start, stop)
+        return end or (edge, edge)
+
+    def _cover(self, moment):
+        """Grow the window until it contains a moment."""
+        if self.window_start is None:
+            self.window_start = self.window_end = moment
+
+        while moment < self.window_start:
+            self._grow(reverse=True)
+
+        while moment >= self.window_end:
+            self._grow(reverse=False)
+
+    def _grow(self, reverse):
+        """Add one chunk of periods before or after the window."""
+        if reverse:
+            periods = self._materialize(self.window_start - self.chunk, self.window_start)
+            self.window_start -= self.chunk
+        else:
+            periods = self._materialize(self.window_end, self.window_end + self.chunk)
+            self.window_end += self.chunk
+
+        if not periods:
+            return
+
+        starts = [x[0] for x in periods]
+        ends = [x[1] for x in periods]
+
+        # Periods that cross the edge of the window were cut in two, join them again
+        if reverse:
+            if self.starts and ends[-1] == self.starts[0]:
+                self.starts[0] = starts.pop()
+                ends.pop()
+            self.starts = starts + self.starts
+            self.ends = ends + self.ends
+        else:
+            if self.ends and starts[0] == self.ends[-1]:
+                self.ends[-1] = ends.pop(0)
+                starts.pop(0)
+            self.starts.extend(starts)
+            self.ends.extend(ends)
+
+    def _materialize(self, start, end):
+        """The merged business periods between two moments."""
+        available, unavailable, overrides = [], [], []
+        start_dt = microseconds_to_datetime(start)
+        end_dt = microseconds_to_datetime(end)
+
+        for rules, intervals in (
+                (self.available_rules, available),
+                (self.unavailable_rules, unavailable),
+                (self.override_rules, overrides)):
+            for rule in rules:
+                for period_start, period_end in rule.iter_periods(start_dt, end_dt):
+                    intervals.append((
+                        datetime_to_microseconds(period_start),
+                        datetime_to_microseconds(period_end)))
+
+        periods = subtract_intervals(merge_intervals(available), merge_intervals(unavailable))
+        if overrides:
+            # The overridden dates were taken out as time off, so their hours can simply be added
+            periods = merge_intervals(periods + overrides)
+        return periods
+
+
+def split_rules(rules):
+    """Split a list of rules into the available rules, the rules that are time off
+    and the override rules. The whole dates of the override rules count as time off.
+    Output:
+        tuple of (available rules, unavailable rules, override rules).
+    """
+    override_rules = [x for x in rules if x.override]
+    return (
+        [x for x in rules if not x.time_off and not x.override],
+        [x for x in rules if x.time_off] + [x.days for x in override_rules],
+        override_rules)
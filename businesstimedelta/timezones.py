@@ -0,0 +1,169 @@
+import bisect
+import datetime
+import pytz
+from . import instrumentation
+from .intervals import EPOCH, timedelta_to_microseconds
+
+NAIVE_EPOCH = datetime.datetime(1970, 1, 1)
+
+# Time zones with one UTC offset. Python 2 has no datetime.timezone.
+FIXED_OFFSET_TYPES = (pytz.tzinfo.StaticTzInfo, type(pytz.FixedOffset(60))) + (
+    (datetime.timezone,) if hasattr(datetime, 'timezone') else ())
+
+# Offset tables by time zone, built when a time zone is first used
+_offset_tables = {}
+
+
+class OffsetTable(object):
+    """The UTC offsets of a time zone and the moments at which they change,
+    taken from the pytz transition data.
+
+    Converting between UTC and wall-clock time then comes down to a bisect and
+    integer arithmetic, instead of pytz localize and astimezone. The results
+    are the same as those of pytz, including the tzinfo object they carry.
+    All moments are microseconds since the unix epoch.
+    """
+    def __init__(self, utc_times, offsets, tzinfos, dst):
+        """
+        Args:
+            utc_times: sorted moments at which a new offset starts. The first
+                offset is also used before the first of these.
+            offsets: UTC offset from each of these moments on.
+            tzinfos: the tzinfo to attach to wall-clock times with each offset.
+            dst: whether each offset is daylight saving time.
+        """
+        self.utc_times = utc_times
+        self.offsets = offsets
+        self.tzinfos = tzinfos
+        self.dst = dst
+
+        # Wall-clock times around a transition are skipped when the clocks go forward,
+        # and repeated when they go back. These are the ranges of those times.
+        self.wall_starts = []
+        self.wall_ends = []
+        for i in range(1, len(utc_times)):
+            before = utc_times[i] + offsets[i - 1]
+            after = utc_times[i] + offsets[i]
+            self.wall_starts.append(min(before, after))
+            self.wall_ends.append(max(before, after))
+
+    def __repr__(self):
+        return '<OffsetTable: %s transitions>' % len(self.wall_starts)
+
+    @classmethod
+    def from_tz(cls, tz):
+        """Build the table of a pytz time zone or a fixed offset time zone.
+        Returns None for other time zones."""
+        if tz is pytz.utc or isinstance(tz, FIXED_OFFSET_TYPES):
+            return cls([0], [timedelta_to_microseconds(tz.utcoffset(None))], [tz], [False])
+
+        if isinstance(tz, pytz.tzinfo.DstTzInfo):
+            return cls(
+                [timedelta_to_microseconds(x - NAIVE_EPOCH) for x in tz._utc_transition_times],
+                [timedelta_to_microseconds(x[0]) for x in tz._transition_info],
+                [tz._tzinfos[x] for x in tz._transition_info],
+                [bool(x[1]) for x in tz._transition_info])
+
+        return None
+
+    def wall_clock(self, moment):
+        """Wall-clock time at a moment, as microseconds since the epoch of the wall clock."""
+        if len(self.offsets) == 1:
+            return moment + self.offsets[0]
+
+        i = max(0, bisect.bisect_right(self.utc_times, moment) - 1)
+        return moment + self.offsets[i]
+
+    def localize(self, naive):
+        """Attach the right tzinfo to a naive datetime in wall-clock time.
+        Like pytz, skipped times get the offset from before the transition and
+        repeated times get the standard time offset (is_dst=False)."""
+        if len(self.offsets) == 1:
+            return naive.replace(tzinfo=self.tzinfos[0])
+
+        wall = timedelta_to_microseconds(naive - NAIVE_EPOCH)
+        i = bisect.bisect_right(self.wall_starts, wall) - 1
+        if i < 0:
+            return naive.replace(tzinfo=self.tzinfos[0])
+
+        # The table has one more offset than transitions, transition i leads to offset i + 1
+        if wall >= self.wall_ends[i]:
+            return naive.replace(tzinfo=self.tzinfos[i + 1])
+
+        if self.offsets[i + 1] > self.offsets[i]:
+            # Skipped time
+            return naive.replace(tzinfo=self.tzinfos[i])
+
+        # Repeated time, prefer the standard time of the two
+        if self.dst[i + 1] and not self.dst[i]:
+            return naive.replace(tzinfo=self.tzinfos[i])
+        return naive.replace(tzinfo=self.tzinfos[i + 1])
+
+
+def tz_name(tz):
+    """Name of a time zone that is the same in every process."""
+    return getattr(tz, 'zone', None) or getattr(tz, 'key', None) or str(tz)
+
+
+def offset_table(tz):
+    """The OffsetTable of a time zone, or None if it can't have one."""
+    try:
+        return _offset_tables[tz]
+    except KeyError:
+        table = _offset_tables[tz] = OffsetTable.from_tz(tz)
+        return table
+
+
+def localize(tz, dt):
+    """Attach a time zone to a naive datetime that represents wall-clock time in that zone."""
+    if instrumentation.enabled:
+        instrumentation.record('localize')
+    table = offset_table(tz)
+    if table is not None:
+        return table.localize(dt)
+    if hasattr(tz, 'localize'):
+        return tz.localize(dt)
+
+    # Datetimes with a zoneinfo (or similar) time zone are added and compared in wall-clock
+    # time when they share the time zone. Business time is absolute, so fix the offset.
+    dt = dt.replace(tzinfo=tz)
+    return dt.replace(tzinfo=fixed_offset(dt.utcoffset()))
+
+
+def fixed_offset(offset):
+    """A time zone with a fixed UTC offset, given as a timedelta. On Python 2,
+    which has no datetime.timezone, the offset is in whole minutes."""
+    if hasattr(datetime, 'timezone'):
+        return datetime.timezone(offset)
+    return pytz.FixedOffset(timedelta_to_microseconds(offset) // 60000000)
+
+
+def wall_clock(tz, dt):
+    """Wall-clock time of an aware datetime in a time zone, as microseconds
+    since the epoch of the wall clock."""
+    table = offset_table(tz)
+    if table is not None:
+        return table.wall_clock(timedelta_to_microseconds(dt - EPOCH))
+    return timedelta_to_microseconds(dt.astimezone(tz).replace(tzinfo=None) - NAIVE_EPOCH)
+
+
+def utc_transitions(tz):
+    """List the moments at which the UTC offset of a time zone changes.
+    Output:
+        a list of (utc datetime, offset before, offset after) tuples, an empty list
+        for fixed offset time zones, or None if the transitions can not be determined.
+    """
+    if tz is pytz.utc or isinstance(tz, FIXED_OFFSET_TYPES):
+        return []
+
+    if isinstance(tz, pytz.tzinfo.DstTzInfo):
+        transitions = []
+        for i in range(1, len(tz._utc_transition_times)):
+            before = tz._transition_info[i - 1][0]
+            after = tz._transition_info[i][0]
+            if before != after:
+                transitions.append((pytz.utc.localize(tz._utc_transition_times[i]), before, after))
+        return transitions
+
+    return None
+
@@ -29,6 +29,10 @@ setup(
         'pytz',
         'holidays'
     ],
+    extras_require={
+        'numpy': ['numpy'],
+        'pandas': ['numpy', 'pandas'],
+    },
     zip_safe=False,
     test_suite='nose.collector',
     tests_require=['nose'])